@@ -52,6 +52,12 @@ def dfp_inference(builder: mrc.Builder):
             - fallback_username (str): Fallback user to use if no model is found for a user; Example: "generic_user";
             Default: generic_user
             - timestamp_column_name (str): Name of the timestamp column; Example: "timestamp"; Default: timestamp
+            - model_cache_size (int): Maximum number of models to keep in the cache; Example: 1000; Default: 100
+            - max_loaded_bytes (int): Maximum size in bytes of the model weights kept in memory; Example: 1073741824;
+            Default: None
+            - refresh_interval_sec (float): Refresh the model registry metadata in a background thread at this
+            interval; Example: 60; Default: None
+            - share_memory (bool): Place loaded model weights in shared memory; Example: true; Default: False
     """
 
     config = builder.get_current_module_config()
@@ -66,6 +72,10 @@ def dfp_inference(builder: mrc.Builder):
     fallback_user = config.get("fallback_username", "generic_user")
     model_fetch_timeout = config.get("model_fetch_timeout", 1.0)
     timestamp_column_name = config.get("timestamp_column_name", "timestamp")
+    model_cache_size = config.get("model_cache_size", 100)
+    max_loaded_bytes = config.get("max_loaded_bytes", None)
+    refresh_interval_sec = config.get("refresh_interval_sec", None)
+    share_memory = config.get("share_memory", False)
 
     client = MlflowClient()
 
@@ -75,7 +85,11 @@ def dfp_inference(builder: mrc.Builder):
         nonlocal model_manager
 
         if not model_manager:
-            model_manager = ModelManager(model_name_formatter=model_name_formatter)
+            model_manager = ModelManager(model_name_formatter=model_name_formatter,
+                                         model_cache_size_max=model_cache_size,
+                                         max_loaded_bytes=max_loaded_bytes,
+                                         refresh_interval_sec=refresh_interval_sec,
+                                         share_memory=share_memory)
 
         return model_manager.load_user_model(client,
                                              user_id=user,
@@ -145,8 +159,13 @@ def dfp_inference(builder: mrc.Builder):
 
         return task_results
 
+    def on_completed():
+        # Stop the background refresh thread of the model manager, if one was started
+        if (model_manager is not None):
+            model_manager.stop()
+
     def node_fn(obs: mrc.Observable, sub: mrc.Subscriber):
-        obs.pipe(ops.map(on_data), ops.flatten()).subscribe(sub)
+        obs.pipe(ops.map(on_data), ops.on_completed(on_completed), ops.flatten()).subscribe(sub)
 
     node = builder.make_node(DFP_INFERENCE, mrc.core.operators.build(node_fn))
 
@@ -14,10 +14,12 @@
 """Inference stage for DFP."""
 
 import logging
+import threading
 import time
 import typing
 
 import mrc
+import pandas as pd
 from mlflow.tracking.client import MlflowClient
 from mrc.core import operators as ops
 
@@ -44,11 +46,24 @@ class DFPInferenceStage(SinglePortStage):
     model_name_formatter : str, optional
         Format string to control the name of models stored in MLflow. Currently available field names are: `user_id`
         and `user_md5` which is an md5 hexadecimal digest as returned by `hash.hexdigest`.
+    max_batch_size : int, optional
+        Maximum number of messages to group together. Pending messages which resolve to the same model (including users
+        sharing the fallback model) are scored in a single call to the model. The default of `1` disables batching.
+    max_batch_wait_sec : float, optional
+        When batching, pending messages are scored once the oldest has been waiting for this many seconds, even if no
+        further messages arrive.
     """
 
-    def __init__(self, c: Config, model_name_formatter: str = "dfp-{user_id}"):
+    def __init__(self,
+                 c: Config,
+                 model_name_formatter: str = "dfp-{user_id}",
+                 max_batch_size: int = 1,
+                 max_batch_wait_sec: float = 1.0):
         super().__init__(c)
 
+        if (max_batch_size < 1):
+            raise ValueError("max_batch_size must be greater than 0")
+
         self._client = MlflowClient()
         self._fallback_user = self._config.ae.fallback_username
 
@@ -59,6 +74,11 @@ class DFPInferenceStage(SinglePortStage):
 
         self._model_manager = ModelManager(model_name_formatter=model_name_formatter)
 
+        self._max_batch_size = max_batch_size
+        self._max_batch_wait_sec = max_batch_wait_sec
+        self._pending: typing.List[MultiDFPMessage] = []
+        self._pending_start_time: float = None
+
     @property
     def name(self) -> str:
         """Stage name."""
@@ -82,6 +102,27 @@ class DFPInferenceStage(SinglePortStage):
         """
         return self._model_manager.load_user_model(self._client, user_id=user, fallback_user_ids=[self._fallback_user])
 
+    def _load_model(self, user_id: str) -> typing.Tuple[ModelCache, typing.Any]:
+        model_cache = self.get_model(user_id)
+
+        if (model_cache is None):
+            raise RuntimeError(f"Could not find model for user {user_id}")
+
+        return (model_cache, model_cache.load_model())
+
+    def _build_output_message(self, message: MultiDFPMessage, results_df: pd.DataFrame,
+                              model_cache: ModelCache) -> MultiDFPMessage:
+        # Create an output message to allow setting meta
+        output_message = MultiDFPMessage(meta=message.meta,
+                                         mess_offset=message.mess_offset,
+                                         mess_count=message.mess_count)
+
+        output_message.set_meta(list(results_df.columns), results_df)
+
+        output_message.set_meta('model_version', f"{model_cache.reg_model_name}:{model_cache.reg_model_version}")
+
+        return output_message
+
     def on_data(self, message: MultiDFPMessage) -> MultiDFPMessage:
         """Perform inference on the input data."""
         if (not message or message.mess_count == 0):
@@ -93,12 +134,7 @@ class DFPInferenceStage(SinglePortStage):
         user_id = message.user_id
 
         try:
-            model_cache = self.get_model(user_id)
-
-            if (model_cache is None):
-                raise RuntimeError(f"Could not find model for user {user_id}")
-
-            loaded_model = model_cache.load_model()
+            (model_cache, loaded_model) = self._load_model(user_id)
 
         except Exception:
             logger.exception("Error trying to get model", exc_info=True)
@@ -108,14 +144,7 @@ class DFPInferenceStage(SinglePortStage):
 
         results_df = loaded_model.get_results(df_user, return_abs=True)
 
-        # Create an output message to allow setting meta
-        output_message = MultiDFPMessage(meta=message.meta,
-                                         mess_offset=message.mess_offset,
-                                         mess_count=message.mess_count)
-
-        output_message.set_meta(list(results_df.columns), results_df)
-
-        output_message.set_meta('model_version', f"{model_cache.reg_model_name}:{model_cache.reg_model_version}")
+        output_message = self._build_output_message(message, results_df, model_cache)
 
         if logger.isEnabledFor(logging.DEBUG):
             load_model_duration = (post_model_time - start_time) * 1000.0
@@ -130,8 +159,154 @@ class DFPInferenceStage(SinglePortStage):
 
         return output_message
 
+    def on_data_batch(self, messages: typing.List[MultiDFPMessage]) -> typing.List[MultiDFPMessage]:
+        """
+        Perform inference on a batch of messages. Messages are grouped by model, and each group is scored with a single
+        call to the model. Output messages are returned in the same order as `messages`, messages for which a model
+        could not be loaded are dropped.
+        """
+        start_time = time.time()
+
+        # Group the messages by model, preserving the order within each group
+        groups: typing.Dict[typing.Tuple[str, str], typing.Tuple[ModelCache, typing.Any, typing.List[int]]] = {}
+
+        for (i, message) in enumerate(messages):
+            if (not message or message.mess_count == 0):
+                continue
+
+            try:
+                (model_cache, loaded_model) = self._load_model(message.user_id)
+            except Exception:
+                logger.exception("Error trying to get model", exc_info=True)
+                continue
+
+            key = (model_cache.reg_model_name, model_cache.reg_model_version)
+
+            if (key not in groups):
+                groups[key] = (model_cache, loaded_model, [])
+
+            groups[key][2].append(i)
+
+        post_model_time = time.time()
+
+        output_messages: typing.List[MultiDFPMessage] = [None] * len(messages)
+
+        for (model_cache, loaded_model, indices) in groups.values():
+            dfs = [messages[i].get_meta() for i in indices]
+
+            results_df = loaded_model.get_results(pd.concat(dfs, ignore_index=True), return_abs=True)
+
+            # Split the results back out to each message, using the original index of each message's rows
+            offset = 0
+            for (i, df_user) in zip(indices, dfs):
+                message_results = results_df.iloc[offset:offset + len(df_user)]
+                message_results.index = df_user.index
+                offset += len(df_user)
+
+                output_messages[i] = self._build_output_message(messages[i], message_results, model_cache)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Completed batched inference for %s messages using %s models. Model load: %s ms, "
+                         "Model infer: %s ms",
+                         len(messages),
+                         len(groups),
+                         (post_model_time - start_time) * 1000.0,
+                         (time.time() - post_model_time) * 1000.0)
+
+        return [output_message for output_message in output_messages if output_message is not None]
+
+    def _flush_pending(self) -> typing.List[MultiDFPMessage]:
+        pending = self._pending
+        self._pending = []
+        self._pending_start_time = None
+
+        if (len(pending) == 0):
+            return []
+
+        return self.on_data_batch(pending)
+
+    def _get_flush_timeout(self) -> typing.Optional[float]:
+        """
+        Returns the number of seconds until the pending messages are due to be scored, or `None` if nothing is pending.
+        """
+        if (self._pending_start_time is None):
+            return None
+
+        return max(0.0, self._pending_start_time + self._max_batch_wait_sec - time.monotonic())
+
+    def _on_next_batched(self, message: MultiDFPMessage) -> typing.List[MultiDFPMessage]:
+        if (not message or message.mess_count == 0):
+            return []
+
+        now = time.monotonic()
+
+        if (self._pending_start_time is None):
+            self._pending_start_time = now
+
+        self._pending.append(message)
+
+        if (len(self._pending) >= self._max_batch_size
+                or (now - self._pending_start_time) >= self._max_batch_wait_sec):
+            return self._flush_pending()
+
+        return []
+
+    def _on_completed_batched(self) -> typing.Optional[typing.List[MultiDFPMessage]]:
+        output_messages = self._flush_pending()
+
+        return output_messages if len(output_messages) > 0 else None
+
+    def _batched_node_fn(self, obs: mrc.Observable, sub: mrc.Subscriber):
+        # Pending messages are flushed by a timer thread as well as by new messages arriving, the condition's lock
+        # serializes access to the pending messages and the calls to `sub.on_next`
+        condition = threading.Condition()
+        is_completed = False
+
+        def emit(output_messages: typing.List[MultiDFPMessage]):
+            for output_message in output_messages:
+                sub.on_next(output_message)
+
+        def flush_on_timeout():
+            with condition:
+                while (not is_completed):
+                    timeout = self._get_flush_timeout()
+                    if (timeout is None or timeout > 0):
+                        condition.wait(timeout)
+                    else:
+                        emit(self._flush_pending())
+
+        flush_thread = threading.Thread(target=flush_on_timeout, name=f"{self.unique_name}-flush", daemon=True)
+        flush_thread.start()
+
+        def on_next(message: MultiDFPMessage) -> typing.List[MultiDFPMessage]:
+            with condition:
+                emit(self._on_next_batched(message))
+
+                # Wake the timer thread to wait on the deadline of newly pending messages
+                condition.notify()
+
+            return []
+
+        def on_completed():
+            nonlocal is_completed
+
+            with condition:
+                is_completed = True
+                condition.notify()
+
+            flush_thread.join()
+
+            with condition:
+                emit(self._flush_pending())
+
+        obs.pipe(ops.map(on_next), ops.on_completed(on_completed), ops.flatten()).subscribe(sub)
+
     def _build_single(self, builder: mrc.Builder, input_node: mrc.SegmentObject) -> mrc.SegmentObject:
-        node = builder.make_node(self.unique_name, ops.map(self.on_data), ops.filter(lambda x: x is not None))
+        if (self._max_batch_size > 1):
+            node = builder.make_node(self.unique_name, ops.build(self._batched_node_fn))
+        else:
+            node = builder.make_node(self.unique_name, ops.map(self.on_data), ops.filter(lambda x: x is not None))
+
         builder.make_edge(input_node, node)
 
         # node.launch_options.pe_count = self._config.num_threads
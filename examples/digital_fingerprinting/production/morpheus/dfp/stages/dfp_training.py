@@ -15,15 +15,20 @@
 import base64
 import logging
 import pickle
+import threading
 import typing
+from collections import deque
 
 import mrc
+import pandas as pd
 from mrc.core import operators as ops
 from sklearn.model_selection import train_test_split
 
 from morpheus.config import Config
 from morpheus.messages import ControlMessage
 from morpheus.messages.multi_ae_message import MultiAEMessage
+from morpheus.models.dfencoder import AETrainingExecutor
+from morpheus.models.dfencoder import AETrainingResult
 from morpheus.models.dfencoder import AutoEncoder
 from morpheus.pipeline.single_port_stage import SinglePortStage
 from morpheus.pipeline.stage_schema import StageSchema
@@ -48,9 +53,21 @@ class DFPTraining(SinglePortStage):
         Number of epochs to train the model for.
     validation_size : float
         Fraction of the training data to use for validation. Must be in the (0, 1) range.
+    num_workers : int
+        Number of worker processes used to train the models of several users concurrently. When 0 each model is trained
+        in the pipeline thread. When every worker is busy the stage blocks, applying back-pressure to upstream stages.
+        Output messages are emitted in the order they were received, as soon as their model is trained.
+    threads_per_worker : int
+        Number of threads used by PyTorch in each worker, by default the number of CPUs divided by `num_workers`.
     """
 
-    def __init__(self, c: Config, model_kwargs: dict = None, epochs=30, validation_size=0.0):
+    def __init__(self,
+                 c: Config,
+                 model_kwargs: dict = None,
+                 epochs=30,
+                 validation_size=0.0,
+                 num_workers: int = 0,
+                 threads_per_worker: int = None):
         super().__init__(c)
 
         self._model_kwargs = {
@@ -80,6 +97,12 @@ class DFPTraining(SinglePortStage):
         else:
             raise ValueError(f"validation_size={validation_size} should be a positive float in the (0, 1) range")
 
+        if (num_workers < 0):
+            raise ValueError(f"num_workers={num_workers} should be a non-negative integer")
+
+        self._num_workers = num_workers
+        self._threads_per_worker = threads_per_worker
+
     @property
     def name(self) -> str:
         """Stage name."""
@@ -127,20 +150,8 @@ class DFPTraining(SinglePortStage):
     def on_data(self, message: MultiDFPMessage) -> MultiAEMessage:
         ...
 
-    def on_data(self, message):
-        """Train the model and attach it to the output message."""
-        received_control_message = False
-        if (isinstance(message, ControlMessage)):
-            message = self._dfp_multimessage_from_control_message(message)
-            received_control_message = True
-
-        if (message is None or message.mess_count == 0):
-            return None
-
-        user_id = message.user_id
-
-        model = AutoEncoder(**self._model_kwargs)
-
+    def _get_training_data(self, message: MultiDFPMessage) -> typing.Tuple[pd.DataFrame, dict]:
+        """Returns the training data and the keyword arguments to pass to `AutoEncoder.fit`."""
         train_df = message.get_meta_dataframe()
 
         # Only train on the feature columns
@@ -153,18 +164,25 @@ class DFPTraining(SinglePortStage):
             train_df, validation_df = train_test_split(train_df, test_size=self._validation_size, shuffle=False)
             run_validation = True
 
-        logger.debug("Training AE model for user: '%s'...", user_id)
-        model.fit(train_df, epochs=self._epochs, validation_data=validation_df, run_validation=run_validation)
-        logger.debug("Training AE model for user: '%s'... Complete.", user_id)
+        return train_df, {"epochs": self._epochs, "validation_data": validation_df, "run_validation": run_validation}
 
+    def _create_output_message(self,
+                               message: MultiDFPMessage,
+                               received_control_message: bool,
+                               model: AutoEncoder = None,
+                               model_bytes: bytes = None):
+        """Attach the trained model, or the pickled model when `model_bytes` is provided, to the output message."""
         if (received_control_message):
             output_message = ControlMessage(message.meta)
-            output_message.set_metadata("user_id", user_id)
+            output_message.set_metadata("user_id", message.user_id)
 
-            pickled_model_bytes = pickle.dumps(model)
+            pickled_model_bytes = model_bytes if model_bytes is not None else pickle.dumps(model)
             pickled_model_base64_str = base64.b64encode(pickled_model_bytes).decode('utf-8')
             output_message.set_metadata("model", pickled_model_base64_str)
         else:
+            if (model is None):
+                model = pickle.loads(model_bytes)
+
             output_message = MultiAEMessage(meta=message.meta,
                                             mess_offset=message.mess_offset,
                                             mess_count=message.mess_count,
@@ -172,8 +190,148 @@ class DFPTraining(SinglePortStage):
 
         return output_message
 
+    def on_data(self, message):
+        """Train the model and attach it to the output message."""
+        received_control_message = False
+        if (isinstance(message, ControlMessage)):
+            message = self._dfp_multimessage_from_control_message(message)
+            received_control_message = True
+
+        if (message is None or message.mess_count == 0):
+            return None
+
+        user_id = message.user_id
+
+        model = AutoEncoder(**self._model_kwargs)
+
+        train_df, fit_kwargs = self._get_training_data(message)
+
+        logger.debug("Training AE model for user: '%s'...", user_id)
+        model.fit(train_df, **fit_kwargs)
+        logger.debug("Training AE model for user: '%s'... Complete.", user_id)
+
+        return self._create_output_message(message, received_control_message, model=model)
+
+    def _parallel_node_fn(self, obs: mrc.Observable, sub: mrc.Subscriber):
+        executor = AETrainingExecutor(num_workers=self._num_workers, threads_per_worker=self._threads_per_worker)
+
+        # Messages waiting for their model, in the order they were received. Models are emitted by the sender thread
+        # as soon as they are trained, without waiting for further input
+        condition = threading.Condition()
+        pending: deque = deque()
+        is_completed = False
+        error: Exception = None
+
+        def notify(_):
+            with condition:
+                condition.notify()
+
+        def pop_completed():
+            with condition:
+                while (not (len(pending) > 0 and pending[0][0].done())):
+                    if (is_completed and len(pending) == 0):
+                        return None
+
+                    condition.wait()
+
+                return pending.popleft()
+
+        def send_completed():
+            nonlocal error
+
+            while (True):
+                item = pop_completed()
+                if (item is None):
+                    return
+
+                (future, message, received_control_message) = item
+
+                try:
+                    result: AETrainingResult = future.result()
+
+                    logger.debug("Training AE model for user: '%s'... Complete (%.2f sec).",
+                                 result.user_id,
+                                 result.train_time_sec)
+
+                    sub.on_next(
+                        self._create_output_message(message, received_control_message, model_bytes=result.model_bytes))
+                except Exception as e:
+                    # Raised by the next call to `on_next` or `on_completed`, the remaining models are discarded
+                    logger.exception("Error training AE model for user: '%s'", message.user_id)
+                    error = e
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+
+        sender_thread = threading.Thread(target=send_completed, name=f"{self.unique_name}-sender", daemon=True)
+        sender_thread.start()
+
+        def on_next(message) -> list:
+            if (error is not None):
+                raise error
+
+            received_control_message = False
+            if (isinstance(message, ControlMessage)):
+                message = self._dfp_multimessage_from_control_message(message)
+                received_control_message = True
+
+            if (message is None or message.mess_count == 0):
+                return []
+
+            train_df, fit_kwargs = self._get_training_data(message)
+
+            # Blocks while every worker is busy
+            try:
+                future = executor.submit(message.user_id,
+                                         train_df,
+                                         self._model_kwargs,
+                                         fit_kwargs=fit_kwargs,
+                                         compute_scores=False)
+            except RuntimeError:
+                # The executor was shut down by the sender thread while waiting for a worker
+                if (error is not None):
+                    raise error from None
+
+                raise
+
+            with condition:
+                pending.append((future, message, received_control_message))
+
+            future.add_done_callback(notify)
+
+            return []
+
+        def stop(cancel_futures: bool):
+            nonlocal is_completed
+
+            with condition:
+                is_completed = True
+                if (cancel_futures):
+                    pending.clear()
+
+                condition.notify()
+
+            sender_thread.join()
+            executor.shutdown(cancel_futures=cancel_futures)
+
+        def on_completed():
+            stop(cancel_futures=False)
+
+            if (error is not None):
+                raise error
+
+        try:
+            obs.pipe(ops.map(on_next), ops.on_completed(on_completed), ops.flatten()).subscribe(sub)
+        finally:
+            if (not is_completed):
+                # The stream ended with an error, discard the models which are still being trained
+                stop(cancel_futures=True)
+
     def _build_single(self, builder: mrc.Builder, input_node: mrc.SegmentObject) -> mrc.SegmentObject:
-        node = builder.make_node(self.unique_name, ops.map(self.on_data), ops.filter(lambda x: x is not None))
+        if (self._num_workers > 0):
+            node = builder.make_node(self.unique_name, ops.build(self._parallel_node_fn))
+        else:
+            node = builder.make_node(self.unique_name, ops.map(self.on_data), ops.filter(lambda x: x is not None))
+
         builder.make_edge(input_node, node)
 
         return node
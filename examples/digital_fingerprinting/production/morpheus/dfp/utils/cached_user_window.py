@@ -24,8 +24,39 @@ import numpy as np
 import pandas as pd
 
 
+@dataclasses.dataclass
+class WindowChunk:
+    """
+    An immutable block of rows appended to a `CachedUserWindow` by a single call to `append_dataframe`, along with the
+    range of timestamps it covers.
+    """
+    chunk_id: int
+    batch_id: int
+    min_epoch: datetime
+    max_epoch: datetime
+    df: pd.DataFrame = dataclasses.field(repr=False, default=None)
+
+    @classmethod
+    def from_df(cls, chunk_id: int, batch_id: int, df: pd.DataFrame, timestamp_column: str) -> "WindowChunk":
+        return cls(chunk_id=chunk_id,
+                   batch_id=batch_id,
+                   min_epoch=df[timestamp_column].min(),
+                   max_epoch=df[timestamp_column].max(),
+                   df=df)
+
+    def __len__(self):
+        return len(self.df)
+
+
 @dataclasses.dataclass
 class CachedUserWindow:
+    """
+    Rolling window of a user's history.
+
+    Rows are stored as a list of immutable `WindowChunk` objects, one per appended batch. Appending only touches the
+    new rows, the full window is only materialized when requested by `get_train_df`. Calling `save` persists the
+    window metadata and writes only the chunks which have not already been written to disk.
+    """
     user_id: str
     cache_location: str
     timestamp_column: str = "timestamp"
@@ -40,7 +71,9 @@ class CachedUserWindow:
     last_train_batch: int = 0
 
     _trained_rows: pd.Series = dataclasses.field(init=False, repr=False, default_factory=pd.DataFrame)
-    _df: pd.DataFrame = dataclasses.field(init=False, repr=False, default_factory=pd.DataFrame)
+    _chunks: typing.List[WindowChunk] = dataclasses.field(init=False, repr=False, default_factory=list)
+    _next_chunk_id: int = dataclasses.field(init=False, repr=False, default=0)
+    _persisted_chunk_ids: typing.Set[int] = dataclasses.field(init=False, repr=False, default_factory=set)
 
     def append_dataframe(self, incoming_df: pd.DataFrame) -> bool:
 
@@ -67,21 +100,23 @@ class CachedUserWindow:
         filtered_df["_batch_id"] = self.batch_count
 
         # Append just the new rows
-        self._df = pd.concat([self._df, filtered_df])
+        chunk = self._make_chunk(self.batch_count, filtered_df)
+        self._chunks.append(chunk)
 
         self.total_count += len(filtered_df)
-        self.count = len(self._df)
+        self.count += len(filtered_df)
 
-        if (len(self._df) > 0):
-            self.min_epoch = self._df[self.timestamp_column].min()
-            self.max_epoch = self._df[self.timestamp_column].max()
+        # Every new row is later than the previous max, so only the new rows need to be considered
+        if (self.count == len(chunk)):
+            self.min_epoch = chunk.min_epoch
+        self.max_epoch = chunk.max_epoch
 
         return True
 
     def flush(self):
         self.batch_count = 0
         self.count = 0
-        self._df = pd.DataFrame()
+        self._chunks = []
         self._trained_rows = pd.Series()
         self.last_train_batch = 0
         self.last_train_count = 0
@@ -96,34 +131,144 @@ class CachedUserWindow:
 
     def get_train_df(self, max_history) -> pd.DataFrame:
 
-        new_df = self.trim_dataframe(self._df,
-                                     max_history=max_history,
-                                     last_batch=self.batch_count - self.pending_batch_count,
-                                     timestamp_column=self.timestamp_column)
+        self._chunks = self._trim_chunks(max_history=max_history,
+                                         last_batch=self.batch_count - self.pending_batch_count)
 
         self.last_train_count = self.total_count
         self.last_train_epoch = datetime.now()
         self.last_train_batch = self.batch_count
         self.pending_batch_count = 0
 
-        self._df = new_df
+        self.count = sum(len(chunk) for chunk in self._chunks)
 
-        if (len(self._df) > 0):
-            self.min_epoch = self._df[self.timestamp_column].min()
-            self.max_epoch = self._df[self.timestamp_column].max()
+        if (self.count > 0):
+            self.min_epoch = min(chunk.min_epoch for chunk in self._chunks)
+            self.max_epoch = max(chunk.max_epoch for chunk in self._chunks)
 
-        return new_df
+        return self._materialize()
 
     def save(self):
         if (not self.cache_location):
             raise RuntimeError("No cache location set")
 
         # Make sure the directories exist
-        os.makedirs(os.path.dirname(self.cache_location), exist_ok=True)
+        chunk_dir = self._get_chunk_dir(self.cache_location)
+        os.makedirs(chunk_dir, exist_ok=True)
+
+        # Only write the chunks which are not already on disk
+        for chunk in self._chunks:
+            if (chunk.chunk_id not in self._persisted_chunk_ids):
+                chunk.df.to_pickle(os.path.join(chunk_dir, f"{chunk.chunk_id}.pkl"))
+                self._persisted_chunk_ids.add(chunk.chunk_id)
+
+        # Remove chunks which have been trimmed from the window
+        current_ids = {chunk.chunk_id for chunk in self._chunks}
+        for chunk_id in self._persisted_chunk_ids - current_ids:
+            chunk_path = os.path.join(chunk_dir, f"{chunk_id}.pkl")
+            if (os.path.exists(chunk_path)):
+                os.remove(chunk_path)
 
+        self._persisted_chunk_ids &= current_ids
+
+        # The window itself only contains metadata (see `__getstate__`)
         with open(self.cache_location, "wb") as f:
             pickle.dump(self, f)
 
+    def _make_chunk(self, batch_id: int, df: pd.DataFrame) -> WindowChunk:
+        chunk = WindowChunk.from_df(self._next_chunk_id, batch_id, df, self.timestamp_column)
+        self._next_chunk_id += 1
+        return chunk
+
+    def _materialize(self) -> pd.DataFrame:
+        if (len(self._chunks) == 0):
+            return pd.DataFrame()
+
+        if (len(self._chunks) == 1):
+            return self._chunks[0].df
+
+        return pd.concat([chunk.df for chunk in self._chunks])
+
+    def _trim_chunks(self, max_history: typing.Union[int, str], last_batch: int) -> typing.List[WindowChunk]:
+        """
+        Chunk aware equivalent of `trim_dataframe`. Chunks which are entirely inside or outside of the window are kept
+        or dropped as-is, only a chunk straddling the start of the window is sliced (creating a new chunk).
+        """
+        if (max_history is None or len(self._chunks) == 0):
+            return self._chunks
+
+        # Want to ensure we always see data once. So any new data is preserved
+        new_chunks = [chunk for chunk in self._chunks if chunk.batch_id > last_batch]
+
+        # See if max history is an int
+        if (isinstance(max_history, int)):
+            remaining = max(max_history, sum(len(chunk) for chunk in new_chunks))
+
+            trimmed = []
+            for chunk in reversed(self._chunks):
+                if (remaining <= 0):
+                    break
+
+                if (len(chunk) > remaining):
+                    chunk = self._make_chunk(chunk.batch_id, chunk.df.tail(remaining))
+
+                trimmed.append(chunk)
+                remaining -= len(chunk)
+
+            return list(reversed(trimmed))
+
+        # If its a string, then its a duration
+        if (isinstance(max_history, str)):
+            # Get the latest timestamp
+            latest = max(chunk.max_epoch for chunk in self._chunks)
+
+            time_delta = pd.Timedelta(max_history)
+
+            # Calc the earliest
+            earliest = latest - time_delta
+            if (len(new_chunks) > 0):
+                earliest = min(earliest, min(chunk.min_epoch for chunk in new_chunks))
+
+            trimmed = []
+            for chunk in self._chunks:
+                if (chunk.max_epoch < earliest):
+                    continue
+
+                if (chunk.min_epoch < earliest):
+                    chunk_df = chunk.df
+                    chunk = self._make_chunk(chunk.batch_id, chunk_df[chunk_df[self.timestamp_column] >= earliest])
+
+                trimmed.append(chunk)
+
+            return trimmed
+
+        raise RuntimeError("Unsupported max_history")
+
+    @staticmethod
+    def _get_chunk_dir(cache_location: str) -> str:
+        return f"{os.path.splitext(cache_location)[0]}.chunks"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Chunk data is persisted separately by `save`, only pickle the chunk metadata
+        state["_chunks"] = [dataclasses.replace(chunk, df=None) for chunk in self._chunks]
+
+        return state
+
+    def __setstate__(self, state: dict):
+        # Windows saved prior to chunked storage contain the entire window in a single `_df` attribute
+        legacy_df = state.pop("_df", None)
+
+        self.__dict__.update(state)
+
+        if ("_chunks" not in state):
+            self._chunks = []
+            self._next_chunk_id = 0
+            self._persisted_chunk_ids = set()
+
+            if (legacy_df is not None and len(legacy_df) > 0):
+                self._chunks.append(self._make_chunk(self.batch_count, legacy_df))
+
     @staticmethod
     def trim_dataframe(df: pd.DataFrame,
                        max_history: typing.Union[int, str],
@@ -159,4 +304,11 @@ class CachedUserWindow:
             raise RuntimeError("No cache location set")
 
         with open(cache_location, "rb") as f:
-            return pickle.load(f)
+            user_window: CachedUserWindow = pickle.load(f)
+
+        chunk_dir = CachedUserWindow._get_chunk_dir(cache_location)
+        for chunk in user_window._chunks:
+            if (chunk.df is None):
+                chunk.df = pd.read_pickle(os.path.join(chunk_dir, f"{chunk.chunk_id}.pkl"))
+
+        return user_window
@@ -12,14 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
 import hashlib
+import itertools
 import logging
 import threading
+import time
 import typing
+from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import datetime
 
 import mlflow
+import torch
+from mlflow.entities.model_registry import ModelVersion
 from mlflow.entities.model_registry import RegisteredModel
 from mlflow.exceptions import MlflowException
 from mlflow.store.entities.paged_list import PagedList
@@ -27,8 +33,6 @@ from mlflow.tracking.client import MlflowClient
 
 from morpheus.models.dfencoder import AutoEncoder
 
-from .logging_timer import log_time
-
 logger = logging.getLogger(f"morpheus.{__name__}")
 
 
@@ -58,19 +62,61 @@ def user_to_model_name(user_id: str, model_name_formatter: str):
     return model_name_formatter.format(**kwargs)
 
 
+@dataclasses.dataclass
+class ModelCacheStats:
+    """
+    Counters describing the behavior of a `ModelManager`. A hit is a request for a model which was already loaded in
+    memory, a miss is a request which required the model to be downloaded from MLflow.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_failures: int = 0
+    registry_refreshes: int = 0
+    total_load_time_ms: float = 0.0
+    max_load_time_ms: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    @property
+    def mean_load_time_ms(self) -> float:
+        return self.total_load_time_ms / self.misses if self.misses > 0 else 0.0
+
+
+def get_model_size(model: AutoEncoder) -> int:
+    """
+    Returns the number of bytes used by the parameters and buffers of `model`.
+    """
+    if (not isinstance(model, torch.nn.Module)):
+        return 0
+
+    tensors = itertools.chain(model.parameters(), model.buffers())
+
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
 class ModelCache:
 
-    def __init__(self, reg_model_name: str, reg_model_version: str, model_uri: str) -> None:
+    def __init__(self,
+                 reg_model_name: str,
+                 reg_model_version: str,
+                 model_uri: str,
+                 manager: "ModelManager" = None) -> None:
 
         self._reg_model_name = reg_model_name
         self._reg_model_version = reg_model_version
         self._model_uri = model_uri
+        self._manager = manager
 
         self._last_checked: datetime = datetime.now()
         self._last_used: datetime = self._last_checked
 
         self._lock = threading.Lock()
         self._model: AutoEncoder = None
+        self._model_size: int = 0
 
     @property
     def reg_model_name(self):
@@ -92,30 +138,74 @@ class ModelCache:
     def last_checked(self):
         return self._last_checked
 
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def model_size(self) -> int:
+        """Size in bytes of the loaded model weights, 0 when the model is not loaded."""
+        return self._model_size
+
+    def mark_checked(self):
+        self._last_checked = datetime.now()
+
     def load_model(self) -> AutoEncoder:
 
         now = datetime.now()
+        load_time_ms = None
 
         # Ensure multiple people do not try to load at the same time
         with self._lock:
 
             if (self._model is None):
 
-                # Cache miss. Release the lock while we check
+                # Cache miss. Download the model
+                start_time = time.time()
                 try:
-                    with log_time(
-                            logger.debug,
-                            f"Downloaded model '{self.reg_model_name}:{self.reg_model_version}' in {{duration}} ms"):
-                        self._model = mlflow.pytorch.load_model(model_uri=self._model_uri)
+                    model = mlflow.pytorch.load_model(model_uri=self._model_uri)
 
                 except MlflowException:
                     logger.error("Error downloading model for URI: %s", self._model_uri, exc_info=True)
+
+                    if (self._manager is not None):
+                        self._manager._on_model_load_failure(self)
+
                     raise
 
+                if (self._manager is not None and self._manager.share_memory and isinstance(model, torch.nn.Module)):
+                    # Move the weights into shared memory so that worker processes receiving this model (via
+                    # `torch.multiprocessing` or a fork) map the same pages rather than each holding a copy
+                    model.share_memory()
+
+                self._model = model
+                self._model_size = get_model_size(model)
+
+                load_time_ms = (time.time() - start_time) * 1000.0
+                logger.debug("Downloaded model '%s:%s' in %s ms",
+                             self.reg_model_name,
+                             self.reg_model_version,
+                             load_time_ms)
+
             # Update the last time this was used
             self._last_used = now
 
-            return self._model
+            model = self._model
+
+        # Notify the manager outside of our lock, the manager may need to unload other models
+        if (self._manager is not None):
+            self._manager._on_model_used(self, load_time_ms=load_time_ms)
+
+        return model
+
+    def unload_model(self):
+        """
+        Releases the loaded model weights. The registry metadata is kept and the model will be downloaded again on the
+        next call to `load_model`. Callers still holding a reference to the model are unaffected.
+        """
+        with self._lock:
+            self._model = None
+            self._model_size = 0
 
 
 class UserModelMap:
@@ -177,61 +267,139 @@ class UserModelMap:
 
 
 class ModelManager:
-
-    def __init__(self, model_name_formatter: str) -> None:
+    """
+    Maintains a bounded, least recently used cache of the models registered in MLflow.
+
+    Parameters
+    ----------
+    model_name_formatter : str
+        Format string used to convert a user id into a registered model name, see `user_to_model_name`.
+    model_cache_size_max : int, optional
+        Maximum number of registered models to keep track of. When exceeded, the least recently used entry (and its
+        loaded weights) are evicted.
+    max_loaded_bytes : int, optional
+        Maximum number of bytes of model weights to keep loaded in memory. When exceeded, the weights of the least
+        recently used models are released, keeping their registry metadata. `None` disables the size limit.
+    cache_timeout_sec : int, optional
+        Number of seconds after which the registry metadata for a model, and the list of registered models, are
+        considered stale.
+    refresh_interval_sec : float, optional
+        When set, stale registry metadata is refreshed by a background thread every `refresh_interval_sec` seconds
+        rather than on the inference hot path.
+    share_memory : bool, optional
+        Move the weights of loaded models into shared memory, allowing models to be handed to inference worker
+        processes without copying.
+    """
+
+    def __init__(self,
+                 model_name_formatter: str,
+                 model_cache_size_max: int = 100,
+                 max_loaded_bytes: int = None,
+                 cache_timeout_sec: int = 600,
+                 refresh_interval_sec: float = None,
+                 share_memory: bool = False) -> None:
         self._model_name_formatter = model_name_formatter
 
         self._user_model_cache: typing.Dict[str, UserModelMap] = {}
 
-        self._model_cache: typing.Dict[str, ModelCache] = {}
-        self._model_cache_size_max = 100
+        # Ordered from least to most recently used
+        self._model_cache: typing.OrderedDict[str, ModelCache] = OrderedDict()
+        self._model_cache_size_max = model_cache_size_max
+        self._max_loaded_bytes = max_loaded_bytes
+        self._loaded_bytes = 0
+        self._loaded_sizes: typing.Dict[ModelCache, int] = {}
 
-        self._cache_timeout_sec = 600
+        self._cache_timeout_sec = cache_timeout_sec
+        self._share_memory = share_memory
 
         self._user_model_cache_lock = threading.RLock()
         self._model_cache_lock = threading.RLock()
 
-        self._existing_models: typing.Set[str] = set()
+        self._stats = ModelCacheStats()
+        self._stats_lock = threading.Lock()
+
+        self._existing_models: typing.FrozenSet[str] = frozenset()
         self._existing_models_updated = datetime(1970, 1, 1)
 
+        self._refresh_interval_sec = refresh_interval_sec
+        self._refresh_thread: threading.Thread = None
+        self._stop_event = threading.Event()
+
         # Force an update of the existing models
         self._model_exists("")
 
+        if (refresh_interval_sec is not None):
+            self._refresh_thread = threading.Thread(target=self._refresh_loop,
+                                                    name="dfp-model-cache-refresh",
+                                                    daemon=True)
+            self._refresh_thread.start()
+
     @property
     def cache_timeout_sec(self):
         return self._cache_timeout_sec
 
-    def _model_exists(self, reg_model_name: str, timeout: float = 1.0) -> bool:
+    @property
+    def share_memory(self):
+        return self._share_memory
 
-        now = datetime.now()
+    @property
+    def loaded_bytes(self):
+        return self._loaded_bytes
 
-        # See if the list of models needs to be updated
-        if ((now - self._existing_models_updated).seconds > self._cache_timeout_sec):
+    @property
+    def stats(self) -> ModelCacheStats:
+        """Returns a snapshot of the cache counters."""
+        with self._stats_lock:
+            return dataclasses.replace(self._stats)
 
-            try:
-                with timed_acquire(self._model_cache_lock, timeout=timeout):
+    def stop(self):
+        """Stops the background refresh thread, if running."""
+        self._stop_event.set()
 
-                    logger.debug("Updating list of available models...")
-                    client = MlflowClient()
+        if (self._refresh_thread is not None):
+            self._refresh_thread.join()
+            self._refresh_thread = None
 
-                    results: PagedList[RegisteredModel] = PagedList([], token=None)
+    def _is_stale(self, last_checked: datetime, now: datetime) -> bool:
+        return (now - last_checked).total_seconds() >= self._cache_timeout_sec
 
-                    # clear the set to hanfle the case where a model has been removed
-                    self._existing_models.clear()
+    def _update_existing_models(self):
+        logger.debug("Updating list of available models...")
+        client = MlflowClient()
 
-                    # Loop over the registered models with the pagination
-                    while ((results := client.search_registered_models(max_results=1000, page_token=results.token))
-                           is not None):
+        results: PagedList[RegisteredModel] = PagedList([], token=None)
 
-                        self._existing_models.update(model.name for model in results)
+        existing_models = set()
 
-                        if (results.token is None or len(results.token) == 0):
-                            break
+        # Loop over the registered models with the pagination
+        while ((results := client.search_registered_models(max_results=1000, page_token=results.token)) is not None):
 
-                    logger.debug("Updating list of available models... Done.")
+            existing_models.update(model.name for model in results)
 
-                    # Save the update time
-                    self._existing_models_updated = now
+            if (results.token is None or len(results.token) == 0):
+                break
+
+        # Replace the set rather than updating it in place, readers never need to hold the lock. This also handles the
+        # case where a model has been removed
+        self._existing_models = frozenset(existing_models)
+        self._existing_models_updated = datetime.now()
+
+        with self._stats_lock:
+            self._stats.registry_refreshes += 1
+
+        logger.debug("Updating list of available models... Done.")
+
+    def _model_exists(self, reg_model_name: str, timeout: float = 1.0) -> bool:
+
+        now = datetime.now()
+
+        # See if the list of models needs to be updated. When refreshing in the background, this is never done on the
+        # calling thread
+        if (self._refresh_thread is None and self._is_stale(self._existing_models_updated, now)):
+
+            try:
+                with timed_acquire(self._model_cache_lock, timeout=timeout):
+                    self._update_existing_models()
 
             except TimeoutError as e:
                 logger.error("Deadlock detected checking for new models. Please report this to the developers.")
@@ -261,6 +429,43 @@ class ModelManager:
 
         return user_model_cache.load_model_cache(client=client, timeout=timeout)
 
+    def _get_latest_version(self, client: MlflowClient, reg_model_name: str) -> typing.Optional[ModelVersion]:
+        try:
+            latest_versions = client.get_latest_versions(reg_model_name)
+
+            if (len(latest_versions) == 0):
+                # Databricks doesn't like the `get_latest_versions` method for some reason. Before failing, try
+                # to just get the model and then use latest versions
+                reg_model_obj = client.get_registered_model(reg_model_name)
+
+                latest_versions = None if reg_model_obj is None else reg_model_obj.latest_versions
+
+                if (len(latest_versions) == 0):
+                    logger.warning(
+                        ("Registered model with no versions detected. Consider deleting this registered model."
+                         "Using fallback model. Model: %s, "),
+                        reg_model_name)
+                    return None
+
+        except MlflowException as e:
+            if e.error_code == 'RESOURCE_DOES_NOT_EXIST':
+                # No user found
+                return None
+
+            raise
+
+        # Default to the first returned one
+        latest_model_version = latest_versions[0]
+
+        if (len(latest_versions) > 1):
+            logger.warning(("Multiple models in different stages detected. "
+                            "Defaulting to first returned. Model: %s, Version: %s, Stage: %s"),
+                           reg_model_name,
+                           latest_model_version.version,
+                           latest_model_version.current_stage)
+
+        return latest_model_version
+
     def load_model_cache(self, client: MlflowClient, reg_model_name: str, timeout: float = 1.0) -> ModelCache:
 
         now = datetime.now()
@@ -270,68 +475,162 @@ class ModelManager:
 
                 model_cache = self._model_cache.get(reg_model_name, None)
 
-                # Make sure it hasnt been too long since we checked
-                if (model_cache is not None and (now - model_cache.last_checked).seconds < self._cache_timeout_sec):
+                # Make sure it hasnt been too long since we checked. When refreshing in the background, stale entries
+                # are updated by the refresh thread
+                if (model_cache is not None
+                        and (self._refresh_thread is not None or not self._is_stale(model_cache.last_checked, now))):
+
+                    self._model_cache.move_to_end(reg_model_name)
 
                     return model_cache
 
                 # Cache miss. Try to check for a model
-                try:
-                    if (not self._model_exists(reg_model_name, timeout)):
-                        # Break early
-                        return None
+                if (not self._model_exists(reg_model_name, timeout)):
+                    # Break early
+                    return None
 
-                    latest_versions = client.get_latest_versions(reg_model_name)
+                latest_model_version = self._get_latest_version(client, reg_model_name)
 
-                    if (len(latest_versions) == 0):
-                        # Databricks doesn't like the `get_latest_versions` method for some reason. Before failing, try
-                        # to just get the model and then use latest versions
-                        reg_model_obj = client.get_registered_model(reg_model_name)
+                if (latest_model_version is None):
+                    return None
 
-                        latest_versions = None if reg_model_obj is None else reg_model_obj.latest_versions
+                if (model_cache is not None and model_cache.reg_model_version == latest_model_version.version):
+                    # Nothing has changed, keep any loaded weights
+                    model_cache.mark_checked()
+                else:
+                    model_cache = ModelCache(reg_model_name=reg_model_name,
+                                             reg_model_version=latest_model_version.version,
+                                             model_uri=latest_model_version.source,
+                                             manager=self)
 
-                        if (len(latest_versions) == 0):
-                            logger.warning(
-                                ("Registered model with no versions detected. Consider deleting this registered model."
-                                 "Using fallback model. Model: %s, "),
-                                reg_model_name)
-                            return None
+                self._set_model_cache(reg_model_name, model_cache)
 
-                    # Default to the first returned one
-                    latest_model_version = latest_versions[0]
+                return model_cache
 
-                    if (len(latest_versions) > 1):
-                        logger.warning(("Multiple models in different stages detected. "
-                                        "Defaulting to first returned. Model: %s, Version: %s, Stage: %s"),
-                                       reg_model_name,
-                                       latest_model_version.version,
-                                       latest_model_version.current_stage)
+        except TimeoutError as e:
+            logger.error("Deadlock when trying to acquire model cache lock")
+            raise RuntimeError("Deadlock when trying to acquire model cache lock") from e
 
-                    model_cache = ModelCache(reg_model_name=reg_model_name,
-                                             reg_model_version=latest_model_version.version,
-                                             model_uri=latest_model_version.source)
+    def _set_model_cache(self, reg_model_name: str, model_cache: ModelCache):
+        # Must be called with the model cache lock held
+        previous = self._model_cache.pop(reg_model_name, None)
 
-                except MlflowException as e:
-                    if e.error_code == 'RESOURCE_DOES_NOT_EXIST':
-                        # No user found
-                        return None
+        if (previous is not None and previous is not model_cache):
+            self._release(previous)
 
-                    raise
+        # Save the cache
+        self._model_cache[reg_model_name] = model_cache
 
-                # Save the cache
-                self._model_cache[reg_model_name] = model_cache
+        # Check if we need to push out a cache entry
+        while (len(self._model_cache) > self._model_cache_size_max):
+            _, evicted = self._model_cache.popitem(last=False)
+            self._release(evicted)
 
-                # Check if we need to push out a cache entry
-                if (len(self._model_cache) > self._model_cache_size_max):
-                    time_sorted = sorted(list(self._model_cache.items()), key=lambda x: x[1].last_used)
-                    to_delete = time_sorted[0][0]
-                    self._model_cache.pop(to_delete)
+            with self._stats_lock:
+                self._stats.evictions += 1
 
-                return model_cache
+    def _release(self, model_cache: ModelCache):
+        # Must be called with the model cache lock held
+        self._loaded_bytes -= self._loaded_sizes.pop(model_cache, 0)
+        model_cache.unload_model()
 
-        except TimeoutError as e:
-            logger.error("Deadlock when trying to acquire model cache lock")
-            raise RuntimeError("Deadlock when trying to acquire model cache lock") from e
+    def _on_model_used(self, model_cache: ModelCache, load_time_ms: typing.Optional[float]):
+        with self._stats_lock:
+            if (load_time_ms is None):
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+                self._stats.total_load_time_ms += load_time_ms
+                self._stats.max_load_time_ms = max(self._stats.max_load_time_ms, load_time_ms)
+
+        if (load_time_ms is None):
+            return
+
+        with self._model_cache_lock:
+            if (self._model_cache.get(model_cache.reg_model_name) is not model_cache):
+                # The entry was evicted or replaced while the model was being downloaded
+                model_cache.unload_model()
+                return
+
+            self._loaded_bytes += model_cache.model_size - self._loaded_sizes.get(model_cache, 0)
+            self._loaded_sizes[model_cache] = model_cache.model_size
+
+            if (self._max_loaded_bytes is None):
+                return
+
+            # Release the weights of the least recently used models until we fit, always keeping the newly loaded one
+            for other in list(self._model_cache.values()):
+                if (self._loaded_bytes <= self._max_loaded_bytes):
+                    break
+
+                if (other is model_cache or not other.is_loaded):
+                    continue
+
+                self._release(other)
+
+                with self._stats_lock:
+                    self._stats.evictions += 1
+
+    def _on_model_load_failure(self, model_cache: ModelCache):  # pylint: disable=unused-argument
+        with self._stats_lock:
+            self._stats.load_failures += 1
+
+    def refresh(self):
+        """
+        Refresh the list of registered models, and the version of each cached model whose metadata is stale. Models
+        whose registered version has changed have their loaded weights released, the new version will be downloaded
+        on next use.
+        """
+        self._update_existing_models()
+
+        client = MlflowClient()
+        now = datetime.now()
+
+        with self._model_cache_lock:
+            stale = [(name, cache) for (name, cache) in self._model_cache.items()
+                     if self._is_stale(cache.last_checked, now)]
+
+        # Query the registry without holding the lock
+        for reg_model_name, model_cache in stale:
+            latest_model_version = None
+
+            if (reg_model_name in self._existing_models):
+                latest_model_version = self._get_latest_version(client, reg_model_name)
+
+            with self._model_cache_lock:
+                if (self._model_cache.get(reg_model_name) is not model_cache):
+                    # Changed while we were querying
+                    continue
+
+                if (latest_model_version is None):
+                    # The model has been removed from the registry
+                    self._release(self._model_cache.pop(reg_model_name))
+
+                elif (latest_model_version.version == model_cache.reg_model_version):
+                    model_cache.mark_checked()
+
+                else:
+                    logger.debug("Model '%s' updated from version %s to %s",
+                                 reg_model_name,
+                                 model_cache.reg_model_version,
+                                 latest_model_version.version)
+
+                    # Replace in place to avoid changing the LRU order
+                    self._release(model_cache)
+                    self._model_cache[reg_model_name] = ModelCache(reg_model_name=reg_model_name,
+                                                                   reg_model_version=latest_model_version.version,
+                                                                   model_uri=latest_model_version.source,
+                                                                   manager=self)
+
+    def _refresh_loop(self):
+        while (not self._stop_event.wait(self._refresh_interval_sec)):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Exception occurred while refreshing the model cache", exc_info=True)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Model cache stats: %s, loaded bytes: %s", self.stats, self._loaded_bytes)
 
     def load_user_model_cache(self, user_id: str, timeout: float, fallback_user_ids: typing.List[str]) -> UserModelMap:
 
@@ -12,12 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import io
+import json
 import logging
+import multiprocessing as mp
 import os
 import typing
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from functools import wraps
 from typing import Dict
 from typing import List
@@ -54,6 +61,9 @@ class ContentExtractorSchema(BaseModel):
     chunk_size: int = 512
     converters_meta: Dict[str, Dict] = Field(default_factory=dict)
     num_threads: int = 10
+    num_processes: int = 0
+    skip_unchanged_files: bool = False
+    content_hash_path: typing.Optional[str] = None
 
     @field_validator('converters_meta', mode="before")
     @classmethod
@@ -212,6 +222,11 @@ def _text_converter(input_info: ConverterInputInfo) -> str:
     return text
 
 
+@lru_cache(maxsize=None)
+def _get_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len)
+
+
 def process_content(docs: str | list[str], file_meta: FileMeta, chunk_size: int, chunk_overlap: int) -> list[dict]:
     """
     Processes the content of a file and splits it into chunks.
@@ -233,9 +248,7 @@ def process_content(docs: str | list[str], file_meta: FileMeta, chunk_size: int,
         A list of dictionaries, each with a chunk of content and file metadata.
     """
 
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size,
-                                                   chunk_overlap=chunk_overlap,
-                                                   length_function=len)
+    text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
 
     processed_data = []
 
@@ -261,13 +274,97 @@ def process_content(docs: str | list[str], file_meta: FileMeta, chunk_size: int,
     return processed_data
 
 
+_CONVERTERS = {
+    "pdf": _pdf_to_text_converter,
+    "csv": _csv_to_text_converter,
+    "docx": _docx_to_text_converter,
+    "txt": _text_converter
+}
+
+
+def convert_and_split(file_meta: FileMeta,
+                      file_bytes: bytes,
+                      converters_meta: dict,
+                      chunk_size: int,
+                      chunk_overlap: int) -> list[dict]:
+    """
+    Converts the content of a file to text and splits it into chunks. This is a module level function allowing it to
+    be executed in a worker process.
+
+    Parameters
+    ----------
+    file_meta: FileMeta
+        FileMeta parsed information of a file path.
+    file_bytes : bytes
+        Raw content of the file.
+    converters_meta : dict
+        Converters configuration.
+    chunk_size : int
+        Size of each chunk.
+    chunk_overlap : int
+        Overlap between consecutive chunks.
+
+    Returns
+    -------
+    list of dicts
+        A list of dictionaries, each with a chunk of content and file metadata.
+    """
+    converter = _CONVERTERS.get(file_meta.file_type, _text_converter)
+    input_info = ConverterInputInfo(io_bytes=io.BytesIO(file_bytes), meta=converters_meta)
+
+    return process_content(converter(input_info), file_meta, chunk_size, chunk_overlap)
+
+
+class ContentHashStore:
+    """
+    Keeps a hash of the content of each processed file, allowing files which have not changed since they were last
+    ingested to be skipped. When `path` is set the hashes are persisted to a JSON file and survive restarts.
+    """
+
+    def __init__(self, path: str = None):
+        self._path = path
+        self._hashes: dict[str, str] = {}
+
+        if (path is not None and os.path.exists(path)):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._hashes = json.load(f)
+
+    @staticmethod
+    def compute_hash(file_bytes: bytes, params: dict) -> str:
+        # Include the conversion parameters so that changing them causes the file to be processed again
+        hasher = hashlib.sha256(file_bytes)
+        hasher.update(json.dumps(params, sort_keys=True, default=str).encode())
+
+        return hasher.hexdigest()
+
+    def is_unchanged(self, file_path: str, content_hash: str) -> bool:
+        return self._hashes.get(file_path) == content_hash
+
+    def update(self, file_hashes: dict[str, str]):
+        if (len(file_hashes) == 0):
+            return
+
+        self._hashes.update(file_hashes)
+
+        if (self._path is not None):
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+
+            tmp_path = f"{self._path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._hashes, f)
+
+            os.replace(tmp_path, self._path)
+
+
 @register_module("file_content_extractor", "morpheus_examples_llm")
 def file_content_extractor(builder: mrc.Builder):
     """
     Extracts text from PDF and TXT files and constructs a DataFrame with the extracted content.
 
     This module processes a batch of files, reading their contents and extracting text data to form a DataFrame.
-    It can handle both PDF and TXT files. The module uses a ThreadPoolExecutor for parallel file reading.
+    It can handle both PDF and TXT files. The module uses a ThreadPoolExecutor for parallel file reading, and
+    optionally a ProcessPoolExecutor for converting and chunking the file content. A message is emitted for every
+    `batch_size` files as soon as that batch has been processed.
 
     Parameters
     ----------
@@ -282,8 +379,10 @@ def file_content_extractor(builder: mrc.Builder):
     - 'chunk_size' : int, size of each chunk of document.
     - 'chunk_overlap' : int, overlap between consecutive chunks.
     - 'converters_meta' : dict, converters configuration.
-
-    The function reads files in parallel but processes the content serially within each batch to prevent CPU contention.
+    - 'num_processes' : int, the number of worker processes used to convert and chunk the files. When 0 the content
+      is processed serially on the pipeline thread.
+    - 'skip_unchanged_files' : bool, skip files whose content has not changed since they were last processed.
+    - 'content_hash_path' : str, optional JSON file used to persist the content hashes across runs.
 
     Example `module_config`
     -----------------------
@@ -311,13 +410,6 @@ def file_content_extractor(builder: mrc.Builder):
     chunk_overlap = extractor_config.chunk_overlap
     converters_meta = extractor_config.converters_meta
 
-    converters = {
-        "pdf": _pdf_to_text_converter,
-        "csv": _csv_to_text_converter,
-        "docx": _docx_to_text_converter,
-        "txt": _text_converter
-    }
-
     chunk_params = {
         file_type: {
             # pylint: disable=no-member
@@ -325,58 +417,126 @@ def file_content_extractor(builder: mrc.Builder):
             "chunk_overlap": converters_meta.get(file_type, {}).get("chunk_overlap", chunk_overlap)
             # pylint: enable=no-member
         }
-        for file_type in converters
+        for file_type in _CONVERTERS
     }
 
-    def parse_files(open_files: typing.List[fsspec.core.OpenFile]) -> MessageMeta:
-        data = []
+    read_executor = ThreadPoolExecutor(max_workers=num_threads)
+
+    process_executor = None
+    if (extractor_config.num_processes > 0):
+        process_executor = ProcessPoolExecutor(max_workers=extractor_config.num_processes,
+                                               mp_context=mp.get_context("spawn"))
+
+    hash_store = None
+    if (extractor_config.skip_unchanged_files):
+        hash_store = ContentHashStore(extractor_config.content_hash_path)
+
+    def submit_batch(batch: typing.List[fsspec.core.OpenFile]) -> list[tuple[FileMeta, str, Future | list[dict]]]:
         _fs = fsspec.filesystem(protocol='file')
 
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            for i in range(0, len(open_files), batch_size):
-                batch = open_files[i:i + batch_size]
-                futures = []
-                files_meta = []
+        futures = []
+        files_meta = []
 
-                for open_file in batch:
-                    # Check if file exists
-                    if (not _fs.exists(open_file.path)):
-                        logger.warning("File does not exist: %s. Skipping...", open_file.path)
-                        continue
+        for open_file in batch:
+            # Check if file exists
+            if (not _fs.exists(open_file.path)):
+                logger.warning("File does not exist: %s. Skipping...", open_file.path)
+                continue
+
+            if (_fs.isdir(open_file.path)):
+                logger.warning("File is a directory: %s. Skipping...", open_file.path)
+                continue
+
+            try:
+                file_meta: FileMeta = get_file_meta(open_file=open_file)
+                futures.append(read_executor.submit(read_file_to_bytesio, file_meta.file_path))
+                files_meta.append(file_meta)
+
+            except Exception as e:
+                logger.error("Error processing file %s: %s", open_file.path, e)
 
-                    if (_fs.isdir(open_file.path)):
-                        logger.warning("File is a directory: %s. Skipping...", open_file.path)
+        submitted = []
+        for file_meta, future in zip(files_meta, futures):
+            io_bytes = future.result()
+
+            if io_bytes:
+                file_bytes = io_bytes.getvalue()
+
+                # Get chunk params for the file type, default to txt
+                file_type_chunk_params = chunk_params[
+                    file_meta.file_type] if file_meta.file_type in chunk_params else chunk_params['txt']
+
+                content_hash = None
+                if (hash_store is not None):
+                    content_hash = ContentHashStore.compute_hash(file_bytes, {
+                        "chunk_params": file_type_chunk_params, "converters_meta": converters_meta
+                    })
+
+                    if (hash_store.is_unchanged(file_meta.file_path, content_hash)):
+                        logger.debug("File unchanged: %s. Skipping...", file_meta.file_path)
                         continue
 
-                    try:
-                        file_meta: FileMeta = get_file_meta(open_file=open_file)
-                        futures.append(executor.submit(read_file_to_bytesio, file_meta.file_path))
-                        files_meta.append(file_meta)
+                args = (file_meta,
+                        file_bytes,
+                        converters_meta,
+                        file_type_chunk_params["chunk_size"],
+                        file_type_chunk_params["chunk_overlap"])
+
+                if (process_executor is not None):
+                    result = process_executor.submit(convert_and_split, *args)
+                else:
+                    result = convert_and_split(*args)
+
+                submitted.append((file_meta, content_hash, result))
+
+        return submitted
+
+    def collect_batch(submitted: list[tuple[FileMeta, str, Future | list[dict]]]) -> MessageMeta | None:
+        data = []
+        file_hashes = {}
+
+        for file_meta, content_hash, result in submitted:
+            # Conversion errors raised in a worker process are re-raised here, the same as in the serial path
+            if isinstance(result, Future):
+                result = result.result()
+
+            if result:
+                data.extend(result)
+
+            if (content_hash is not None):
+                file_hashes[file_meta.file_path] = content_hash
+
+        if (hash_store is not None):
+            hash_store.update(file_hashes)
+
+        if (len(data) == 0):
+            return None
+
+        return MessageMeta(df=pd.DataFrame(data))
+
+    def parse_files(open_files: typing.List[fsspec.core.OpenFile]) -> typing.Generator[MessageMeta, None, None]:
+        # Keep the next batch in flight while the results of the current batch are collected and emitted
+        pending = deque()
 
-                    except Exception as e:
-                        logger.error("Error processing file %s: %s", open_file.path, e)
+        for i in range(0, len(open_files), batch_size):
+            pending.append(submit_batch(open_files[i:i + batch_size]))
 
-                for file_meta, future in zip(files_meta, futures):
-                    io_bytes = future.result()
+            if (len(pending) > 1):
+                yield collect_batch(pending.popleft())
 
-                    if io_bytes:
-                        converter = converters.get(file_meta.file_type, _text_converter)
-                        input_info = ConverterInputInfo(io_bytes=io_bytes, meta=converters_meta)
-                        result = converter(input_info)
-                        # Get chunk params for the file type, default to txt
-                        file_type_chunk_params = chunk_params[
-                            file_meta.file_type] if file_meta.file_type in chunk_params else chunk_params['txt']
-                        result = process_content(result,
-                                                 file_meta,
-                                                 file_type_chunk_params["chunk_size"],
-                                                 file_type_chunk_params["chunk_overlap"])
-                        if result:
-                            data.extend(result)
+        while (len(pending) > 0):
+            yield collect_batch(pending.popleft())
 
-        df_final = pd.DataFrame(data)
+    def on_completed():
+        read_executor.shutdown(wait=True)
 
-        return MessageMeta(df=df_final)
+        if (process_executor is not None):
+            process_executor.shutdown(wait=True)
 
-    node = builder.make_node("text_extractor", ops.map(parse_files), ops.filter(lambda x: x is not None))
+    node = builder.make_node("text_extractor",
+                             ops.map(parse_files),
+                             ops.flatten(),
+                             ops.filter(lambda x: x is not None),
+                             ops.on_completed(on_completed))
     builder.register_module_input("input", node)
     builder.register_module_output("output", node)
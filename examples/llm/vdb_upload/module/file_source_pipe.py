@@ -87,6 +87,9 @@ def _file_source_pipe(builder: mrc.Builder):
       - **extractor_config**: Configuration for the file content extractor module.
         - **chunk_size**: Size of chunks for the extractor.
         - **num_threads**: Number of threads for file content extraction.
+        - **num_processes**: Number of worker processes for converting and chunking file content.
+        - **skip_unchanged_files**: Boolean to skip files whose content has not changed since they were processed.
+        - **content_hash_path**: JSON file used to persist the content hashes across runs.
       - **filenames**: List of file paths to be processed.
       - **watch**: Boolean to watch for file changes.
 
@@ -124,8 +127,15 @@ def _file_source_pipe(builder: mrc.Builder):
         "num_threads": validated_config.num_threads,
         "chunk_size": validated_config.chunk_size,
         "chunk_overlap": validated_config.chunk_overlap,
-        "converters_meta": validated_config.converters_meta
+        "converters_meta": validated_config.converters_meta,
     }
+
+    # Only the process pool and change detection options are taken from `extractor_config`, the remaining options keep
+    # their top-level values
+    for key in ("num_processes", "skip_unchanged_files", "content_hash_path"):
+        if (key in validated_config.extractor_config):
+            file_content_extractor_config[key] = validated_config.extractor_config[key]
+
     extractor_loader = ContentExtractorLoaderFactory.get_instance("file_content_extractor",
                                                                   file_content_extractor_config)
 
@@ -14,7 +14,13 @@
 
 import logging
 import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import partial
+from urllib.parse import urlparse
 
 import mrc
 import mrc.core.operators as ops
@@ -41,6 +47,10 @@ class WebScraperSchema(BaseModel):
     enable_cache: bool = False
     cache_path: str = "./.cache/http/RSSDownloadStage.sqlite"
     cache_dir: str = "./.cache/llm/rss"
+    revalidate_cache: bool = False
+    max_workers: int = 8
+    max_connections_per_host: int = 4
+    html_parser: str = "html.parser"
 
     class Config:
         extra = "forbid"
@@ -49,10 +59,129 @@ class WebScraperSchema(BaseModel):
 WebScraperLoaderFactory = ModuleLoaderFactory("web_scraper", "morpheus_examples_llm", WebScraperSchema)
 
 
-def download_and_split(msg: MessageMeta, text_splitter, link_column, session) -> MessageMeta:
+@dataclass
+class FetchResult:
+    """
+    Result of downloading a single link and extracting its text, `text` is None if the link produced an error.
+    """
+    url: str
+    text: str | None = None
+    status_code: int | None = None
+    from_cache: bool = False
+    revalidated: bool = False
+    fetch_time_ms: float = 0.0
+    parse_time_ms: float = 0.0
+
+
+@dataclass
+class WebScraperMetrics:
+    """
+    Running totals of the links processed by the web scraper.
+    """
+    num_requests: int = 0
+    num_cached: int = 0
+    num_revalidated: int = 0
+    num_failed: int = 0
+    total_fetch_time_ms: float = 0.0
+    max_fetch_time_ms: float = 0.0
+    total_parse_time_ms: float = 0.0
+
+    @property
+    def mean_fetch_time_ms(self) -> float:
+        return self.total_fetch_time_ms / self.num_requests if self.num_requests > 0 else 0.0
+
+    def record(self, result: FetchResult):
+        self.num_requests += 1
+        self.num_cached += int(result.from_cache)
+        self.num_revalidated += int(result.revalidated)
+        self.num_failed += int(result.text is None)
+        self.total_fetch_time_ms += result.fetch_time_ms
+        self.max_fetch_time_ms = max(self.max_fetch_time_ms, result.fetch_time_ms)
+        self.total_parse_time_ms += result.parse_time_ms
+
+
+class HostLimiter:
+    """
+    Limits the number of concurrent requests made to any single host.
+    """
+
+    def __init__(self, max_connections_per_host: int):
+        self._max_connections_per_host = max_connections_per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def get(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+
+            if (semaphore is None):
+                semaphore = threading.BoundedSemaphore(self._max_connections_per_host)
+                self._semaphores[host] = semaphore
+
+        return semaphore
+
+
+def fetch_page(url: str,
+               session: requests.Session,
+               host_limiter: HostLimiter | None = None,
+               html_parser: str = "html.parser") -> FetchResult:
+    """
+    Downloads a single link and extracts the text of the page. Safe to call from multiple threads.
+    """
+    result = FetchResult(url=url)
+
+    try:
+        start_time = time.perf_counter()
+
+        if (host_limiter is not None):
+            with host_limiter.get(url):
+                response = session.get(url)
+        else:
+            response = session.get(url)
+
+        result.fetch_time_ms = (time.perf_counter() - start_time) * 1000.0
+        result.status_code = response.status_code
+
+        if isinstance(response, requests_cache.models.response.CachedResponse):
+            result.from_cache = True
+            result.revalidated = response.revalidated
+
+        if (not response.ok):
+            logger.warning("Error downloading document from URL '%s'. " + "Returned code: %s. With reason: '%s'",
+                           url,
+                           response.status_code,
+                           response.reason)
+            return result
+
+        start_time = time.perf_counter()
+
+        soup = BeautifulSoup(response.text, html_parser)
+        result.text = soup.get_text(strip=True, separator=' ')
+
+        result.parse_time_ms = (time.perf_counter() - start_time) * 1000.0
+
+    except ValueError as exc:
+        logger.error("Error parsing document: %s", exc)
+    except Exception as exc:
+        logger.error("Error downloading document from URL '%s'. Error: %s", url, exc)
+
+    return result
+
+
+def download_and_split(msg: MessageMeta,
+                       text_splitter,
+                       link_column,
+                       session,
+                       executor: ThreadPoolExecutor = None,
+                       host_limiter: HostLimiter = None,
+                       html_parser: str = "html.parser",
+                       metrics: WebScraperMetrics = None) -> MessageMeta:
     """
         Uses the HTTP GET method to download/scrape the links found in the message, splits the scraped data, and stores
-        it in the output, excludes output for any links which produce an error.
+        it in the output, excludes output for any links which produce an error. When an `executor` is provided the
+        links are downloaded and parsed concurrently, the output rows remain in the order of the input rows.
     """
     if (link_column not in msg.get_column_names()):
         return None
@@ -62,44 +191,47 @@ def download_and_split(msg: MessageMeta, text_splitter, link_column, session) ->
     # Convert the dataframe into a list of dictionaries
     df_dicts = df.to_dict(orient="records")
 
-    final_rows: list[dict] = []
+    fetch_fn = partial(fetch_page, session=session, host_limiter=host_limiter, html_parser=html_parser)
 
+    # Each unique link is only downloaded once
+    pending: dict[str, Future | FetchResult] = {}
     for row in df_dicts:
         url = row[link_column]
 
-        try:
-            # Try to get the page content
-            response = session.get(url)
+        if (url not in pending):
+            pending[url] = executor.submit(fetch_fn, url) if executor is not None else fetch_fn(url)
 
-            if (not response.ok):
-                logger.warning("Error downloading document from URL '%s'. " + "Returned code: %s. With reason: '%s'",
-                               url,
-                               response.status_code,
-                               response.reason)
-                continue
+    results: dict[str, FetchResult] = {}
+    for (url, fetched) in pending.items():
+        result = fetched.result() if isinstance(fetched, Future) else fetched
+        results[url] = result
 
-            raw_html = response.text
-            soup = BeautifulSoup(raw_html, "html.parser")
+        if (metrics is not None):
+            metrics.record(result)
 
-            text = soup.get_text(strip=True, separator=' ')
-            split_text = text_splitter.split_text(text)
+        logger.debug("Processed %spage: '%s' in %.2f ms",
+                     "cached " if result.from_cache else "",
+                     url,
+                     result.fetch_time_ms + result.parse_time_ms)
 
-            for text in split_text:
-                row_cp = row.copy()
-                row_cp.update({"page_content": text})
-                final_rows.append(row_cp)
+    final_rows: list[dict] = []
 
-            if isinstance(response, requests_cache.models.response.CachedResponse):
-                logger.debug("Processed cached page: '%s'", url)
-            else:
-                logger.debug("Processed page: '%s'", url)
+    for row in df_dicts:
+        result = results[row[link_column]]
+
+        if (result.text is None):
+            continue
 
+        try:
+            split_text = text_splitter.split_text(result.text)
         except ValueError as exc:
             logger.error("Error parsing document: %s", exc)
             continue
-        except Exception as exc:
-            logger.error("Error downloading document from URL '%s'. Error: %s", url, exc)
-            continue
+
+        for text in split_text:
+            row_cp = row.copy()
+            row_cp.update({"page_content": text})
+            final_rows.append(row_cp)
 
     return MessageMeta(df=cudf.DataFrame(final_rows))
 
@@ -132,18 +264,56 @@ def _web_scraper(builder: mrc.Builder):
                                                    length_function=len)
 
     if (enable_cache):
-        session = requests_cache.CachedSession(cache_path, backend='sqlite')
+        # Stale entries with an ETag or Last-Modified header are revalidated with a conditional GET
+        session = requests_cache.CachedSession(cache_path,
+                                               backend='sqlite',
+                                               always_revalidate=web_scraper_config.revalidate_cache)
     else:
         session = requests.Session()
 
+    # Allow every worker thread to hold a connection open
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=web_scraper_config.max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
     session.headers.update({
         "User-Agent":
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
     })
 
-    op_func = partial(download_and_split, text_splitter=text_splitter, link_column=link_column, session=session)
-
-    node = builder.make_node("web_scraper", ops.map(op_func), ops.filter(lambda x: x is not None))
+    executor = None
+    if (web_scraper_config.max_workers > 1):
+        executor = ThreadPoolExecutor(max_workers=web_scraper_config.max_workers, thread_name_prefix="web_scraper")
+
+    host_limiter = HostLimiter(web_scraper_config.max_connections_per_host)
+    metrics = WebScraperMetrics()
+
+    op_func = partial(download_and_split,
+                      text_splitter=text_splitter,
+                      link_column=link_column,
+                      session=session,
+                      executor=executor,
+                      host_limiter=host_limiter,
+                      html_parser=web_scraper_config.html_parser,
+                      metrics=metrics)
+
+    def on_completed():
+        if (executor is not None):
+            executor.shutdown(wait=True)
+
+        logger.debug("Web scraper processed %d pages (%d cached, %d revalidated, %d failed), "
+                     "mean fetch time: %.2f ms, max fetch time: %.2f ms",
+                     metrics.num_requests,
+                     metrics.num_cached,
+                     metrics.num_revalidated,
+                     metrics.num_failed,
+                     metrics.mean_fetch_time_ms,
+                     metrics.max_fetch_time_ms)
+
+    node = builder.make_node("web_scraper",
+                             ops.map(op_func),
+                             ops.filter(lambda x: x is not None),
+                             ops.on_completed(on_completed))
 
     builder.register_module_input("input", node)
     builder.register_module_output("output", node)
@@ -14,8 +14,8 @@
 
 import json
 import pathlib
+import re
 import typing
-from collections import defaultdict
 
 import mrc
 import numpy as np
@@ -33,6 +33,43 @@ from morpheus.pipeline.single_port_stage import SinglePortStage
 from morpheus.pipeline.stage_schema import StageSchema
 
 
+# Applied in order to rejoin the decoded wordpiece tokens, the last element is a substring required for a match
+_DECODE_CLEANUP_PATTERNS = tuple((re.compile(pattern), repl, required) for (pattern, repl, required) in (
+    (r"\s+##", "", "##"),
+    (r"\s+\.+\s", ".", "."),
+    (r"\s+:+\s", ":", ":"),
+    (r"\s+\|+\s", "|", "|"),
+    (r"\s+\++\s", "+", "+"),
+    (r"\s+\-+\s", "-", "-"),
+    (r"\s+\<", "<", "<"),
+    (r"\<+\s", "<", "<"),
+    (r"\s+\>", ">", ">"),
+    (r"\>+\s", ">", ">"),
+    (r"\s+\=+\s", "=", "="),
+    (r"\s+\#+\s", "#", "#"),
+    (r"\[+\s", "[", "["),
+    (r"\s\]", "]", "]"),
+    (r"\(+\s", "(", "("),
+    (r"\s\)", ")", ")"),
+    (r"\s\"", "\"", "\""),
+    (r"\"+\s", "\"", "\""),
+    (r"\\+\s", "\"", "\\"),
+    (r"\s+_+\s", "_", "_"),
+    (r"\s+/", "/", "/"),
+    (r"/+\s", "/", "/"),
+    (r"\s+\?+\s", "?", "?"),
+    (r"\s+;+\s", "; ", ";"),
+))
+
+
+def _decode_cleanup_str(value: str) -> str:
+    for (pattern, repl, required) in _DECODE_CLEANUP_PATTERNS:
+        if (required in value):
+            value = pattern.sub(repl, value)
+
+    return value
+
+
 @register_stage("log-postprocess", modes=[PipelineModes.NLP])
 class LogParsingPostProcessingStage(SinglePortStage):
 
@@ -62,6 +99,10 @@ class LogParsingPostProcessingStage(SinglePortStage):
             for index, line in enumerate(f):
                 self._vocab_lookup[index] = line.split()[0]
 
+        # Lookup arrays indexed by token id
+        self._vocab = np.array([self._vocab_lookup[i] for i in range(len(self._vocab_lookup))], dtype=object)
+        self._vocab_is_subword = np.array([token[:2] == "##" or token[0] == '.' for token in self._vocab], dtype=bool)
+
         with open(model_config_path, encoding='UTF-8') as f:
             config = json.load(f)
 
@@ -82,29 +123,58 @@ class LogParsingPostProcessingStage(SinglePortStage):
 
     def _postprocess(self, x: MultiResponseMessage):
 
-        infer_pdf = pd.DataFrame(x.get_tensor('seq_ids').get()).astype(int)
-        infer_pdf.columns = ["doc", "start", "stop"]
-        infer_pdf["confidences"] = x.get_tensor('confidences').tolist()
-        infer_pdf["labels"] = x.get_tensor('labels').tolist()
-        infer_pdf["token_ids"] = x.get_tensor('input_ids').tolist()
+        seq_ids = x.get_tensor('seq_ids').get().astype(np.int64)
+        confidences = x.get_tensor('confidences').get()
+        labels = x.get_tensor('labels').get().astype(np.int64)
+        token_ids = x.get_tensor('input_ids').get().astype(np.int64)
+
+        (docs, starts, stops) = (seq_ids[:, 0], seq_ids[:, 1], seq_ids[:, 2])
+
+        # Aggregate the tokens of each log, sequences belonging to the same log are concatenated in order
+        order = np.argsort(docs, kind="stable")
 
-        infer_pdf["confidences"] = infer_pdf.apply(lambda row: row["confidences"][row["start"]:row["stop"]], axis=1)
+        positions = np.arange(token_ids.shape[1])
+        token_mask = (positions >= starts[order, None]) & (positions < stops[order, None])
 
-        infer_pdf["labels"] = infer_pdf.apply(lambda row: row["labels"][row["start"]:row["stop"]], axis=1)
+        flat_token_ids = token_ids[order][token_mask]
+        flat_labels = labels[order][token_mask]
+        flat_confidences = confidences[order][token_mask]
+        flat_docs = np.repeat(docs[order], token_mask.sum(axis=1))
 
-        infer_pdf["token_ids"] = infer_pdf.apply(lambda row: row["token_ids"][row["start"]:row["stop"]], axis=1)
+        num_tokens = len(flat_token_ids)
+        token_idx = np.arange(num_tokens)
 
-        # aggregated logs
-        infer_pdf = infer_pdf.groupby("doc").agg({"token_ids": "sum", "confidences": "sum", "labels": "sum"})
+        doc_start = np.ones(num_tokens, dtype=bool)
+        doc_start[1:] = flat_docs[1:] != flat_docs[:-1]
 
-        # parse_by_label
-        parsed_dfs = infer_pdf.apply(lambda row: self.__get_label_dicts(row), axis=1, result_type="expand")
+        # Subwords take the label of the preceding whole word
+        is_word = ~self._vocab_is_subword[flat_token_ids] | doc_start
+        word_idx = np.maximum.accumulate(np.where(is_word, token_idx, 0))
+
+        parsed = pd.DataFrame({
+            "doc": flat_docs,
+            "label": self._get_label_names(flat_labels[word_idx]),
+            "token": self._vocab[flat_token_ids],
+        })
+
+        # Join the tokens of each label, keeping the labels in order of first appearance
+        (group_codes, groups) = pd.factorize(pd.MultiIndex.from_arrays([parsed["doc"], parsed["label"]]))
+        grouped_tokens = parsed["token"].to_numpy()[np.argsort(group_codes, kind="stable")]
+        group_bounds = np.concatenate(([0], np.cumsum(np.bincount(group_codes))))
+        joined_tokens = [
+            " ".join(grouped_tokens[start:stop]) for (start, stop) in zip(group_bounds[:-1], group_bounds[1:])
+        ]
+        ext_parsed = pd.Series(joined_tokens, index=groups).unstack()
+        ext_parsed = ext_parsed.reindex(index=np.unique(flat_docs),
+                                        columns=pd.unique(parsed["label"])).reset_index(drop=True)
+
+        # Mean confidence of the tokens with each label
+        confidence = pd.Series(flat_confidences[word_idx]).groupby([flat_docs, self._get_label_names(flat_labels)],
+                                                                   sort=False).mean()
+        ext_confidence = confidence.unstack().reindex(index=np.unique(flat_docs)).reset_index(drop=True)
 
-        ext_parsed = pd.DataFrame(parsed_dfs[0].tolist())
-        ext_confidence = pd.DataFrame(parsed_dfs[1].tolist())
         parsed_df = pd.DataFrame()
         confidence_df = pd.DataFrame()
-        ext_confidence = ext_confidence.applymap(np.mean)
         for label in ext_parsed.columns:
             if label[0] == "B":
                 col_name = label[2:]
@@ -119,47 +189,14 @@ class LogParsingPostProcessingStage(SinglePortStage):
         parsed_df = self.__decode_cleanup(parsed_df)
         return MessageMeta(df=cudf.DataFrame.from_pandas(parsed_df))
 
-    def __get_label_dicts(self, row):
-        token_dict = defaultdict(str)
-        confidence_dict = defaultdict(list)
-        for label, confidence, token_id in zip(row["labels"], row["confidences"], row["token_ids"]):
-            text_token = self._vocab_lookup[token_id]
-            if text_token[:2] != "##" and text_token[0] != '.':
-                # if not a subword use the current label, else use previous
-                new_label = label
-                new_confidence = confidence
-            if self._label_map[new_label] in token_dict:
-                token_dict[self._label_map[new_label]] = (token_dict[self._label_map[new_label]] + " " + text_token)
-            else:
-                token_dict[self._label_map[new_label]] = text_token
-            confidence_dict[self._label_map[label]].append(new_confidence)
-        return token_dict, confidence_dict
+    def _get_label_names(self, labels: np.ndarray) -> np.ndarray:
+        (unique_labels, inverse) = np.unique(labels, return_inverse=True)
+
+        return np.array([self._label_map[label] for label in unique_labels.tolist()], dtype=object)[inverse]
 
     def __decode_cleanup(self, df):
-        df.replace(r"\s+##", "", regex=True, inplace=True)
-        df.replace(r"\s+\.+\s", ".", regex=True, inplace=True)
-        df.replace(r"\s+:+\s", ":", regex=True, inplace=True)
-        df.replace(r"\s+\|+\s", "|", regex=True, inplace=True)
-        df.replace(r"\s+\++\s", "+", regex=True, inplace=True)
-        df.replace(r"\s+\-+\s", "-", regex=True, inplace=True)
-        df.replace(r"\s+\<", "<", regex=True, inplace=True)
-        df.replace(r"\<+\s", "<", regex=True, inplace=True)
-        df.replace(r"\s+\>", ">", regex=True, inplace=True)
-        df.replace(r"\>+\s", ">", regex=True, inplace=True)
-        df.replace(r"\s+\=+\s", "=", regex=True, inplace=True)
-        df.replace(r"\s+\#+\s", "#", regex=True, inplace=True)
-        df.replace(r"\[+\s", "[", regex=True, inplace=True)
-        df.replace(r"\s\]", "]", regex=True, inplace=True)
-        df.replace(r"\(+\s", "(", regex=True, inplace=True)
-        df.replace(r"\s\)", ")", regex=True, inplace=True)
-        df.replace(r"\s\"", "\"", regex=True, inplace=True)
-        df.replace(r"\"+\s", "\"", regex=True, inplace=True)
-        df.replace(r"\\+\s", "\"", regex=True, inplace=True)
-        df.replace(r"\s+_+\s", "_", regex=True, inplace=True)
-        df.replace(r"\s+/", "/", regex=True, inplace=True)
-        df.replace(r"/+\s", "/", regex=True, inplace=True)
-        df.replace(r"\s+\?+\s", "?", regex=True, inplace=True)
-        df.replace(r"\s+;+\s", "; ", regex=True, inplace=True)
+        for col in df.columns:
+            df[col] = df[col].map(_decode_cleanup_str, na_action="ignore")
 
         return df
 
@@ -91,6 +91,9 @@ class FileToDFController:
     """
     Controller class for converting file objects to Pandas DataFrames with optional preprocessing.
 
+    Downloaded files are cached in a columnar (Parquet) format, both per-file and per-batch. Per-file entries allow
+    overlapping batches to share work, and only the columns needed by `schema` are stored.
+
     Parameters
     ----------
     schema : DataFrameInputSchema
@@ -105,6 +108,9 @@ class FileToDFController:
         Directory where cache will be stored.
     timestamp_column_name : str
         Name of the timestamp column.
+    cache_max_bytes : int, optional
+        Maximum size in bytes of the cache directory. When exceeded, the least recently used cache entries are removed.
+        When `None` the cache is unbounded.
     """
 
     def __init__(self,
@@ -113,7 +119,8 @@ class FileToDFController:
                  file_type: FileTypes,
                  parser_kwargs: dict,
                  cache_dir: str,
-                 timestamp_column_name: str):
+                 timestamp_column_name: str,
+                 cache_max_bytes: int = None):
 
         self._schema = schema
         self._file_type = file_type
@@ -121,9 +128,130 @@ class FileToDFController:
         self._parser_kwargs = {} if parser_kwargs is None else parser_kwargs
         self._cache_dir = os.path.join(cache_dir, "file_cache")
         self._timestamp_column_name = timestamp_column_name
+        self._cache_max_bytes = cache_max_bytes
+
+        # Per-file cache entries depend on how the file was parsed and prepared, include this in the cache key
+        self._file_cache_key = json.dumps(
+            {
+                "file_type": str(self._file_type),
+                "filter_null": self._filter_null,
+                "parser_kwargs": self._parser_kwargs,
+                "input_columns": self._schema.input_columns,
+                "json_columns": self._schema.json_columns,
+                "preserve_columns": (None if self._schema.preserve_columns is None else
+                                     self._schema.preserve_columns.pattern),
+            },
+            sort_keys=True,
+            default=str)
 
         self._downloader = Downloader()
 
+    def _project_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop any columns which are neither an input to the schema nor matched by the schema's `preserve_columns`.
+        """
+        input_columns = self._schema.input_columns
+
+        if (not input_columns):
+            # Without any column info, the schema passes all columns through
+            return df
+
+        preserve_re = self._schema.preserve_columns
+
+        columns = [
+            col for col in df.columns
+            if col in input_columns or (preserve_re is not None and preserve_re.match(col) is not None)
+        ]
+
+        if (len(columns) == len(df.columns)):
+            return df
+
+        return df[columns]
+
+    def _get_file_cache_location(self, file_system: fsspec.AbstractFileSystem, file_object: fsspec.core.OpenFile):
+        file_hash = hashlib.md5(
+            json.dumps({
+                "ukey": file_system.ukey(file_object.path), "key": self._file_cache_key
+            }, sort_keys=True).encode()).hexdigest()
+
+        return os.path.join(self._cache_dir, "files", f"{file_hash}.parquet")
+
+    @staticmethod
+    def _read_cache(cache_location: str) -> typing.Optional[pd.DataFrame]:
+        if (not os.path.exists(cache_location)):
+            return None
+
+        try:
+            df = pd.read_parquet(cache_location, memory_map=True)
+        except Exception:
+            logger.warning("Failed to read cache entry %s. Ignoring.", cache_location, exc_info=True)
+            return None
+
+        # Update the modification time, this is used to determine which entries to evict
+        try:
+            os.utime(cache_location)
+        except OSError:
+            pass
+
+        return df
+
+    @staticmethod
+    def _write_cache(cache_location: str, df: pd.DataFrame) -> bool:
+        os.makedirs(os.path.dirname(cache_location), exist_ok=True)
+
+        # Write to a temporary file first to avoid leaving partial entries behind
+        tmp_location = f"{cache_location}.{os.getpid()}.tmp"
+
+        try:
+            df.to_parquet(tmp_location)
+            os.replace(tmp_location, cache_location)
+            return True
+        except Exception:
+            logger.warning("Failed to save cache entry %s. Skipping cache for this entry.",
+                           cache_location,
+                           exc_info=True)
+
+            if (os.path.exists(tmp_location)):
+                os.remove(tmp_location)
+
+            return False
+
+    def _evict_cache(self):
+        """
+        Remove the least recently used cache entries until the cache directory fits within `cache_max_bytes`.
+        """
+        if (self._cache_max_bytes is None):
+            return
+
+        entries = []
+        total_bytes = 0
+
+        for sub_dir in ("files", "batches"):
+            try:
+                with os.scandir(os.path.join(self._cache_dir, sub_dir)) as it:
+                    for entry in it:
+                        if (entry.is_file() and entry.name.endswith(".parquet")):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                            total_bytes += stat.st_size
+            except FileNotFoundError:
+                continue
+
+        if (total_bytes <= self._cache_max_bytes):
+            return
+
+        entries.sort()
+
+        for (_, size, path) in entries:
+            if (total_bytes <= self._cache_max_bytes):
+                break
+
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except FileNotFoundError:
+                pass
+
     def _get_or_create_dataframe_from_batch(
             self, file_object_batch: typing.Tuple[fsspec.core.OpenFiles, int]) -> typing.Tuple[cudf.DataFrame, bool]:
 
@@ -142,34 +270,45 @@ class FileToDFController:
         # Convert to base 64 encoding to remove - values
         objects_hash_hex = hashlib.md5(json.dumps(hash_data, sort_keys=True).encode()).hexdigest()
 
-        batch_cache_location = os.path.join(self._cache_dir, "batches", f"{objects_hash_hex}.pkl")
+        batch_cache_location = os.path.join(self._cache_dir, "batches", f"{objects_hash_hex}.parquet")
 
         # Return the cache if it exists
-        if (os.path.exists(batch_cache_location)):
-            output_df = pd.read_pickle(batch_cache_location)
+        output_df = self._read_cache(batch_cache_location)
+        if (output_df is not None):
             output_df["batch_count"] = batch_count
             output_df["origin_hash"] = objects_hash_hex
 
             return (output_df, True)
 
-        # Cache miss
-        download_method_func = partial(single_object_to_dataframe,
-                                       file_type=self._file_type,
-                                       schema=self._schema,
-                                       filter_null=self._filter_null,
-                                       parser_kwargs=self._parser_kwargs)
+        # Batch cache miss, check for any individual files which have already been loaded
+        file_cache_locations = [self._get_file_cache_location(file_system, file_object) for file_object in file_list]
+        dfs = [self._read_cache(location) for location in file_cache_locations]
 
-        download_buckets = file_list
+        missing = [i for (i, df) in enumerate(dfs) if df is None]
 
-        # Loop over dataframes and concat into one
-        try:
-            dfs = self._downloader.download(download_buckets, download_method_func)
-        except Exception:
-            logger.exception("Failed to download logs. Error: ", exc_info=True)
-            raise
+        if (len(missing) > 0):
+            download_method_func = partial(single_object_to_dataframe,
+                                           file_type=self._file_type,
+                                           schema=self._schema,
+                                           filter_null=self._filter_null,
+                                           parser_kwargs=self._parser_kwargs)
+
+            download_buckets = [file_list[i] for i in missing]
 
-        if (dfs is None or len(dfs) == 0):
-            raise ValueError("No logs were downloaded")
+            # Loop over dataframes and concat into one
+            try:
+                downloaded_dfs = self._downloader.download(download_buckets, download_method_func)
+            except Exception:
+                logger.exception("Failed to download logs. Error: ", exc_info=True)
+                raise
+
+            if (downloaded_dfs is None or len(downloaded_dfs) == 0):
+                raise ValueError("No logs were downloaded")
+
+            for (i, df) in zip(missing, downloaded_dfs):
+                df = self._project_columns(df)
+                self._write_cache(file_cache_locations[i], df)
+                dfs[i] = df
 
         output_df: pd.DataFrame = pd.concat(dfs)
 
@@ -181,12 +320,9 @@ class FileToDFController:
         output_df.reset_index(drop=True, inplace=True)
 
         # Save dataframe to cache future runs
-        os.makedirs(os.path.dirname(batch_cache_location), exist_ok=True)
+        self._write_cache(batch_cache_location, output_df)
 
-        try:
-            output_df.to_pickle(batch_cache_location)
-        except Exception:
-            logger.warning("Failed to save batch cache. Skipping cache for this batch.", exc_info=True)
+        self._evict_cache()
 
         output_df["batch_count"] = batch_count
         output_df["origin_hash"] = objects_hash_hex
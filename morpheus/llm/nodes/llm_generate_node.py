@@ -16,6 +16,8 @@ import logging
 
 from morpheus.llm import LLMContext
 from morpheus.llm import LLMNodeBase
+from morpheus.llm.services.llm_response_cache import CachedLLMClient
+from morpheus.llm.services.llm_response_cache import LLMResponseCache
 from morpheus.llm.services.llm_service import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -33,11 +35,18 @@ class LLMGenerateNode(LLMNodeBase):
 
     input_names : list[str], optional
         The names of the inputs to this node. Defaults to `["prompt"]`.
+
+    cache : LLMResponseCache, optional
+        When provided, responses are cached and only prompts which are not in the cache are sent to `llm_client`, see
+        `CachedLLMClient`.
     """
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(self, llm_client: LLMClient, cache: LLMResponseCache = None) -> None:
         super().__init__()
 
+        if (cache is not None):
+            llm_client = CachedLLMClient(llm_client, cache)
+
         self._llm_client = llm_client
 
     def get_input_names(self) -> list[str]:
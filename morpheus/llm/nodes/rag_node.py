@@ -46,6 +46,13 @@ class RAGNode(LLMNode):
 
     llm_client : LLMClient
         The LLM client to use for generation.
+
+    search_batch_window_ms : float, optional
+        Combine the searches of concurrently executing contexts requested within this many milliseconds of each other,
+        see `RetrieverNode`.
+
+    search_cache_ttl_sec : float, optional
+        Cache the search results for each embedding for this many seconds, see `RetrieverNode`.
     """
 
     def __init__(self,
@@ -55,10 +62,16 @@ class RAGNode(LLMNode):
                  vdb_service: VectorDBResourceService,
                  embedding: typing.Callable[[list[str]], typing.Coroutine[typing.Any, typing.Any,
                                                                           list[list[float]]]] = None,
-                 llm_client: LLMClient) -> None:
+                 llm_client: LLMClient,
+                 search_batch_window_ms: float = None,
+                 search_cache_ttl_sec: float = None) -> None:
         super().__init__()
 
-        self.add_node("retriever", node=RetrieverNode(service=vdb_service, embedding=embedding))
+        self.add_node("retriever",
+                      node=RetrieverNode(service=vdb_service,
+                                         embedding=embedding,
+                                         search_batch_window_ms=search_batch_window_ms,
+                                         search_cache_ttl_sec=search_cache_ttl_sec))
 
         self.add_node("prompt",
                       inputs=[("/retriever", "contexts"), ("query", "query")],
@@ -17,6 +17,7 @@ import typing
 
 from morpheus.llm import LLMContext
 from morpheus.llm import LLMNodeBase
+from morpheus.service.vdb.batched_resource_service import BatchedVectorDBResourceService
 from morpheus.service.vdb.vector_db_service import VectorDBResourceService
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,11 @@ class RetrieverNode(LLMNodeBase):
         Callable function for generating vector embeddings. Default is None.
     service : VectorDBResourceService
         Vector database resource service for executing similarity searches.
+    search_batch_window_ms : float, optional
+        When set, searches from concurrently executing contexts which are requested within this many milliseconds of
+        each other are combined into a single search, see `BatchedVectorDBResourceService`.
+    search_cache_ttl_sec : float, optional
+        When set, the results for each embedding are cached for this many seconds.
     similarity_search_kwargs : dict
         Additional keyword arguments for the similarity search.
     """
@@ -41,10 +47,18 @@ class RetrieverNode(LLMNodeBase):
         *,
         embedding: typing.Callable[[list[str]], typing.Coroutine[typing.Any, typing.Any, list[list[float]]]] | None,
         service: VectorDBResourceService,
+        search_batch_window_ms: float = None,
+        search_cache_ttl_sec: float = None,
         **similarity_search_kwargs,
     ) -> None:
         super().__init__()
 
+        if ((search_batch_window_ms is not None or search_cache_ttl_sec is not None)
+                and not isinstance(service, BatchedVectorDBResourceService)):
+            service = BatchedVectorDBResourceService(service,
+                                                     batch_window_ms=search_batch_window_ms or 0.0,
+                                                     cache_ttl_sec=search_cache_ttl_sec or 0.0)
+
         self._service = service
         self._embedding = embedding
         self._similarity_search_kwargs = similarity_search_kwargs
@@ -0,0 +1,395 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import typing
+import weakref
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough estimate of the number of tokens in `text`, assuming an average of four characters per token.
+    """
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class LLMRequestMetrics:
+    """
+    Counters for the requests submitted to an `LLMRequestScheduler` by a single client.
+    """
+    num_requests: int = 0
+    num_completed: int = 0
+    num_failed: int = 0
+    num_retries: int = 0
+    num_tokens: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    total_latency_sec: float = 0.0
+    total_wait_sec: float = 0.0
+
+    @property
+    def mean_latency_sec(self) -> float:
+        """
+        Mean time spent performing a request, including retries but excluding the time spent queued.
+        """
+        num_finished = self.num_completed + self.num_failed
+        if (num_finished == 0):
+            return 0.0
+
+        return self.total_latency_sec / num_finished
+
+    @property
+    def mean_wait_sec(self) -> float:
+        """
+        Mean time a request spent queued, waiting for a free slot or for the rate limits.
+        """
+        if (self.num_requests == 0):
+            return 0.0
+
+        return self.total_wait_sec / self.num_requests
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter which allows `rate` units per second, with bursts of up to `capacity` units. Callers
+    reserve units, which may leave the bucket in debt, and are told how long to wait until the reservation is valid.
+    This keeps requests in FIFO order without holding a lock while waiting.
+
+    Parameters
+    ----------
+    rate : float
+        Number of units added to the bucket per second.
+    capacity : float, optional
+        Maximum number of units in the bucket, by default `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if (rate <= 0):
+            raise ValueError("rate must be greater than 0")
+
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Reserve `amount` units, returning the number of seconds to wait before they are available.
+        """
+        # A single request larger than the bucket would otherwise never be allowed
+        amount = min(amount, self._capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_update) * self._rate)
+            self._last_update = now
+
+            self._tokens -= amount
+
+            if (self._tokens >= 0):
+                return 0.0
+
+            return -self._tokens / self._rate
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until `amount` units are available.
+        """
+        delay = self.reserve(amount)
+        if (delay > 0):
+            await asyncio.sleep(delay)
+
+
+class LLMRequestScheduler:
+    """
+    Schedules the requests made by LLM clients, limiting the number of requests in flight and the rate of requests and
+    tokens, and retrying failed requests with exponential backoff and jitter. A single scheduler can be shared by many
+    clients to enforce limits across all of them.
+
+    Parameters
+    ----------
+    max_in_flight : int, optional
+        Maximum number of requests in flight, when 0 the number of requests is not limited.
+    requests_per_second : float, optional
+        Maximum rate of requests, when 0 the rate is not limited.
+    tokens_per_second : float, optional
+        Maximum rate of tokens, when 0 the rate is not limited. The number of tokens of a request is provided by the
+        caller, typically the estimated prompt tokens plus the maximum number of generated tokens.
+    burst_sec : float, optional
+        Number of seconds of requests/tokens which can be sent in a burst.
+    max_retries : int, optional
+        Default number of times a failed request is retried.
+    backoff_base_sec : float, optional
+        Delay before the first retry, doubling for each subsequent retry.
+    backoff_max_sec : float, optional
+        Maximum delay between retries.
+    jitter : bool, optional
+        When True, each delay is drawn uniformly between 0 and the exponential delay ("full jitter"), this prevents
+        requests which failed together from being retried together.
+    retry_on : typing.Callable[[BaseException], bool], optional
+        Returns True if a request which raised the given exception should be retried, by default every `Exception` is
+        retried.
+    """
+
+    def __init__(self,
+                 *,
+                 max_in_flight: int = 0,
+                 requests_per_second: float = 0,
+                 tokens_per_second: float = 0,
+                 burst_sec: float = 1.0,
+                 max_retries: int = 0,
+                 backoff_base_sec: float = 0.1,
+                 backoff_max_sec: float = 10.0,
+                 jitter: bool = True,
+                 retry_on: typing.Callable[[BaseException], bool] = None):
+        self._max_in_flight = max_in_flight
+        self._max_retries = max_retries
+        self._backoff_base_sec = backoff_base_sec
+        self._backoff_max_sec = backoff_max_sec
+        self._jitter = jitter
+        self._retry_on = retry_on or (lambda exc: isinstance(exc, Exception))
+
+        self._request_bucket = None
+        if (requests_per_second > 0):
+            self._request_bucket = TokenBucket(requests_per_second, max(1.0, requests_per_second * burst_sec))
+
+        self._token_bucket = None
+        if (tokens_per_second > 0):
+            self._token_bucket = TokenBucket(tokens_per_second, max(1.0, tokens_per_second * burst_sec))
+
+        # asyncio primitives are bound to a single event loop
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop,
+                                                    asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+        self._metrics: dict[str, LLMRequestMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+    def _get_semaphore(self) -> asyncio.Semaphore | None:
+        if (self._max_in_flight <= 0):
+            return None
+
+        loop = asyncio.get_running_loop()
+
+        semaphore = self._semaphores.get(loop)
+        if (semaphore is None):
+            semaphore = asyncio.Semaphore(self._max_in_flight)
+            self._semaphores[loop] = semaphore
+
+        return semaphore
+
+    def _get_client_metrics(self, client_name: str) -> LLMRequestMetrics:
+        metrics = self._metrics.get(client_name)
+        if (metrics is None):
+            metrics = LLMRequestMetrics()
+            self._metrics[client_name] = metrics
+
+        return metrics
+
+    def get_metrics(self, client_name: str = None) -> LLMRequestMetrics:
+        """
+        Returns a copy of the metrics of `client_name`, or the combined metrics of all clients when None.
+        """
+        with self._metrics_lock:
+            if (client_name is not None):
+                return LLMRequestMetrics(**vars(self._get_client_metrics(client_name)))
+
+            combined = LLMRequestMetrics()
+            for metrics in self._metrics.values():
+                for (field, value) in vars(metrics).items():
+                    if (field == "max_queue_depth"):
+                        combined.max_queue_depth = max(combined.max_queue_depth, value)
+                    else:
+                        setattr(combined, field, getattr(combined, field) + value)
+
+            return combined
+
+    def get_backoff_delay(self, attempt: int) -> float:
+        """
+        Returns the delay before retry number `attempt` (starting at 0).
+        """
+        delay = min(self._backoff_max_sec, self._backoff_base_sec * (2**attempt))
+
+        if (self._jitter):
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    async def _acquire_rate(self, num_tokens: int):
+        if (self._request_bucket is not None):
+            await self._request_bucket.acquire(1)
+
+        if (self._token_bucket is not None and num_tokens > 0):
+            await self._token_bucket.acquire(num_tokens)
+
+    async def submit(self,
+                     fn: typing.Callable[[], typing.Awaitable[T]],
+                     *,
+                     num_tokens: int = 0,
+                     client_name: str = "default",
+                     max_retries: int = None,
+                     retry_on: typing.Callable[[BaseException], bool] = None) -> T:
+        """
+        Perform a request, waiting for a free slot and for the rate limits, and retrying it if it fails.
+
+        Parameters
+        ----------
+        fn : typing.Callable[[], typing.Awaitable[T]]
+            Function which performs the request, called again for each retry.
+        num_tokens : int, optional
+            Number of tokens used by the request, counted against `tokens_per_second`.
+        client_name : str, optional
+            Name to record the metrics of this request under.
+        max_retries : int, optional
+            Overrides the number of times this request is retried.
+        retry_on : typing.Callable[[BaseException], bool], optional
+            Overrides which exceptions raised by this request are retried.
+
+        Returns
+        -------
+        T
+            The result of `fn`.
+        """
+        max_retries = self._max_retries if max_retries is None else max_retries
+        retry_on = retry_on or self._retry_on
+        semaphore = self._get_semaphore()
+
+        with self._metrics_lock:
+            metrics = self._get_client_metrics(client_name)
+            metrics.num_requests += 1
+            metrics.num_tokens += num_tokens
+
+        attempt = 0
+        latency_sec = 0.0
+
+        while True:
+            await self._wait_for_slot(semaphore, num_tokens, metrics)
+
+            start_time = time.monotonic()
+
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                raise
+            except BaseException as exc:
+                if (attempt >= max_retries or not retry_on(exc)):
+                    with self._metrics_lock:
+                        metrics.num_failed += 1
+                        metrics.total_latency_sec += latency_sec + (time.monotonic() - start_time)
+
+                    raise
+
+                delay = self.get_backoff_delay(attempt)
+                attempt += 1
+
+                logger.debug("Request for %s failed (%s), retry %d of %d in %.2f seconds",
+                             client_name,
+                             exc,
+                             attempt,
+                             max_retries,
+                             delay)
+
+                with self._metrics_lock:
+                    metrics.num_retries += 1
+            else:
+                with self._metrics_lock:
+                    metrics.num_completed += 1
+                    metrics.total_latency_sec += latency_sec + (time.monotonic() - start_time)
+
+                return result
+            finally:
+                latency_sec += time.monotonic() - start_time
+
+                with self._metrics_lock:
+                    metrics.in_flight -= 1
+
+                if (semaphore is not None):
+                    semaphore.release()
+
+            # Retries release their slot while waiting
+            await asyncio.sleep(delay)
+
+    async def _wait_for_slot(self, semaphore: asyncio.Semaphore | None, num_tokens: int, metrics: LLMRequestMetrics):
+        queued_time = time.monotonic()
+
+        with self._metrics_lock:
+            metrics.queue_depth += 1
+            metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+
+        try:
+            if (semaphore is not None):
+                await semaphore.acquire()
+
+            try:
+                await self._acquire_rate(num_tokens)
+            except BaseException:
+                if (semaphore is not None):
+                    semaphore.release()
+                raise
+
+        finally:
+            with self._metrics_lock:
+                metrics.queue_depth -= 1
+                metrics.total_wait_sec += time.monotonic() - queued_time
+
+        with self._metrics_lock:
+            metrics.in_flight += 1
+
+    async def submit_batch(self,
+                           fns: list[typing.Callable[[], typing.Awaitable[T]]],
+                           *,
+                           num_tokens: list[int] = None,
+                           client_name: str = "default",
+                           max_retries: int = None,
+                           return_exceptions: bool = False) -> list[T | BaseException]:
+        """
+        Perform a batch of requests with `submit`, returning their results in order.
+
+        Parameters
+        ----------
+        fns : list[typing.Callable[[], typing.Awaitable[T]]]
+            Functions which perform each request.
+        num_tokens : list[int], optional
+            Number of tokens used by each request.
+        client_name : str, optional
+            Name to record the metrics of these requests under.
+        max_retries : int, optional
+            Overrides the number of times each request is retried.
+        return_exceptions : bool, optional
+            Whether to return exceptions in the output list or raise them immediately.
+
+        Returns
+        -------
+        list[T | BaseException]
+            The results of each request.
+        """
+        num_tokens = num_tokens or [0] * len(fns)
+
+        coros = [
+            self.submit(fn, num_tokens=tokens, client_name=client_name, max_retries=max_retries)
+            for (fn, tokens) in zip(fns, num_tokens)
+        ]
+
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
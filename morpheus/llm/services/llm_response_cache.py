@@ -0,0 +1,381 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import typing
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from morpheus.llm.services.llm_service import LLMClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMResponseCacheMetrics:
+    """
+    Counters for the lookups performed on a `LLMResponseCache`.
+    """
+    num_hits: int = 0
+    num_misses: int = 0
+    num_evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        num_lookups = self.num_hits + self.num_misses
+        if (num_lookups == 0):
+            return 0.0
+
+        return self.num_hits / num_lookups
+
+
+class LLMResponseCache(ABC):
+    """
+    Abstract interface for caches of LLM responses, keyed by a string computed by `CachedLLMClient`.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of cached responses, the least recently used responses are evicted first. When 0 the number of
+        responses is not limited.
+    ttl_sec : float, optional
+        Time for which a response is cached, when 0 responses don't expire.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_sec: float = 0) -> None:
+        self._max_entries = max_entries
+        self._ttl_sec = ttl_sec
+        self._metrics = LLMResponseCacheMetrics()
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> LLMResponseCacheMetrics:
+        return self._metrics
+
+    def _is_expired(self, created_time: float, now: float) -> bool:
+        return self._ttl_sec > 0 and (now - created_time) > self._ttl_sec
+
+    def get(self, key: str) -> str | None:
+        """
+        Returns the cached response for `key`, or None if there is no unexpired response.
+        """
+        with self._lock:
+            value = self._get(key, time.time())
+
+            if (value is None):
+                self._metrics.num_misses += 1
+            else:
+                self._metrics.num_hits += 1
+
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Cache the response `value` for `key`.
+        """
+        with self._lock:
+            self._metrics.num_evictions += self._set(key, value, time.time())
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        with self._lock:
+            self._clear()
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> str | None:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, value: str, now: float) -> int:
+        """
+        Stores the response, returning the number of responses evicted.
+        """
+        pass
+
+    @abstractmethod
+    def _clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class InMemoryLLMResponseCache(LLMResponseCache):
+    """
+    LRU cache of LLM responses held in memory.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of cached responses, the least recently used responses are evicted first. When 0 the number of
+        responses is not limited.
+    ttl_sec : float, optional
+        Time for which a response is cached, when 0 responses don't expire.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_sec: float = 0) -> None:
+        super().__init__(max_entries=max_entries, ttl_sec=ttl_sec)
+
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def _get(self, key: str, now: float) -> str | None:
+        entry = self._entries.get(key)
+        if (entry is None):
+            return None
+
+        (created_time, value) = entry
+        if (self._is_expired(created_time, now)):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def _set(self, key: str, value: str, now: float) -> int:
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+
+        num_evicted = 0
+        while (self._max_entries > 0 and len(self._entries) > self._max_entries):
+            self._entries.popitem(last=False)
+            num_evicted += 1
+
+        return num_evicted
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteLLMResponseCache(LLMResponseCache):
+    """
+    LRU cache of LLM responses stored in a SQLite database, allowing responses to be reused across runs and shared by
+    multiple processes.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database, created if it doesn't exist.
+    max_entries : int, optional
+        Maximum number of cached responses, the least recently used responses are evicted first. When 0 the number of
+        responses is not limited.
+    ttl_sec : float, optional
+        Time for which a response is cached, when 0 responses don't expire.
+    """
+
+    def __init__(self, path: str, max_entries: int = 65536, ttl_sec: float = 0) -> None:
+        super().__init__(max_entries=max_entries, ttl_sec=ttl_sec)
+
+        parent_dir = os.path.dirname(path)
+        if (parent_dir):
+            os.makedirs(parent_dir, exist_ok=True)
+
+        self._path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                           "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def _get(self, key: str, now: float) -> str | None:
+        row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key, )).fetchone()
+        if (row is None):
+            return None
+
+        (value, created_time) = row
+        if (self._is_expired(created_time, now)):
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key, ))
+            return None
+
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        return value
+
+    def _set(self, key: str, value: str, now: float) -> int:
+        self._conn.execute("INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                           (key, value, now, now))
+
+        if (self._max_entries <= 0):
+            return 0
+
+        num_entries = len(self)
+        if (num_entries <= self._max_entries):
+            return 0
+
+        num_evicted = num_entries - self._max_entries
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+            (num_evicted, ))
+
+        return num_evicted
+
+    def _clear(self) -> None:
+        self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the connection to the database.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLMClient(LLMClient):
+    """
+    Wraps a `LLMClient`, returning cached responses for inputs which have been seen before. Responses are keyed by the
+    model name, the model arguments and every input value, so clients for different models can share a cache. In a
+    batch only the inputs which aren't cached are sent to the wrapped client, duplicate inputs in a batch are only
+    sent once. Exceptions are never cached.
+
+    Parameters
+    ----------
+    llm_client : LLMClient
+        The client to generate responses which aren't cached.
+    cache : LLMResponseCache
+        The cache to store responses in.
+    model_name : str, optional
+        Model name to include in the cache key, by default the `_model_name` attribute of `llm_client`.
+    model_kwargs : dict, optional
+        Model arguments to include in the cache key, by default the `_model_kwargs` attribute of `llm_client`.
+    """
+
+    def __init__(self,
+                 llm_client: LLMClient,
+                 cache: LLMResponseCache,
+                 model_name: str = None,
+                 model_kwargs: dict = None) -> None:
+        super().__init__()
+
+        self._llm_client = llm_client
+        self._cache = cache
+
+        if (model_name is None):
+            model_name = getattr(llm_client, "_model_name", type(llm_client).__name__)
+
+        if (model_kwargs is None):
+            model_kwargs = getattr(llm_client, "_model_kwargs", {})
+
+        self._key_prefix = json.dumps({"model": model_name, "kwargs": model_kwargs}, sort_keys=True, default=str)
+
+    @property
+    def cache(self) -> LLMResponseCache:
+        return self._cache
+
+    def get_input_names(self) -> list[str]:
+        return self._llm_client.get_input_names()
+
+    def _make_key(self, input_dict: dict[str, typing.Any]) -> str:
+        inputs = json.dumps(input_dict, sort_keys=True, default=str)
+
+        return hashlib.sha256(f"{self._key_prefix}{inputs}".encode()).hexdigest()
+
+    def _split_batch(self, inputs: dict[str, list]) -> tuple[list, list[str], dict[str, list], list[str]]:
+        """
+        Looks up each input of the batch, returning the results found in the cache, the keys of every input and the
+        inputs and keys which must be generated.
+        """
+        input_names = list(inputs.keys())
+        num_inputs = len(inputs[input_names[0]]) if input_names else 0
+
+        results = [None] * num_inputs
+        keys = []
+        miss_inputs = {name: [] for name in input_names}
+        miss_keys = []
+        pending_keys = set()
+
+        for i in range(num_inputs):
+            key = self._make_key({name: inputs[name][i] for name in input_names})
+            keys.append(key)
+
+            if (key in pending_keys):
+                continue
+
+            cached = self._cache.get(key)
+            if (cached is not None):
+                results[i] = cached
+                continue
+
+            miss_keys.append(key)
+            pending_keys.add(key)
+            for name in input_names:
+                miss_inputs[name].append(inputs[name][i])
+
+        return (results, keys, miss_inputs, miss_keys)
+
+    def _merge_batch(self, results: list, keys: list[str], miss_keys: list[str], miss_results: list) -> list:
+        generated = dict(zip(miss_keys, miss_results))
+
+        for (key, result) in generated.items():
+            if (not isinstance(result, BaseException)):
+                self._cache.set(key, result)
+
+        return [result if result is not None else generated[key] for (result, key) in zip(results, keys)]
+
+    def generate(self, **input_dict) -> str:
+        key = self._make_key(input_dict)
+
+        result = self._cache.get(key)
+        if (result is None):
+            result = self._llm_client.generate(**input_dict)
+            self._cache.set(key, result)
+
+        return result
+
+    async def generate_async(self, **input_dict) -> str:
+        key = self._make_key(input_dict)
+
+        result = self._cache.get(key)
+        if (result is None):
+            result = await self._llm_client.generate_async(**input_dict)
+            self._cache.set(key, result)
+
+        return result
+
+    def generate_batch(self, inputs: dict[str, list], return_exceptions=False) -> list[str] | list[str | BaseException]:
+        (results, keys, miss_inputs, miss_keys) = self._split_batch(inputs)
+
+        miss_results = []
+        if (len(miss_keys) > 0):
+            miss_results = self._llm_client.generate_batch(miss_inputs, return_exceptions=return_exceptions)
+
+        return self._merge_batch(results, keys, miss_keys, miss_results)
+
+    async def generate_batch_async(self,
+                                   inputs: dict[str, list],
+                                   return_exceptions=False) -> list[str] | list[str | BaseException]:
+        (results, keys, miss_inputs, miss_keys) = self._split_batch(inputs)
+
+        miss_results = []
+        if (len(miss_keys) > 0):
+            miss_results = await self._llm_client.generate_batch_async(miss_inputs,
+                                                                       return_exceptions=return_exceptions)
+
+        return self._merge_batch(results, keys, miss_keys, miss_results)
@@ -18,6 +18,8 @@ import os
 import typing
 import warnings
 
+from morpheus.llm.services.llm_request_scheduler import LLMRequestScheduler
+from morpheus.llm.services.llm_request_scheduler import estimate_tokens
 from morpheus.llm.services.llm_service import LLMClient
 from morpheus.llm.services.llm_service import LLMService
 
@@ -35,6 +37,12 @@ except ImportError as import_exc:
     IMPORT_EXCEPTION = import_exc
 
 
+class _NeMoGenerateError(RuntimeError):
+    """
+    Raised when the NeMo service reports a failed generation, these requests are retried.
+    """
+
+
 class NeMoLLMClient(LLMClient):
     """
     Client for interacting with a specific model in Nemo. This class should be constructed with the
@@ -127,10 +135,9 @@ class NeMoLLMClient(LLMClient):
                                                  **self._model_kwargs))
 
     async def _process_one_async(self, prompt: str) -> str:
-        iterations = 0
         errors = []
 
-        while iterations < self._parent._retry_count:
+        async def _generate_one() -> str:
             fut = await asyncio.wrap_future(
                 self._parent._conn.generate(model=self._model_name,
                                             prompt=prompt,
@@ -141,15 +148,24 @@ class NeMoLLMClient(LLMClient):
                 fut, return_text_completion_only=False)  # type: ignore
 
             if result.get('status', None) == 'fail':
-                iterations += 1
                 errors.append(result.get('msg', 'Unknown error'))
-                continue
+                raise _NeMoGenerateError(errors[-1])
 
             return result['text']
 
-        raise RuntimeError(
-            f"Failed to generate response for prompt '{prompt}' after {self._parent._retry_count} attempts. "
-            f"Errors: {errors}")
+        num_tokens = estimate_tokens(prompt) + self._model_kwargs.get("tokens_to_generate", 0)
+
+        try:
+            # Failed generations are retried by the scheduler, with a backoff between each attempt
+            return await self._parent.scheduler.submit(_generate_one,
+                                                       num_tokens=num_tokens,
+                                                       client_name=self._model_name,
+                                                       max_retries=max(0, self._parent._retry_count - 1),
+                                                       retry_on=lambda exc: isinstance(exc, _NeMoGenerateError))
+        except _NeMoGenerateError:
+            raise RuntimeError(
+                f"Failed to generate response for prompt '{prompt}' after {self._parent._retry_count} attempts. "
+                f"Errors: {errors}") from None
 
     @typing.overload
     async def generate_batch_async(self,
@@ -190,7 +206,12 @@ class NeMoLLMService(LLMService):
     A service for interacting with NeMo LLM models, this class should be used to create a client for a specific model.
     """
 
-    def __init__(self, *, api_key: str = None, org_id: str = None, retry_count=5) -> None:
+    def __init__(self,
+                 *,
+                 api_key: str = None,
+                 org_id: str = None,
+                 retry_count=5,
+                 scheduler: LLMRequestScheduler = None) -> None:
         """
         Creates a service for interacting with NeMo LLM models.
 
@@ -205,6 +226,10 @@ class NeMoLLMService(LLMService):
             `api_key` is a member of multiple NGC organizations., by default None
         retry_count : int, optional
             The number of times to retry a request before raising an exception, by default 5
+        scheduler : LLMRequestScheduler, optional
+            Scheduler used for the asynchronous requests of all clients created by this service, limiting the
+            concurrency and rate of requests and applying a backoff between retries. By default the number and rate of
+            requests are not limited.
 
         """
 
@@ -217,6 +242,8 @@ class NeMoLLMService(LLMService):
 
         self._retry_count = retry_count
 
+        self._scheduler = scheduler or LLMRequestScheduler()
+
         self._conn = nemollm.NemoLLM(
             api_host=os.environ.get("NGC_API_BASE", None),
             # The client must configure the authentication and authorization parameters
@@ -230,6 +257,10 @@ class NeMoLLMService(LLMService):
             org_id=org_id,
         )
 
+    @property
+    def scheduler(self) -> LLMRequestScheduler:
+        return self._scheduler
+
     def get_client(self, *, model_name: str, **model_kwargs) -> NeMoLLMClient:
         """
         Returns a client for interacting with a specific model. This method is the preferred way to create a client.
@@ -22,6 +22,8 @@ from textwrap import dedent
 
 import appdirs
 
+from morpheus.llm.services.llm_request_scheduler import LLMRequestScheduler
+from morpheus.llm.services.llm_request_scheduler import estimate_tokens
 from morpheus.llm.services.llm_service import LLMClient
 from morpheus.llm.services.llm_service import LLMService
 
@@ -204,6 +206,11 @@ class OpenAIChatClient(LLMClient):
                               input_dict.get(self._assistant_key),
                               return_exceptions=False)
 
+    def _estimate_tokens(self, messages: list["openai.types.chat.ChatCompletionMessageParam"]) -> int:
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+
+        return prompt_tokens + self._model_kwargs.get("max_tokens", 0)
+
     async def _generate_async(self, prompt: str, assistant: str = None) -> str:
 
         messages = self._create_messages(prompt, assistant)
@@ -211,9 +218,11 @@ class OpenAIChatClient(LLMClient):
         with self._api_logger(inputs=messages) as msg_logger:
 
             try:
-                output = await self._client_async.chat.completions.create(model=self._model_name,
-                                                                          messages=messages,
-                                                                          **self._model_kwargs)
+                output = await self._parent.scheduler.submit(
+                    lambda: self._client_async.chat.completions.create(
+                        model=self._model_name, messages=messages, **self._model_kwargs),
+                    num_tokens=self._estimate_tokens(messages),
+                    client_name=self._model_name)
             except Exception as exc:
                 self._parent._logger.error("Error generating completion: %s", exc)
                 raise
@@ -316,7 +325,7 @@ class OpenAIChatService(LLMService):
     A service for interacting with OpenAI Chat models, this class should be used to create clients.
     """
 
-    def __init__(self, *, default_model_kwargs: dict = None) -> None:
+    def __init__(self, *, default_model_kwargs: dict = None, scheduler: LLMRequestScheduler = None) -> None:
         """
         Creates a service for interacting with OpenAI Chat models, this class should be used to create clients.
 
@@ -327,6 +336,10 @@ class OpenAIChatService(LLMService):
             will automatically be used when calling `get_client`. Arguments specified in the `get_client` function will
             overwrite default values specified here. This is useful to set model arguments before creating multiple
             clients. By default None
+        scheduler : LLMRequestScheduler, optional
+            Scheduler used for the asynchronous requests of all clients created by this service, limiting the
+            concurrency and rate of requests. By default requests are not limited. Retries of failed requests are
+            performed by the `openai` package, see the `max_retries` argument of `get_client`.
 
         Raises
         ------
@@ -340,6 +353,8 @@ class OpenAIChatService(LLMService):
 
         self._default_model_kwargs = default_model_kwargs or {}
 
+        self._scheduler = scheduler or LLMRequestScheduler()
+
         self._logger = logging.getLogger(f"{__package__}.{OpenAIChatService.__name__}")
 
         # Dont propagate up to the default logger. Just log to file
@@ -357,6 +372,10 @@ class OpenAIChatService(LLMService):
 
         self._message_count = 0
 
+    @property
+    def scheduler(self) -> LLMRequestScheduler:
+        return self._scheduler
+
     def _get_message_id(self):
 
         self._message_count += 1
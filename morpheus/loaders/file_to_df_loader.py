@@ -78,6 +78,7 @@ def file_to_df_loader(control_message: ControlMessage, task: dict):
     filter_null = config.get("filter_null", False)
     parser_kwargs = config.get("parser_kwargs", None)
     cache_dir = config.get("cache_dir", None)
+    cache_max_bytes = config.get("cache_max_bytes", None)
 
     if (cache_dir is None):
         cache_dir = "./.cache"
@@ -97,7 +98,8 @@ def file_to_df_loader(control_message: ControlMessage, task: dict):
                                         file_type=file_type,
                                         parser_kwargs=parser_kwargs,
                                         cache_dir=cache_dir,
-                                        timestamp_column_name=timestamp_column_name)
+                                        timestamp_column_name=timestamp_column_name,
+                                        cache_max_bytes=cache_max_bytes)
         pdf = controller.convert_to_dataframe(file_object_batch=(fsspec.open_files(files), n_groups))
         df = cudf.from_pandas(pdf)
 
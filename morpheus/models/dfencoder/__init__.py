@@ -61,6 +61,7 @@ from .dataloader import DataframeDataset
 from .dataloader import DFEncoderDataLoader
 from .dataloader import FileSystemDataset
 from .distributed_ae import DistributedAutoEncoder
+from .encoding import EncodingPlan
 from .logging import BasicLogger
 from .logging import IpynbLogger
 from .logging import TensorboardXLogger
@@ -68,6 +69,8 @@ from .scalers import GaussRankScaler
 from .scalers import ModifiedScaler
 from .scalers import NullScaler
 from .scalers import StandardScaler
+from .training_executor import AETrainingExecutor
+from .training_executor import AETrainingResult
 
 __all__ = [
     "AEModule",
@@ -78,6 +81,7 @@ __all__ = [
     "FileSystemDataset",
     "DFEncoderDataLoader",
     "DistributedAutoEncoder",
+    "EncodingPlan",
     "BasicLogger",
     "IpynbLogger",
     "TensorboardXLogger",
@@ -85,4 +89,6 @@ __all__ = [
     "ModifiedScaler",
     "NullScaler",
     "StandardScaler",
+    "AETrainingExecutor",
+    "AETrainingResult",
 ]
@@ -62,10 +62,14 @@ from torch.utils.data import DataLoader
 
 from .ae_module import AEModule
 from .dataframe import EncoderDataFrame
+from .dataframe import gen_swap_indices
+from .dataframe import swap_array_columns
 from .dataloader import DataframeDataset
 from .dataloader import DFEncoderDataLoader
 from .dataloader import FileSystemDataset
 from .distributed_ae import DistributedAutoEncoder
+from .encoding import EncodedFeatures
+from .encoding import EncodingPlan
 from .logging import BasicLogger
 from .logging import IpynbLogger
 from .logging import TensorboardXLogger
@@ -145,6 +149,7 @@ class AutoEncoder(torch.nn.Module):
             preset_numerical_scaler_params=None,
             binary_feature_list=None,
             loss_scaler='standard',  # scaler for the losses (z score)
+            swap_random_state=None,
             **kwargs):
         super().__init__(**kwargs)
 
@@ -153,6 +158,7 @@ class AutoEncoder(torch.nn.Module):
         self.categorical_fts = OrderedDict()
         self.cyclical_fts = OrderedDict()
         self.feature_loss_stats = dict()
+        self._encoding_plan = None
 
         if device is None:
             self.device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
@@ -183,6 +189,10 @@ class AutoEncoder(torch.nn.Module):
         self.preset_numerical_scaler_params = preset_numerical_scaler_params
 
         self.swap_probability = swap_probability
+        # seed or numpy random generator used for swap noise, None uses the global numpy random state
+        self.swap_random_state = swap_random_state
+        if isinstance(swap_random_state, int):
+            self.swap_random_state = np.random.default_rng(swap_random_state)
         self.batch_size = batch_size
         self.eval_batch_size = eval_batch_size
 
@@ -419,6 +429,31 @@ class AutoEncoder(torch.nn.Module):
             self._init_cats(df)
         self._init_numeric(df)
         self._init_binary(df)
+        self._encoding_plan = EncodingPlan(self.numeric_fts, self.binary_fts, self.categorical_fts)
+
+    @property
+    def encoding_plan(self) -> EncodingPlan:
+        """The precompiled `EncodingPlan` for the model's features, built when the features are initialized."""
+        # Models serialized before the plan existed will not have the attribute
+        if getattr(self, '_encoding_plan', None) is None:
+            self._encoding_plan = EncodingPlan(self.numeric_fts, self.binary_fts, self.categorical_fts)
+        return self._encoding_plan
+
+    def encode_df(self, df):
+        """Encodes a raw dataframe directly into the numerical, binary and categorical tensors used by the model,
+        without building an intermediate prepared dataframe.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The raw input dataframe
+
+        Returns
+        -------
+        Tuple[torch.Tensor, torch.Tensor, List[torch.Tensor]]
+            The numerical and binary tensors and a list of categorical code tensors.
+        """
+        return self._target_arrays_to_tensors(*self.encoding_plan.encode(df))
 
     def prepare_df(self, df):
         """Does data preparation on copy of input dataframe.
@@ -433,23 +468,20 @@ class AutoEncoder(torch.nn.Module):
         pandas.DataFrame
             A processed copy of df.
         """
-        output_df = EncoderDataFrame()
-        for ft in self.numeric_fts:
-            feature = self.numeric_fts[ft]
-            col = df[ft].fillna(feature['mean'])
-            trans_col = feature['scaler'].transform(col.values)
-            trans_col = pd.Series(index=df.index, data=trans_col)
-            output_df[ft] = trans_col
+        plan = self.encoding_plan
+        num = plan.encode_numeric(df)
+        bin = plan.encode_binary(df)
+        codes = plan.encode_categorical(df)
 
-        for ft in self.binary_fts:
-            feature = self.binary_fts[ft]
-            output_df[ft] = df[ft].apply(lambda x: feature.get(x, False))
+        output_df = EncoderDataFrame(index=df.index)
+        for (i, ft) in enumerate(plan.num_names):
+            output_df[ft] = num[:, i]
 
-        for ft in self.categorical_fts:
-            feature = self.categorical_fts[ft]
-            col = pd.Categorical(df[ft], categories=feature['cats'] + ['_other'])
-            col = col.fillna('_other')
-            output_df[ft] = col
+        for (i, ft) in enumerate(plan.bin_names):
+            output_df[ft] = bin[:, i]
+
+        for (i, ft) in enumerate(plan.cat_names):
+            output_df[ft] = pd.Categorical.from_codes(codes[i], categories=plan.categories(i))
 
         return output_df
 
@@ -531,27 +563,60 @@ class AutoEncoder(torch.nn.Module):
         elif self.logger == 'tensorboard':
             self.logger = TensorboardXLogger(logdir=self.logdir, run=self.run, fts=fts)
 
-    def compute_targets(self, df):
-        num = torch.tensor(df[self.num_names].values).float().to(self.device)
-        bin = torch.tensor(df[self.bin_names].astype(int).values).float().to(self.device)
-        codes = []
-        for ft in self.categorical_fts:
-            code = torch.tensor(df[ft].cat.codes.astype(int).values).to(self.device)
-            codes.append(code)
+    def _compute_target_arrays(self, df):
+        """Extracts the numerical, binary and categorical code arrays from a dataframe returned by `prepare_df`."""
+        num = df[self.num_names].to_numpy(dtype=np.float32)
+        bin = df[self.bin_names].to_numpy(dtype=np.float32)
+        codes = [df[ft].cat.codes.to_numpy(dtype=np.int64) for ft in self.categorical_fts]
         return num, bin, codes
 
-    def encode_input(self, df):
-        """
-        Handles raw df inputs.
-        Passes categories through embedding layers.
+    def _target_arrays_to_tensors(self, num, bin, codes):
+        num = torch.from_numpy(num).to(self.device)
+        bin = torch.from_numpy(bin).to(self.device)
+        codes = [torch.from_numpy(code).to(self.device) for code in codes]
+        return num, bin, codes
+
+    def _swap_target_arrays(self, num, bin, codes):
+        """Applies swap noise to copies of the arrays returned by `_compute_target_arrays`.
+
+        This is equivalent to calling `EncoderDataFrame.swap` on the prepared dataframe, but works directly on the
+        encoded arrays so no intermediate dataframe is created.
         """
-        num, bin, codes = self.compute_targets(df)
+        n_num = num.shape[1]
+        n_bin = bin.shape[1]
+        src_rows, dst_rows = gen_swap_indices(len(num),
+                                              n_num + n_bin + len(codes),
+                                              self.swap_probability,
+                                              random_state=self.swap_random_state)
+
+        num = swap_array_columns(num.copy(), src_rows[:, :n_num], dst_rows[:, :n_num])
+        bin = swap_array_columns(bin.copy(), src_rows[:, n_num:n_num + n_bin], dst_rows[:, n_num:n_num + n_bin])
+
+        swapped_codes = []
+        for (i, code) in enumerate(codes, start=n_num + n_bin):
+            code = code.copy()
+            code[dst_rows[:, i]] = code[src_rows[:, i]]
+            swapped_codes.append(code)
+
+        return num, bin, swapped_codes
+
+    def compute_targets(self, df):
+        return self._target_arrays_to_tensors(*self._compute_target_arrays(df))
+
+    def _encode_targets(self, num, bin, codes):
         embeddings = []
         for i, embedding_layer in enumerate(self.model.categorical_embedding.values()):
             emb = embedding_layer(codes[i])
             embeddings.append(emb)
         return [num], [bin], embeddings
 
+    def encode_input(self, df):
+        """
+        Handles raw df inputs.
+        Passes categories through embedding layers.
+        """
+        return self._encode_targets(*self.compute_targets(df))
+
     def build_input_tensor(self, df):
         num, bin, embeddings = self.encode_input(df)
         x = torch.cat(num + bin + embeddings, dim=1)
@@ -586,8 +651,8 @@ class AutoEncoder(torch.nn.Module):
 
         Parameters
         ----------
-        df : pandas.DataFrame
-            The input dataframe to preprocess.
+        df : pandas.DataFrame or EncodedFeatures
+            The input dataframe to preprocess, or data already encoded by `self.encoding_plan`.
         shuffle_rows_in_batch : bool
             Whether to shuffle the rows of the dataframe before processing.
         include_original_input_tensor : bool
@@ -602,26 +667,36 @@ class AutoEncoder(torch.nn.Module):
         Dict[str, Union[int, torch.Tensor]]
             A dict containing the preprocessed input data and targets by feature type.
         """
-        if shuffle_rows_in_batch:
-            df = df.sample(frac=1.0)
-        df = self.prepare_df(df)
-        swapped_df = df.swap(likelihood=self.swap_probability)
-        swapped_input_tensor = self.build_input_tensor(swapped_df)
-        num_target, bin_target, codes = self.compute_targets(df)
+        if isinstance(df, EncodedFeatures):
+            target_arrays = df
+            if shuffle_rows_in_batch:
+                target_arrays = target_arrays.take(np.random.permutation(target_arrays.num_rows))
+        else:
+            if shuffle_rows_in_batch:
+                df = df.sample(frac=1.0)
+            target_arrays = self.encoding_plan.encode(df)
+
+        num_target, bin_target, codes = self._target_arrays_to_tensors(*target_arrays)
+
+        # Corrupt the already encoded arrays rather than building a swapped copy of the dataframe
+        num_swapped, bin_swapped, codes_swapped = self._target_arrays_to_tensors(
+            *self._swap_target_arrays(*target_arrays))
+        num, bin, embeddings = self._encode_targets(num_swapped, bin_swapped, codes_swapped)
+        swapped_input_tensor = torch.cat(num + bin + embeddings, dim=1)
 
         preprocessed_data = {
             'input_swapped': swapped_input_tensor,
             'num_target': num_target,
             'bin_target': bin_target,
             'cat_target': codes,
-            'size': len(df),
+            'size': target_arrays.num_rows,
         }
 
         if include_original_input_tensor:
-            preprocessed_data['input_original'] = self.build_input_tensor(df)
+            num, bin, embeddings = self._encode_targets(num_target, bin_target, codes)
+            preprocessed_data['input_original'] = torch.cat(num + bin + embeddings, dim=1)
 
         if include_swapped_input_by_feature_type:
-            num_swapped, bin_swapped, codes_swapped = self.compute_targets(swapped_df)
             preprocessed_data['num_swapped'] = num_swapped
             preprocessed_data['bin_swapped'] = bin_swapped
             preprocessed_data['cat_swapped'] = codes_swapped
@@ -758,6 +833,9 @@ class AutoEncoder(torch.nn.Module):
     def _transform_dataset_for_training(self, dataset):
         dataset.batch_size = self.batch_size
         dataset.preprocess_fn = self.preprocess_training_data
+        if isinstance(dataset, FileSystemDataset):
+            dataset.encode_fn = self.encoding_plan.encode
+            dataset.cache_key = self.encoding_plan.fingerprint()
         dataset.shuffle_batch_indices = True
         dataset.shuffle_rows_in_batch = True
 
@@ -766,6 +844,9 @@ class AutoEncoder(torch.nn.Module):
     def _transform_dataset_for_validation(self, dataset):
         dataset.batch_size = self.eval_batch_size
         dataset.preprocess_fn = self.preprocess_validation_data
+        if isinstance(dataset, FileSystemDataset):
+            dataset.encode_fn = self.encoding_plan.encode
+            dataset.cache_key = self.encoding_plan.fingerprint()
         dataset.shuffle_batch_indices = False
         dataset.shuffle_rows_in_batch = False
 
@@ -1142,6 +1223,19 @@ class AutoEncoder(torch.nn.Module):
             loss = losses.cpu().numpy()
             self.feature_loss_stats[ft] = self._create_stat_dict(loss)
 
+    def update_loss_stats(self, df):
+        """Recomputes the `self.feature_loss_stats` used to scale the feature losses from `df`, for example after
+        fine-tuning the model on a subset of the data it will be scored against.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            data to compute the feature losses for
+        """
+        (_, _, loss_dset) = self._build_or_configure_datasets(df, None, False)
+        self._transform_dataset_for_validation(loss_dset)
+        self._populate_loss_stats_from_dataset(loss_dset)
+
     def _get_feature_losses_from_dataset(self, dataset):
         """Computes the feature losses for each feature in the model for a given dataset.
 
@@ -1254,14 +1348,7 @@ class AutoEncoder(torch.nn.Module):
         result['mean_abs_z'] = result[[f'{ft}_z_loss' for ft in feature_losses]].mean(axis=1)
 
         # add a column describing the scaler of the losses
-        if self.loss_scaler_str == 'standard':
-            output_scaled_loss_str = 'z'
-        elif self.loss_scaler_str == 'modified':
-            output_scaled_loss_str = 'modz'
-        else:
-            # in case other custom scaling is used
-            output_scaled_loss_str = f'{self.loss_scaler_str}_scaled'
-        result['z_loss_scaler_type'] = output_scaled_loss_str
+        result['z_loss_scaler_type'] = self._get_output_scaled_loss_str()
 
         return result
 
@@ -1372,7 +1459,7 @@ class AutoEncoder(torch.nn.Module):
         for ft in bin_df.columns:
             feature = self.binary_fts[ft]
             map = {False: feature['cats'][0], True: feature['cats'][1]}
-            bin_df[ft] = bin_df[ft].apply(lambda x: map[x])
+            bin_df[ft] = bin_df[ft].map(map)
 
         cat_df = pd.DataFrame(index=index)
         for i, ft in enumerate(self.categorical_fts):
@@ -1385,9 +1472,8 @@ class AutoEncoder(torch.nn.Module):
             else:
                 # Only one option
                 codes = torch.argmax(cat[i], dim=1).cpu().numpy()
-            cat_df[ft] = codes
-            cats = feature['cats'] + ["_other"]
-            cat_df[ft] = cat_df[ft].apply(lambda x: cats[x])
+            cats = np.array(feature['cats'] + ["_other"], dtype=object)
+            cat_df[ft] = cats[codes]
 
         # concat
         output_df = pd.concat([num_df, bin_df, cat_df], axis=1)
@@ -1436,27 +1522,14 @@ class AutoEncoder(torch.nn.Module):
                 stop = (i + 1) * self.eval_batch_size
 
                 df_slice = df.iloc[start:stop]
-                data_slice = self.prepare_df(df_slice)
-                num_target, bin_target, codes = self.compute_targets(data_slice)
+                num_target, bin_target, codes = self.encode_df(df_slice)
 
-                input_slice = self.build_input_tensor(data_slice)
+                num, bin, embeddings = self._encode_targets(num_target, bin_target, codes)
+                input_slice = torch.cat(num + bin + embeddings, dim=1)
 
                 num, bin, cat = self.model(input_slice)
-                mse_loss_slice: torch.Tensor = self.mse(num, num_target)
-                bce_loss_slice: torch.Tensor = self.bce(bin, bin_target)
-                # each entry in `cce_loss_slice_of_each_feat` is the cce loss of a feature, ordered by the feature list self.categorical_fts
-                cce_loss_slice_of_each_feat = []
-
-                for i, ft in enumerate(self.categorical_fts):
-                    loss = self.cce(cat[i], codes[i])
-                    # Convert to 2 dimensions
-                    cce_loss_slice_of_each_feat.append(loss.data.reshape(-1, 1))
-
-                if cce_loss_slice_of_each_feat:
-                    # merge the tensors into one (n_records * n_features) tensor
-                    cce_loss_slice = torch.cat(cce_loss_slice_of_each_feat, dim=1)
-                else:
-                    cce_loss_slice = torch.empty((len(df_slice), 0), device=self.device)
+                mse_loss_slice, bce_loss_slice, cce_loss_slice = self._compute_row_losses(
+                    num, bin, cat, num_target, bin_target, codes)
 
                 mse_loss_slices.append(mse_loss_slice)
                 bce_loss_slices.append(bce_loss_slice)
@@ -1467,6 +1540,26 @@ class AutoEncoder(torch.nn.Module):
         cce_loss = torch.cat(cce_loss_slices, dim=0)
         return mse_loss, bce_loss, cce_loss
 
+    def _compute_row_losses(self, num, bin, cat, num_target, bin_target, codes):
+        """Computes the per-row, per-feature losses of the model outputs by feature type."""
+        mse_loss: torch.Tensor = self.mse(num, num_target)
+        bce_loss: torch.Tensor = self.bce(bin, bin_target)
+        # each entry in `cce_loss_of_each_feat` is the cce loss of a feature, ordered by the feature list self.categorical_fts
+        cce_loss_of_each_feat = []
+
+        for i, ft in enumerate(self.categorical_fts):
+            loss = self.cce(cat[i], codes[i])
+            # Convert to 2 dimensions
+            cce_loss_of_each_feat.append(loss.data.reshape(-1, 1))
+
+        if cce_loss_of_each_feat:
+            # merge the tensors into one (n_records * n_features) tensor
+            cce_loss = torch.cat(cce_loss_of_each_feat, dim=1)
+        else:
+            cce_loss = torch.empty((len(num_target), 0), device=self.device)
+
+        return mse_loss, bce_loss, cce_loss
+
     def scale_losses(self, mse, bce, cce):
 
         # Create outputs
@@ -1485,60 +1578,153 @@ class AutoEncoder(torch.nn.Module):
 
         return mse_scaled, bce_scaled, cce_scaled
 
-    def get_results(self, df, return_abs=False):
-        pdf = pd.DataFrame()
-        self.eval()
+    def _get_output_scaled_loss_str(self):
+        if self.loss_scaler_str == 'standard':
+            return 'z'
+        if self.loss_scaler_str == 'modified':
+            return 'modz'
 
-        data = self.prepare_df(df)
+        # in case other custom scaling is used
+        return f'{self.loss_scaler_str}_scaled'
 
-        with torch.no_grad():
-            num, bin, embeddings = self.encode_input(data)
-            x = torch.cat(num + bin + embeddings, dim=1)
-            num, bin, cat = self.model(x)
-            output_df = self.decode_outputs_to_df(num=num, bin=bin, cat=cat)
+    def _get_results_for_chunk(self, df, return_abs, loss_buffer, scaled_loss_buffer):
+        """Scores a single chunk of `df` with one forward pass, writing the losses into the preallocated buffers.
 
-        # set the index of the prediction df to match the input df
-        output_df.index = df.index
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The chunk to score, must not have more rows than the buffers.
+        return_abs : bool
+            Whether the absolute value of the scaled losses should be returned.
+        loss_buffer : torch.Tensor
+            Preallocated tensor of shape (>= len(df), feature count) to store the raw losses in.
+        scaled_loss_buffer : torch.Tensor
+            Preallocated tensor of shape (>= len(df), feature count) to store the scaled losses in.
 
-        mse, bce, cce = self.get_anomaly_score_losses(df)
-        mse_scaled, bce_scaled, cce_scaled = self.scale_losses(mse, bce, cce)
+        Returns
+        -------
+        pandas.DataFrame
+            The inference results for the chunk, in the same format as `get_results`.
+        """
+        row_count = len(df)
+        num_target, bin_target, codes = self.encode_df(df)
+        num, bin, embeddings = self._encode_targets(num_target, bin_target, codes)
+        num, bin, cat = self.model(torch.cat(num + bin + embeddings, dim=1))
 
-        if (return_abs):
-            mse_scaled = abs(mse_scaled)
-            bce_scaled = abs(bce_scaled)
-            cce_scaled = abs(cce_scaled)
+        output_df = self.decode_outputs_to_df(num=num, bin=bin, cat=cat)
 
-        combined_loss = torch.cat([mse_scaled, bce_scaled, cce_scaled], dim=1)
+        losses = loss_buffer[:row_count]
+        torch.cat(self._compute_row_losses(num, bin, cat, num_target, bin_target, codes), dim=1, out=losses)
 
-        for i, ft in enumerate(self.numeric_fts):
-            pdf[ft] = df[ft]
-            pdf[ft + '_pred'] = output_df[ft]
-            pdf[ft + '_loss'] = mse[:, i].cpu().numpy()
-            pdf[ft + '_z_loss'] = mse_scaled[:, i].cpu().numpy()
+        scaled_losses = scaled_loss_buffer[:row_count]
+        feature_names = self.num_names + list(self.binary_fts.keys()) + list(self.categorical_fts.keys())
+        for i, ft in enumerate(feature_names):
+            scaled_losses[:, i] = self.feature_loss_stats[ft]['scaler'].transform(losses[:, i])
 
-        for i, ft in enumerate(self.binary_fts):
-            pdf[ft] = df[ft]
-            pdf[ft + '_pred'] = output_df[ft]
-            pdf[ft + '_loss'] = bce[:, i].cpu().numpy()
-            pdf[ft + '_z_loss'] = bce_scaled[:, i].cpu().numpy()
+        if (return_abs):
+            scaled_losses.abs_()
 
-        for i, ft in enumerate(self.categorical_fts):
-            pdf[ft] = df[ft]
-            pdf[ft + '_pred'] = output_df[ft]
-            pdf[ft + '_loss'] = cce[:, i].cpu().numpy()
-            pdf[ft + '_z_loss'] = cce_scaled[:, i].cpu().numpy()
+        # Transfer the losses to host memory once rather than once per feature
+        losses_np = losses.cpu().numpy()
+        scaled_losses_np = scaled_losses.cpu().numpy()
+
+        # Building the frame from a dict copies the columns out of the reused buffers
+        columns = {}
+        for i, ft in enumerate(feature_names):
+            columns[ft] = df[ft].values
+            columns[ft + '_pred'] = output_df[ft].values
+            columns[ft + '_loss'] = losses_np[:, i]
+            columns[ft + '_z_loss'] = scaled_losses_np[:, i]
 
-        pdf['max_abs_z'] = combined_loss.max(dim=1)[0].cpu().numpy()
-        pdf['mean_abs_z'] = combined_loss.mean(dim=1).cpu().numpy()
+        columns['max_abs_z'] = scaled_losses.max(dim=1)[0].cpu().numpy()
+        columns['mean_abs_z'] = scaled_losses.mean(dim=1).cpu().numpy()
+
+        pdf = pd.DataFrame(columns, index=df.index)
 
         # add a column describing the scaler of the losses
-        if self.loss_scaler_str == 'standard':
-            output_scaled_loss_str = 'z'
-        elif self.loss_scaler_str == 'modified':
-            output_scaled_loss_str = 'modz'
-        else:
-            # in case other custom scaling is used
-            output_scaled_loss_str = f'{self.loss_scaler_str}_scaled'
-        pdf['z_loss_scaler_type'] = output_scaled_loss_str
+        pdf['z_loss_scaler_type'] = self._get_output_scaled_loss_str()
 
         return pdf
+
+    @staticmethod
+    def _iter_chunks(data, chunk_size):
+        """Re-chunks a dataframe or an iterable of dataframes into dataframes of exactly `chunk_size` rows, with the
+        exception of the last chunk which may be smaller."""
+        if isinstance(data, pd.DataFrame):
+            data = [data]
+
+        pending = []
+        pending_rows = 0
+        for df in data:
+            start = 0
+            while start < len(df):
+                df_slice = df.iloc[start:start + chunk_size - pending_rows]
+                start += len(df_slice)
+                pending.append(df_slice)
+                pending_rows += len(df_slice)
+
+                if pending_rows == chunk_size:
+                    yield pending[0] if len(pending) == 1 else pd.concat(pending)
+                    pending = []
+                    pending_rows = 0
+
+        if pending:
+            yield pending[0] if len(pending) == 1 else pd.concat(pending)
+
+    def iter_results(self, data, chunk_size=None, return_abs=False):
+        """Lazily scores a dataframe, or an iterable of dataframes, in fixed-size chunks.
+
+        Each chunk is scored with a single forward pass under `torch.inference_mode`, and the losses are written into
+        buffers which are allocated once and reused for every chunk. This keeps peak memory bounded by `chunk_size`
+        regardless of the size of the input.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or Iterable[pandas.DataFrame]
+            The data to score. Small dataframes from an iterable are combined into a single chunk.
+        chunk_size : int, optional
+            The number of rows to score at a time, by default `self.eval_batch_size`
+        return_abs : bool, optional
+            whether the absolute value of the loss scalers should be returned, by default False
+
+        Yields
+        ------
+        pandas.DataFrame
+            Inference results of each chunk, in the same format as `get_results`, indexed like the input.
+        """
+        if chunk_size is None:
+            chunk_size = self.eval_batch_size
+
+        if chunk_size < 1:
+            raise ValueError(f"`chunk_size` must be a positive integer, got: {chunk_size}")
+
+        self.eval()
+
+        loss_buffer = None
+        scaled_loss_buffer = None
+        for df in self._iter_chunks(data, chunk_size):
+            # Inference mode is only entered around each chunk, so it isn't left enabled in the caller's thread while
+            # the generator is suspended
+            with torch.inference_mode():
+                if loss_buffer is None:
+                    loss_buffer = torch.empty((chunk_size, self.get_feature_count()), device=self.device)
+                    scaled_loss_buffer = torch.empty_like(loss_buffer)
+
+                results = self._get_results_for_chunk(df, return_abs, loss_buffer, scaled_loss_buffer)
+
+            yield results
+
+    def get_results(self, df, return_abs=False):
+        chunk_size = max(min(len(df), self.eval_batch_size), 1)
+        chunks = list(self.iter_results(df, chunk_size=chunk_size, return_abs=return_abs))
+        if len(chunks) == 1:
+            return chunks[0]
+
+        if len(chunks) == 0:
+            # Run the empty frame through the model to produce the expected columns
+            self.eval()
+            with torch.inference_mode():
+                buffer = torch.empty((0, self.get_feature_count()), device=self.device)
+                return self._get_results_for_chunk(df, return_abs, buffer, buffer.clone())
+
+        return pd.concat(chunks)
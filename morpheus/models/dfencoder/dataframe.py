@@ -48,47 +48,120 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import typing
+
 import numpy as np
 import pandas as pd
 
+RandomStateType = typing.Union[None, int, np.random.Generator, np.random.RandomState]
+
+
+def _get_random_state(random_state: RandomStateType = None):
+    """Returns a random number generator for the given `random_state`.
+
+    `None` uses the global NumPy random state, keeping results reproducible with `np.random.seed`.
+    """
+    if random_state is None:
+        return np.random
+    if isinstance(random_state, (np.random.Generator, np.random.RandomState)):
+        return random_state
+    return np.random.default_rng(random_state)
+
+
+def gen_swap_indices(tot_rows: int, n_cols: int, likelihood: float, random_state: RandomStateType = None):
+    """Generates the row indices used for swap-noise corruption.
+
+    For each of the `n_cols` columns, `round(tot_rows * likelihood)` values are read from random source rows and
+    written into random destination rows. Column `j` of both returned arrays holds the indices for column `j`.
+
+    Parameters
+    ----------
+    tot_rows : int
+        Number of rows in the data being corrupted.
+    n_cols : int
+        Number of columns in the data being corrupted.
+    likelihood : float
+        The probability of a value being randomly replaced with a value from a different row.
+    random_state : None, int, numpy.random.Generator or numpy.random.RandomState, optional
+        Seed or generator used to draw the indices, by default the global NumPy random state is used.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        The source and destination row indices, each of shape (n_swapped_rows, n_cols).
+    """
+    n_rows = int(round(tot_rows * likelihood))
+    rng = _get_random_state(random_state)
+    randint = rng.integers if isinstance(rng, np.random.Generator) else rng.randint
+
+    src_rows = randint(0, tot_rows, size=(n_rows, n_cols))
+    dst_rows = randint(0, tot_rows, size=(n_rows, n_cols))
+
+    return src_rows, dst_rows
+
+
+def swap_array_columns(arr: np.ndarray, src_rows: np.ndarray, dst_rows: np.ndarray):
+    """Applies swap-noise to the columns of a 2-D array in-place.
+
+    Parameters
+    ----------
+    arr : numpy.ndarray
+        2-D array of shape (rows, cols) to corrupt.
+    src_rows : numpy.ndarray
+        Source row indices of shape (n_swapped_rows, cols), as returned by `gen_swap_indices`.
+    dst_rows : numpy.ndarray
+        Destination row indices of shape (n_swapped_rows, cols), as returned by `gen_swap_indices`.
+
+    Returns
+    -------
+    numpy.ndarray
+        `arr`, after the swapped values have been written.
+    """
+    if arr.shape[1] > 0:
+        columns = np.arange(arr.shape[1])
+        arr[dst_rows, columns] = arr[src_rows, columns]
+
+    return arr
+
 
 class EncoderDataFrame(pd.DataFrame):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def swap(self, likelihood=.15):
+    def swap(self, likelihood=.15, random_state: RandomStateType = None):
         """Performs random swapping of data.
 
+        Each column is corrupted independently using its own dtype, avoiding a round trip through an object array.
+
         Parameters
         ----------
         likelihood : float, optional
             The probability of a value being randomly replaced with a value from a different row. By default .15
+        random_state : None, int, numpy.random.Generator or numpy.random.RandomState, optional
+            Seed or generator used to select the swapped values, by default the global NumPy random state is used.
 
         Returns
         -------
         pandas.DataFrame
             A copy of the dataframe with equal size.
         """
-        #select values to swap
-        tot_rows = self.__len__()
-        n_rows = int(round(tot_rows * likelihood))
-        n_cols = len(self.columns)
-
-        def gen_indices():
-            column = np.repeat(np.arange(n_cols).reshape(1, -1), repeats=n_rows, axis=0)
-            row = np.random.randint(0, tot_rows, size=(n_rows, n_cols))
-            return row, column
+        src_rows, dst_rows = gen_swap_indices(len(self), len(self.columns), likelihood, random_state=random_state)
 
-        row, column = gen_indices()
-        new_mat = self.values
-        to_place = new_mat[row, column]
+        columns = {}
+        for (i, col_name) in enumerate(self.columns):
+            col = self.iloc[:, i]
+            src = src_rows[:, i]
+            dst = dst_rows[:, i]
 
-        row, column = gen_indices()
-        new_mat[row, column] = to_place
+            if isinstance(col.dtype, pd.api.extensions.ExtensionDtype):
+                # Extension arrays such as categoricals are swapped using their codes/storage rather than as objects
+                values = col.array.copy()
+                values[dst] = values.take(src)
+            else:
+                values = col.to_numpy(copy=True)
+                values[dst] = values[src]
 
-        dtypes = {col: typ for col, typ in zip(self.columns, self.dtypes)}
-        result = EncoderDataFrame(columns=self.columns, data=new_mat)
-        result = result.astype(dtypes, copy=False)
+            columns[col_name] = values
 
-        return result
+        return EncoderDataFrame(columns, index=self.index, columns=self.columns)
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 
 import numpy as np
@@ -21,6 +22,8 @@ from torch.utils.data import DataLoader
 from torch.utils.data import Dataset
 from torch.utils.data.distributed import DistributedSampler
 
+from .encoding import EncodedFeatures
+
 
 class DFEncoderDataLoader(DataLoader):
 
@@ -85,7 +88,8 @@ class DFEncoderDataLoader(DataLoader):
                                                       world_size,
                                                       load_data_fn=pd.read_csv,
                                                       pin_memory=False,
-                                                      num_workers=0):
+                                                      num_workers=0,
+                                                      cache_dir=None):
         """A helper funtion to get a distributed training DataLoader given a path to a folder containing data.
 
         Parameters
@@ -104,6 +108,8 @@ class DFEncoderDataLoader(DataLoader):
             Whether to pin memory when loading data, by default False.
         num_workers : int, optional
             The number of worker processes to use for loading data, by default 0.
+        cache_dir : str, optional
+            Directory used to cache the encoded data, see `FileSystemDataset`, by default None.
 
         Returns
         -------
@@ -115,6 +121,7 @@ class DFEncoderDataLoader(DataLoader):
             model.batch_size,
             model.preprocess_training_data,
             load_data_fn=load_data_fn,
+            cache_dir=cache_dir,
         )
         dataloader = DFEncoderDataLoader.get_distributed_training_dataloader_from_dataset(
             dataset=dataset,
@@ -163,8 +170,13 @@ class DFEncoderDataLoader(DataLoader):
 class FileSystemDataset(Dataset):
     """ A dataset class that reads data in batches from a folder and applies preprocessing to each batch.
     * This class assumes that the data is saved in small csv files in one folder.
+    * When `cache_dir` is set and an `encode_fn` is provided, each file is parsed and encoded only once, the encoded
+      arrays are saved as `.npy` shards in `cache_dir` and memory-mapped on subsequent reads. The deterministic
+      encoding is cached while the random parts of the preprocessing (row shuffling, swap noise) still run per batch.
     """
 
+    CACHE_INDEX_FILE = "index.json"
+
     def __init__(
         self,
         data_folder,
@@ -174,6 +186,7 @@ class FileSystemDataset(Dataset):
         shuffle_rows_in_batch=True,
         shuffle_batch_indices=False,
         preload_data_into_memory=False,
+        cache_dir=None,
     ):
         """Initialize a `DatasetFromPath` object.
 
@@ -196,25 +209,47 @@ class FileSystemDataset(Dataset):
         preload_data_into_memory : bool, optional
             Whether to preload all the data into memory, by default False.
             (Can speed up data loading if the data can fit into memory)
+        cache_dir : str, optional
+            Directory to cache the encoded data in, by default None (disabled). The cache is only used once an
+            `encode_fn` has been set, which `AutoEncoder` does automatically. The cache is keyed by file name, size,
+            modification time and `cache_key`, files cached with a different `cache_key` are encoded again.
         """
         self._data_folder = data_folder
         self._filenames = sorted(os.listdir(data_folder))
         self._preprocess_fn = preprocess_fn
         self._load_data_fn = load_data_fn
+        self._encode_fn = None
+        self._cache_key = None
+
+        self._cache_dir = cache_dir
+        self._cache_index = {}
+        if self._cache_dir is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            self._cache_index = self._load_cache_index()
 
         self._preloaded_data = None
         if preload_data_into_memory:
             self._preloaded_data = {fn: self._load_data_fn(f"{self._data_folder}/{fn}") for fn in self._filenames}
 
-        self._file_sizes = {
-            fn: self._get_file_len(fn) - 1 if not self._preloaded_data else len(self._preloaded_data[fn])
-            for fn in self._filenames
-        }
+        self._file_sizes = {fn: self._get_num_rows(fn) for fn in self._filenames}
         self._count = sum(v for v in self._file_sizes.values())
         self._batch_size = batch_size
         self._shuffle_rows_in_batch = shuffle_rows_in_batch
         self._shuffle_batch_indices = shuffle_batch_indices
 
+    def _get_num_rows(self, fn):
+        """Returns the number of rows in a file, using the cache index or the preloaded data when available."""
+        # The row count doesn't depend on the encoding
+        cache_entry = self._get_cache_entry(fn, check_key=False)
+        if cache_entry is not None:
+            return cache_entry["rows"]
+
+        if self._preloaded_data:
+            return len(self._preloaded_data[fn])
+
+        # `_get_file_len` already excludes the header line
+        return self._get_file_len(fn)
+
     def _get_file_len(self, fn, file_include_header_line=True):
         """Private method for getting the number of lines in a file.
 
@@ -286,6 +321,10 @@ class FileSystemDataset(Dataset):
         start = idx * self._batch_size
         end = (idx + 1) * self._batch_size
 
+        use_cache = self._cache_dir is not None and self._encode_fn is not None
+        get_data_fn = self._get_encoded_data_from_filename if use_cache else self._get_data_from_filename
+        concat_fn = EncodedFeatures.concat if use_cache else pd.concat
+
         data = []
         curr_cnt = 0
         for fn in self._filenames:
@@ -293,16 +332,23 @@ class FileSystemDataset(Dataset):
             curr_cnt = f_count
 
             if start < curr_cnt and end <= curr_cnt:
-                data.append(self._get_data_from_filename(fn)[start:end])
-                return self._preprocess(pd.concat(data), batch_index=idx)
+                data.append(self._slice(get_data_fn(fn), start, end))
+                return self._preprocess(concat_fn(data), batch_index=idx)
 
             if start < curr_cnt and end > curr_cnt:
-                data.append(self._get_data_from_filename(fn)[start:])
+                data.append(self._slice(get_data_fn(fn), start, None))
             start = max(0, start - curr_cnt)
             end = end - curr_cnt
 
         # clear out last batch
-        return self._preprocess(pd.concat(data), batch_index=idx)
+        return self._preprocess(concat_fn(data), batch_index=idx)
+
+    @staticmethod
+    def _slice(data, start, end):
+        if isinstance(data, EncodedFeatures):
+            return EncodedFeatures(data.num[start:end], data.bin[start:end], [code[start:end] for code in data.codes])
+
+        return data[start:end]
 
     def _get_data_from_filename(self, filename):
         """Returns the data from the given file as a pandas.DataFrame.
@@ -321,13 +367,93 @@ class FileSystemDataset(Dataset):
             return self._preloaded_data[filename]
         return self._load_data_fn(f"{self._data_folder}/{filename}")
 
+    def _get_file_stat(self, filename):
+        stat = os.stat(f"{self._data_folder}/{filename}")
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _get_cache_entry(self, filename, check_key=True):
+        """Returns the cache index entry for `filename` if it exists and the file has not changed since it was cached.
+        Unless `check_key` is False, entries encoded with a different `cache_key` are ignored.
+        """
+        entry = self._cache_index.get(filename)
+        if entry is None or {k: entry[k] for k in ("size", "mtime_ns")} != self._get_file_stat(filename):
+            return None
+
+        if check_key and entry.get("key") != self._cache_key:
+            return None
+
+        return entry
+
+    def _load_cache_index(self):
+        index_path = os.path.join(self._cache_dir, self.CACHE_INDEX_FILE)
+        if not os.path.exists(index_path):
+            return {}
+
+        with open(index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_cache_index(self):
+        # Other dataloader workers may be writing the index concurrently, merge with what is already on disk
+        index = self._load_cache_index()
+        index.update(self._cache_index)
+        self._cache_index = index
+
+        tmp_path = os.path.join(self._cache_dir, f"{self.CACHE_INDEX_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+        os.replace(tmp_path, os.path.join(self._cache_dir, self.CACHE_INDEX_FILE))
+
+    def _get_cache_shard_path(self, filename, name):
+        return os.path.join(self._cache_dir, f"{filename}.{name}.npy")
+
+    def _get_encoded_data_from_filename(self, filename):
+        """Returns the encoded data of the given file, memory-mapped from the cache. The file is loaded, encoded with
+        `encode_fn` and written to the cache if it is not already cached.
+
+        Parameters
+        ----------
+        filename : str
+            The filename of the file to load.
+
+        Returns
+        -------
+        EncodedFeatures
+            Read-only, memory-mapped, encoded data.
+        """
+        entry = self._get_cache_entry(filename)
+        if entry is None:
+            encoded = self._encode_fn(self._get_data_from_filename(filename))
+            # Store all of the categorical codes in a single (rows, n_categorical) shard
+            codes = np.stack(encoded.codes, axis=1) if encoded.codes else np.empty((encoded.num_rows, 0), dtype=np.int64)
+
+            for (name, arr) in (("num", encoded.num), ("bin", encoded.bin), ("codes", codes)):
+                tmp_path = self._get_cache_shard_path(filename, f"{name}.{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, arr)
+                os.replace(tmp_path, self._get_cache_shard_path(filename, name))
+
+            entry = {
+                "rows": encoded.num_rows,
+                "num_codes": codes.shape[1],
+                "key": self._cache_key,
+                **self._get_file_stat(filename)
+            }
+            self._cache_index[filename] = entry
+            self._save_cache_index()
+
+        num = np.load(self._get_cache_shard_path(filename, "num"), mmap_mode="r")
+        bin = np.load(self._get_cache_shard_path(filename, "bin"), mmap_mode="r")
+        codes = np.load(self._get_cache_shard_path(filename, "codes"), mmap_mode="r")
+        return EncodedFeatures(num, bin, [codes[:, i] for i in range(entry["num_codes"])])
+
     def _preprocess(self, df, batch_index):
         """Preprocesses the given dataframe and returns a dictionary containing the preprocessed data.
 
         Parameters
         ----------
-        df : pandas.DataFrame
-            The dataframe to preprocess.
+        df : pandas.DataFrame or EncodedFeatures
+            The dataframe, or already encoded data when the cache is enabled, to preprocess.
         batch_index : int
             The index of the current batch.
 
@@ -357,6 +483,25 @@ class FileSystemDataset(Dataset):
     def preprocess_fn(self, value):
         self._preprocess_fn = value
 
+    @property
+    def encode_fn(self):
+        """Function encoding a pandas.DataFrame into `EncodedFeatures`, required to use the on-disk cache."""
+        return self._encode_fn
+
+    @encode_fn.setter
+    def encode_fn(self, value):
+        self._encode_fn = value
+
+    @property
+    def cache_key(self):
+        """Identifies the encoding performed by `encode_fn`, such as `EncodingPlan.fingerprint`. Cached files encoded
+        with a different key are encoded again."""
+        return self._cache_key
+
+    @cache_key.setter
+    def cache_key(self, value):
+        self._cache_key = value
+
     @property
     def batch_size(self):
         return self._batch_size
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023-2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import pickle
+import typing
+
+import numpy as np
+import pandas as pd
+
+OTHER_CATEGORY = '_other'
+
+
+class EncodedFeatures(typing.NamedTuple):
+    """Encoded numerical, binary and categorical arrays for a set of rows, as returned by `EncodingPlan.encode`."""
+    num: np.ndarray
+    bin: np.ndarray
+    codes: typing.List[np.ndarray]
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.num)
+
+    def take(self, indices: np.ndarray) -> "EncodedFeatures":
+        """Returns a copy of the rows at `indices`."""
+        return EncodedFeatures(self.num[indices], self.bin[indices], [code[indices] for code in self.codes])
+
+    @staticmethod
+    def concat(encoded: typing.List["EncodedFeatures"]) -> "EncodedFeatures":
+        """Concatenates the rows of multiple `EncodedFeatures` into a new, writable, `EncodedFeatures`."""
+        num = np.concatenate([e.num for e in encoded])
+        bin = np.concatenate([e.bin for e in encoded])
+        codes = [np.concatenate(code_l) for code_l in zip(*(e.codes for e in encoded))]
+        return EncodedFeatures(num, bin, codes)
+
+
+class EncodingPlan(object):
+    """
+    Precompiled lookup tables used to encode a raw dataframe into the numerical, binary and categorical arrays consumed
+    by `AutoEncoder`.
+
+    The plan is built once from the feature metadata produced by `AutoEncoder._init_features`, avoiding the need to
+    rebuild a `pandas.Categorical` or apply a Python lambda per row every time a dataframe is encoded.
+
+    Parameters
+    ----------
+    numeric_fts : OrderedDict
+        Numerical feature metadata, each entry containing the `mean` used to fill nulls and a fitted `scaler`.
+    binary_fts : OrderedDict
+        Binary feature metadata, each entry mapping raw values to booleans.
+    categorical_fts : OrderedDict
+        Categorical feature metadata, each entry containing the list of known `cats`.
+    """
+
+    def __init__(self, numeric_fts: dict, binary_fts: dict, categorical_fts: dict):
+        self.num_names = list(numeric_fts.keys())
+        self.bin_names = list(binary_fts.keys())
+        self.cat_names = list(categorical_fts.keys())
+
+        self._num_params = [(feature['mean'], feature['scaler']) for feature in numeric_fts.values()]
+
+        self._bin_maps = []
+        for feature in binary_fts.values():
+            mapping = {k: bool(v) for (k, v) in feature.items() if k != 'cats'}
+            is_identity = (mapping == {True: True, False: False})
+            self._bin_maps.append((mapping, is_identity))
+
+        # Hash based lookup of category -> code, unknown values are mapped to the trailing `_other` code
+        self._cat_indexes = []
+        self._cat_categories = []
+        for feature in categorical_fts.values():
+            categories = pd.Index(list(feature['cats']) + [OTHER_CATEGORY])
+            self._cat_indexes.append(categories[:-1])
+            self._cat_categories.append(categories)
+
+    def encode_numeric(self, df: pd.DataFrame) -> np.ndarray:
+        """Fills nulls and scales the numerical features of `df`, returning an array of shape (rows, n_numeric)."""
+        num = np.empty((len(df), len(self.num_names)), dtype=np.float64)
+        for (i, (ft, (mean, scaler))) in enumerate(zip(self.num_names, self._num_params)):
+            col = df[ft].fillna(mean)
+            num[:, i] = scaler.transform(col.values)
+
+        return num
+
+    def encode_binary(self, df: pd.DataFrame) -> np.ndarray:
+        """Maps the binary features of `df` to booleans, returning an array of shape (rows, n_binary)."""
+        bin = np.empty((len(df), len(self.bin_names)), dtype=bool)
+        for (i, (ft, (mapping, is_identity))) in enumerate(zip(self.bin_names, self._bin_maps)):
+            col = df[ft]
+            if is_identity and col.dtype == bool:
+                bin[:, i] = col.to_numpy()
+            else:
+                # Values not in the mapping (including nulls) are treated as False
+                bin[:, i] = col.map(mapping).fillna(False).to_numpy(dtype=bool)
+
+        return bin
+
+    def encode_categorical(self, df: pd.DataFrame) -> typing.List[np.ndarray]:
+        """Returns a list of int64 code arrays, one for each categorical feature of `df`."""
+        codes = []
+        for (ft, index) in zip(self.cat_names, self._cat_indexes):
+            code = index.get_indexer(df[ft]).astype(np.int64, copy=False)
+
+            # Unknown values and nulls get the `_other` code
+            code[code < 0] = len(index)
+            codes.append(code)
+
+        return codes
+
+    def encode(self, df: pd.DataFrame) -> EncodedFeatures:
+        """Encodes a raw dataframe into float32 numerical and binary arrays and a list of int64 categorical codes.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Raw input dataframe containing all of the model's features.
+
+        Returns
+        -------
+        EncodedFeatures
+            The numerical array of shape (rows, n_numeric), the binary array of shape (rows, n_binary) and a list of
+            categorical code arrays of shape (rows,).
+        """
+        num = self.encode_numeric(df).astype(np.float32)
+        bin = self.encode_binary(df).astype(np.float32)
+        codes = self.encode_categorical(df)
+        return EncodedFeatures(num, bin, codes)
+
+    def categories(self, i: int) -> pd.Index:
+        """Returns the categories, including the trailing `_other` category, of the `i`th categorical feature."""
+        return self._cat_categories[i]
+
+    def fingerprint(self) -> str:
+        """Returns a digest of the features, scaler parameters, binary mappings and categories of the plan. Plans with
+        the same fingerprint encode dataframes identically."""
+        num_params = [(mean, type(scaler).__name__, vars(scaler)) for (mean, scaler) in self._num_params]
+        bin_maps = [mapping for (mapping, _) in self._bin_maps]
+        categories = [list(index) for index in self._cat_indexes]
+
+        state = (self.num_names, self.bin_names, self.cat_names, num_params, bin_maps, categories)
+        return hashlib.sha256(pickle.dumps(state)).hexdigest()
@@ -0,0 +1,245 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+
+import pandas as pd
+import torch
+
+from morpheus.utils.seed import manual_seed
+
+from .autoencoder import AutoEncoder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AETrainingResult:
+    """
+    Result of training the `AutoEncoder` of a single user in an `AETrainingExecutor` worker.
+    """
+    user_id: str
+    model_bytes: bytes
+    train_scores_mean: float = None
+    train_scores_std: float = None
+    train_time_sec: float = 0.0
+
+    def load_model(self) -> AutoEncoder:
+        """
+        Deserialize the trained model.
+        """
+        return pickle.loads(self.model_bytes)
+
+
+def _init_worker(threads_per_worker: int):
+    # Without this every worker starts one thread per core, oversubscribing the machine
+    torch.set_num_threads(threads_per_worker)
+
+
+def train_ae_model(user_id: str,
+                   train_df: pd.DataFrame,
+                   model_kwargs: dict,
+                   fit_kwargs: dict = None,
+                   seed: int = None,
+                   compute_scores: bool = True) -> AETrainingResult:
+    """
+    Train an `AutoEncoder` on `train_df`, returning the serialized model and the statistics of its anomaly scores on the
+    training data.
+
+    Parameters
+    ----------
+    user_id : str
+        User the model is trained for.
+    train_df : pd.DataFrame
+        Training data.
+    model_kwargs : dict
+        Keyword arguments to pass to the `AutoEncoder` constructor.
+    fit_kwargs : dict, optional
+        Keyword arguments to pass to `AutoEncoder.fit`.
+    seed : int, optional
+        When not None, the random number generators are seeded with `seed` before the model is built.
+    compute_scores : bool, optional
+        Whether to compute the mean and standard deviation of the anomaly scores of `train_df`.
+
+    Returns
+    -------
+    AETrainingResult
+        The trained model and score statistics.
+    """
+    start_time = time.perf_counter()
+
+    if (seed is not None):
+        manual_seed(seed)
+
+    model = AutoEncoder(**model_kwargs)
+
+    logger.debug("Training AE model for user: '%s'...", user_id)
+    model.fit(train_df, **(fit_kwargs or {}))
+
+    scores_mean = None
+    scores_std = None
+    if (compute_scores):
+        train_loss_scores = model.get_anomaly_score(train_df)
+        scores_mean = train_loss_scores.mean()
+        scores_std = train_loss_scores.std()
+
+    logger.debug("Training AE model for user: '%s'... Complete.", user_id)
+
+    return AETrainingResult(user_id=user_id,
+                            model_bytes=pickle.dumps(model),
+                            train_scores_mean=scores_mean,
+                            train_scores_std=scores_std,
+                            train_time_sec=time.perf_counter() - start_time)
+
+
+class AETrainingExecutor:
+    """
+    Trains independent `AutoEncoder` models concurrently in a pool of worker processes. Each worker limits PyTorch to
+    `threads_per_worker` threads so the workers don't compete for the same cores. Trained models are returned pickled
+    along with the statistics of their training anomaly scores.
+
+    At most `max_pending` jobs are queued or running at once, `submit` blocks until a slot is free, applying
+    back-pressure to the caller when every worker is busy.
+
+    Parameters
+    ----------
+    num_workers : int
+        Number of worker processes.
+    threads_per_worker : int, optional
+        Number of threads used by PyTorch in each worker, by default the number of CPUs divided by `num_workers`.
+    max_pending : int, optional
+        Maximum number of jobs queued or running, by default `num_workers`.
+    start_method : str, optional
+        Multiprocessing start method used to create the workers. The default of "spawn" is required when the models
+        are trained on a GPU.
+    """
+
+    def __init__(self,
+                 num_workers: int,
+                 threads_per_worker: int = None,
+                 max_pending: int = None,
+                 start_method: str = "spawn"):
+        if (num_workers < 1):
+            raise ValueError(f"num_workers={num_workers} must be at least 1")
+
+        if (threads_per_worker is None):
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self._num_workers = num_workers
+        self._threads_per_worker = threads_per_worker
+        self._max_pending = max_pending if max_pending is not None else num_workers
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+
+        self._pool = ProcessPoolExecutor(max_workers=num_workers,
+                                         mp_context=multiprocessing.get_context(start_method),
+                                         initializer=_init_worker,
+                                         initargs=(threads_per_worker, ))
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def threads_per_worker(self) -> int:
+        return self._threads_per_worker
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending
+
+    def __enter__(self) -> "AETrainingExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_futures=exc_type is not None)
+
+    def submit(self,
+               user_id: str,
+               train_df: pd.DataFrame,
+               model_kwargs: dict,
+               fit_kwargs: dict = None,
+               seed: int = None,
+               compute_scores: bool = True) -> "Future[AETrainingResult]":
+        """
+        Submit a model to be trained by `train_ae_model`, blocking while `max_pending` jobs are queued or running.
+        """
+        self._slots.acquire()
+
+        try:
+            future = self._pool.submit(train_ae_model,
+                                       user_id,
+                                       train_df,
+                                       model_kwargs,
+                                       fit_kwargs=fit_kwargs,
+                                       seed=seed,
+                                       compute_scores=compute_scores)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return future
+
+    def map(self,
+            jobs: typing.Iterable[tuple[str, pd.DataFrame]],
+            model_kwargs: dict,
+            fit_kwargs: dict = None,
+            seed: int = None,
+            compute_scores: bool = True) -> typing.Iterator[AETrainingResult]:
+        """
+        Train a model for each `(user_id, train_df)` pair in `jobs`, yielding the results as they complete. Jobs are
+        consumed lazily, so at most `max_pending` training dataframes are held by the executor at once.
+        """
+        pending: set[Future] = set()
+
+        try:
+            for (user_id, train_df) in jobs:
+                while (len(pending) >= self._max_pending):
+                    (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+                pending.add(
+                    self.submit(user_id,
+                                train_df,
+                                model_kwargs,
+                                fit_kwargs=fit_kwargs,
+                                seed=seed,
+                                compute_scores=compute_scores))
+
+            while (len(pending) > 0):
+                (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):  # pylint: disable=redefined-outer-name
+        """
+        Stop the worker processes, once the running jobs have completed when `wait` is True.
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -43,6 +43,7 @@ def file_to_df(builder: mrc.Builder):
     -----
     Configurable parameters:
         - cache_dir (str): Directory to cache the rolling window data.
+        - cache_max_bytes (int): Maximum size in bytes of the file cache, unbounded when not set.
         - file_type (str): Type of the input file.
         - filter_null (bool): Whether to filter out null values.
         - parser_kwargs (dict): Keyword arguments to pass to the parser.
@@ -65,6 +66,7 @@ def file_to_df(builder: mrc.Builder):
     filter_null = config.get("filter_null", False)
     parser_kwargs = config.get("parser_kwargs", None)
     cache_dir = config.get("cache_dir", None)
+    cache_max_bytes = config.get("cache_max_bytes", None)
 
     if (cache_dir is None):
         cache_dir = "./.cache"
@@ -83,7 +85,8 @@ def file_to_df(builder: mrc.Builder):
                                     file_type=file_type,
                                     parser_kwargs=parser_kwargs,
                                     cache_dir=cache_dir,
-                                    timestamp_column_name=timestamp_column_name)
+                                    timestamp_column_name=timestamp_column_name,
+                                    cache_max_bytes=cache_max_bytes)
 
     node = builder.make_node(FILE_TO_DF, ops.map(controller.convert_to_dataframe), ops.on_completed(controller.close))
 
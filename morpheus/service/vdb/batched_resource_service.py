@@ -0,0 +1,325 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import copy
+import hashlib
+import logging
+import threading
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from morpheus.service.vdb.vector_db_service import VectorDBResourceService
+from morpheus.utils.type_aliases import DataFrameType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SimilaritySearchMetrics:
+    """
+    Counters for the searches performed by a `BatchedVectorDBResourceService`.
+    """
+    num_requested: int = 0
+    num_cache_hits: int = 0
+    num_coalesced: int = 0
+    num_searched: int = 0
+    num_batches: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        if (self.num_batches == 0):
+            return 0.0
+
+        return self.num_searched / self.num_batches
+
+
+class _PendingBatch:
+
+    def __init__(self, k: int, kwargs: dict[str, typing.Any]):
+        self.k = k
+        self.kwargs = kwargs
+        self.keys: list[str] = []
+        self.embeddings: list[list[float]] = []
+        self.futures: list[asyncio.Future] = []
+        self.handle: asyncio.TimerHandle = None
+
+    def __len__(self):
+        return len(self.embeddings)
+
+
+class BatchedVectorDBResourceService(VectorDBResourceService):
+    """
+    Wraps a `VectorDBResourceService`, coalescing concurrent calls to `similarity_search` into a single batched search
+    and caching the results of each embedding. All other methods are forwarded to the wrapped service.
+
+    Searches requested within `batch_window_ms` of each other, with the same `k` and keyword arguments, are combined
+    into one call to the wrapped service, up to `max_batch_size` embeddings. Identical embeddings which are already
+    pending are only searched once. Writes made through this wrapper clear the cache, writes made directly to the
+    database are only reflected once the cached results expire.
+
+    Parameters
+    ----------
+    service : VectorDBResourceService
+        The resource service to perform searches with.
+    batch_window_ms : float, optional
+        Time to wait for additional searches before searching, when 0 only searches requested in the same iteration of
+        the event loop are combined.
+    max_batch_size : int, optional
+        Maximum number of embeddings searched in a single call.
+    cache_ttl_sec : float, optional
+        Time for which the results of an embedding are cached, when 0 results are not cached.
+    cache_max_entries : int, optional
+        Maximum number of cached embeddings, the least recently used entries are evicted first.
+    """
+
+    def __init__(self,
+                 service: VectorDBResourceService,
+                 batch_window_ms: float = 0.0,
+                 max_batch_size: int = 256,
+                 cache_ttl_sec: float = 0.0,
+                 cache_max_entries: int = 4096):
+        super().__init__()
+
+        self._service = service
+        self._batch_window_sec = batch_window_ms / 1000.0
+        self._max_batch_size = max_batch_size
+        self._cache_ttl_sec = cache_ttl_sec
+        self._cache_max_entries = cache_max_entries
+
+        self._cache: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Pending batches and futures are specific to the event loop they were created on
+        self._pending: dict[tuple, _PendingBatch] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        self._metrics = SimilaritySearchMetrics()
+
+    @property
+    def service(self) -> VectorDBResourceService:
+        return self._service
+
+    @property
+    def metrics(self) -> SimilaritySearchMetrics:
+        return self._metrics
+
+    @staticmethod
+    def _make_kwargs_key(k: int, kwargs: dict[str, typing.Any]) -> str:
+        return repr((k, sorted(kwargs.items())))
+
+    @staticmethod
+    def _make_key(embedding: list[float], kwargs_key: str) -> str:
+        digest = hashlib.sha1(np.asarray(embedding, dtype=np.float32).tobytes())
+        digest.update(kwargs_key.encode())
+
+        return digest.hexdigest()
+
+    def _cache_get(self, key: str) -> list[dict] | None:
+        if (self._cache_ttl_sec <= 0):
+            return None
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if (entry is None):
+                return None
+
+            expiration, result = entry
+            if (expiration < time.monotonic()):
+                del self._cache[key]
+                return None
+
+            self._cache.move_to_end(key)
+
+            return result
+
+    def _cache_put(self, key: str, result: list[dict]):
+        if (self._cache_ttl_sec <= 0):
+            return
+
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self._cache_ttl_sec, result)
+            self._cache.move_to_end(key)
+
+            while (len(self._cache) > self._cache_max_entries):
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """
+        Remove all cached search results.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _enqueue(self,
+                 loop: asyncio.AbstractEventLoop,
+                 key: str,
+                 embedding: list[float],
+                 k: int,
+                 kwargs: dict[str, typing.Any],
+                 kwargs_key: str) -> asyncio.Future:
+        batch_key = (loop, kwargs_key)
+
+        batch = self._pending.get(batch_key)
+        if (batch is None):
+            batch = _PendingBatch(k, kwargs)
+            batch.handle = loop.call_later(self._batch_window_sec, self._dispatch, loop, batch_key)
+            self._pending[batch_key] = batch
+
+        future = loop.create_future()
+
+        batch.keys.append(key)
+        batch.embeddings.append(embedding)
+        batch.futures.append(future)
+        self._inflight[(loop, key)] = future
+
+        if (len(batch) >= self._max_batch_size):
+            batch.handle.cancel()
+            self._dispatch(loop, batch_key)
+
+        return future
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, batch_key: tuple):
+        batch = self._pending.pop(batch_key, None)
+        if (batch is None):
+            return
+
+        task = loop.create_task(self._search_batch(loop, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _search_batch(self, loop: asyncio.AbstractEventLoop, batch: _PendingBatch):
+        self._metrics.num_batches += 1
+        self._metrics.num_searched += len(batch)
+
+        try:
+            results = await self._service.similarity_search(embeddings=batch.embeddings, k=batch.k, **batch.kwargs)
+
+            if (len(results) != len(batch)):
+                raise RuntimeError(f"Expected {len(batch)} search results, but the service returned {len(results)}")
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Batched similarity search of %d embeddings failed: %s", len(batch), exc)
+            for future in batch.futures:
+                if (not future.done()):
+                    future.set_exception(exc)
+        else:
+            for (key, future, result) in zip(batch.keys, batch.futures, results):
+                self._cache_put(key, result)
+                if (not future.done()):
+                    future.set_result(result)
+        finally:
+            for key in batch.keys:
+                self._inflight.pop((loop, key), None)
+
+    async def similarity_search(self,
+                                embeddings: list[list[float]],
+                                k: int = 4,
+                                **kwargs: dict[str, typing.Any]) -> list[list[dict]]:
+        """
+        Perform a similarity search, combining it with other concurrent searches and using cached results where
+        available.
+
+        Parameters
+        ----------
+        embeddings : list[list[float]]
+            Embeddings for which to perform the similarity search.
+        k : int, optional
+            The number of nearest neighbors to return, by default 4.
+        **kwargs : dict[str, typing.Any]
+            Extra keyword arguments passed to the wrapped service.
+
+        Returns
+        -------
+        list[list[dict]]
+            Returns a list of results for each embedding.
+        """
+        loop = asyncio.get_running_loop()
+
+        if isinstance(embeddings, np.ndarray):
+            embeddings = embeddings.tolist()
+
+        kwargs_key = self._make_kwargs_key(k, kwargs)
+
+        results: list[list[dict]] = [None] * len(embeddings)
+        waiting: list[tuple[int, asyncio.Future]] = []
+
+        for (i, embedding) in enumerate(embeddings):
+            key = self._make_key(embedding, kwargs_key)
+
+            cached = self._cache_get(key)
+            if (cached is not None):
+                self._metrics.num_cache_hits += 1
+                results[i] = cached
+                continue
+
+            future = self._inflight.get((loop, key))
+            if (future is not None):
+                self._metrics.num_coalesced += 1
+            else:
+                future = self._enqueue(loop, key, embedding, k, kwargs, kwargs_key)
+
+            waiting.append((i, future))
+
+        self._metrics.num_requested += len(embeddings)
+
+        for (i, future) in waiting:
+            # Shield the future since it may be shared with other callers
+            results[i] = await asyncio.shield(future)
+
+        # Return deep copies, the hits are shared with the cache and with any coalesced callers
+        return copy.deepcopy(results)
+
+    def insert(self, data: list[list] | list[dict], **kwargs: dict[str, typing.Any]) -> dict:
+        result = self._service.insert(data, **kwargs)
+        self.clear_cache()
+
+        return result
+
+    def insert_dataframe(self, df: DataFrameType, **kwargs: dict[str, typing.Any]) -> dict:
+        result = self._service.insert_dataframe(df, **kwargs)
+        self.clear_cache()
+
+        return result
+
+    def describe(self, **kwargs: dict[str, typing.Any]) -> dict:
+        return self._service.describe(**kwargs)
+
+    def update(self, data: list[typing.Any], **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        result = self._service.update(data, **kwargs)
+        self.clear_cache()
+
+        return result
+
+    def delete(self, expr: str, **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        result = self._service.delete(expr, **kwargs)
+        self.clear_cache()
+
+        return result
+
+    def retrieve_by_keys(self, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> list[typing.Any]:
+        return self._service.retrieve_by_keys(keys, **kwargs)
+
+    def delete_by_keys(self, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> typing.Any:
+        result = self._service.delete_by_keys(keys, **kwargs)
+        self.clear_cache()
+
+        return result
+
+    def count(self, **kwargs: dict[str, typing.Any]) -> int:
+        return self._service.count(**kwargs)
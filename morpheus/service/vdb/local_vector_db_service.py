@@ -0,0 +1,1252 @@
+# Copyright (c) 2024, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import logging
+import os
+import shutil
+import threading
+import typing
+
+import numpy as np
+import pandas as pd
+
+import cudf
+
+from morpheus.service.vdb.vector_db_service import VectorDBResourceService
+from morpheus.service.vdb.vector_db_service import VectorDBService
+from morpheus.utils.type_aliases import DataFrameType
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_METRICS = ("L2", "IP", "COSINE")
+SUPPORTED_INDEX_TYPES = ("FLAT", "IVF_FLAT")
+
+
+def _is_vector_field(field_conf: dict) -> bool:
+    dtype = field_conf.get("dtype", field_conf.get("type"))
+
+    # Accept pymilvus DataType values as well as their names
+    dtype_name = getattr(dtype, "name", dtype)
+    if isinstance(dtype_name, int):
+        return dtype_name == 101
+
+    return str(dtype_name).upper() in ("FLOAT_VECTOR", "DATATYPE.FLOAT_VECTOR")
+
+
+def _get_field_dim(field_conf: dict) -> int | None:
+    dim = field_conf.get("dim", field_conf.get("params", {}).get("dim"))
+
+    return int(dim) if dim is not None else None
+
+
+class IVFIndex:
+    """
+    Inverted file index, rows are assigned to the nearest of `nlist` centroids trained with k-means, searches only
+    consider the rows assigned to the `nprobe` centroids nearest to the query.
+
+    Parameters
+    ----------
+    nlist : int
+        Number of centroids.
+    nprobe : int
+        Number of centroids searched for each query.
+    metric : str
+        Metric used to assign rows to centroids, one of `SUPPORTED_METRICS`.
+    """
+
+    def __init__(self, nlist: int, nprobe: int, metric: str):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.metric = metric
+
+        self.centroids: np.ndarray = None
+        self.num_trained_rows = 0
+        self._assignments = np.empty(0, dtype=np.int32)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray, num_iterations: int = 10, seed: int = 42):
+        rng = np.random.default_rng(seed)
+
+        nlist = min(self.nlist, len(vectors))
+
+        # Train on a sample, the assignment of every row is computed afterwards
+        sample = vectors
+        if (len(vectors) > nlist * 256):
+            sample = vectors[rng.choice(len(vectors), nlist * 256, replace=False)]
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(num_iterations):
+            labels = self._nearest_centroids(sample, centroids, 1)[:, 0]
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            # Keep the previous centroid for any empty cluster
+            non_empty = counts > 0
+            centroids[non_empty] = sums[non_empty] / counts[non_empty, np.newaxis]
+
+        self.centroids = centroids.astype(np.float32)
+        self.num_trained_rows = len(vectors)
+        self._assignments = self.assign(vectors)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return self._nearest_centroids(vectors, self.centroids, 1)[:, 0].astype(np.int32)
+
+    def add(self, vectors: np.ndarray):
+        self._assignments = np.concatenate((self._assignments, self.assign(vectors)))
+
+    def compact(self, keep: np.ndarray):
+        self._assignments = self._assignments[keep]
+
+    def candidate_rows(self, query: np.ndarray) -> np.ndarray:
+        probes = self._nearest_centroids(query[np.newaxis, :], self.centroids, self.nprobe)[0]
+
+        return np.flatnonzero(np.isin(self._assignments, probes))
+
+    def _nearest_centroids(self, vectors: np.ndarray, centroids: np.ndarray, count: int) -> np.ndarray:
+        if (self.metric == "L2"):
+            scores = (centroids * centroids).sum(axis=1)[np.newaxis, :] - 2 * (vectors @ centroids.T)
+        else:
+            scores = -(vectors @ centroids.T)
+
+        count = min(count, len(centroids))
+        nearest = np.argpartition(scores, count - 1, axis=1)[:, :count]
+
+        return nearest
+
+
+class LocalVectorDBResourceService(VectorDBResourceService):
+    """
+    In-process vector database resource (collection). Vectors are stored in a contiguous float32 NumPy matrix and
+    searched by brute force in blocks of rows, or using an IVF index when the collection was created with an
+    `index_type` of `IVF_FLAT`. The remaining fields are stored in a pandas DataFrame.
+
+    Filter expressions accepted by `query` and `delete` are evaluated with `pandas.DataFrame.query`, which supports
+    the common subset of the Milvus expression syntax, such as `id in [1, 2]` or `age > 10 and name == "a"`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the resource.
+    schema_fields : list[dict]
+        Field configurations of the resource, exactly one field must be a `FLOAT_VECTOR` with a `dim` parameter and
+        at most one field can be the primary key.
+    index_conf : dict, optional
+        Index configuration, supports `metric_type` (L2, IP or COSINE), `index_type` (FLAT or IVF_FLAT) and
+        `params` with `nlist` and `nprobe` for IVF_FLAT.
+    auto_id : bool, optional
+        When True, primary keys are generated on insert.
+    search_block_size : int, optional
+        Number of rows scored at a time by the brute force search.
+    """
+
+    def __init__(self,
+                 name: str,
+                 schema_fields: list[dict],
+                 index_conf: dict = None,
+                 auto_id: bool = False,
+                 search_block_size: int = 65536) -> None:
+        super().__init__()
+
+        self._name = name
+        self._schema_fields = copy.deepcopy(schema_fields)
+        self._index_conf = copy.deepcopy(index_conf or {})
+        self._search_block_size = search_block_size
+
+        self._lock = threading.RLock()
+
+        vector_fields = [field for field in self._schema_fields if _is_vector_field(field)]
+        if (len(vector_fields) != 1):
+            raise ValueError(f"Collection '{name}' requires exactly one FLOAT_VECTOR field, "
+                             f"found {len(vector_fields)}")
+
+        self._vector_field = vector_fields[0]["name"]
+        self._dim = _get_field_dim(vector_fields[0])
+        if (self._dim is None):
+            raise ValueError(f"FLOAT_VECTOR field '{self._vector_field}' requires a 'dim' parameter")
+
+        primary_fields = [field for field in self._schema_fields if field.get("is_primary", False)]
+        if (len(primary_fields) > 1):
+            raise ValueError(f"Collection '{name}' has more than one primary key field")
+
+        self._pk_field = primary_fields[0]["name"] if primary_fields else None
+        self._auto_id = auto_id or any(field.get("auto_id", False) for field in primary_fields)
+
+        if (self._pk_field is None):
+            # Always provide a primary key
+            self._pk_field = "pk"
+            self._auto_id = True
+            self._schema_fields.insert(0, {"name": "pk", "dtype": "INT64", "is_primary": True, "auto_id": True})
+
+        self._metric = self._index_conf.get("metric_type", "L2").upper()
+        if (self._metric not in SUPPORTED_METRICS):
+            raise ValueError(f"Unsupported metric_type '{self._metric}', supported: {SUPPORTED_METRICS}")
+
+        self._index_type = self._index_conf.get("index_type", "FLAT").upper()
+        if (self._index_type not in SUPPORTED_INDEX_TYPES):
+            logger.warning("Unsupported index_type '%s' for collection '%s', using a FLAT index",
+                           self._index_type,
+                           name)
+            self._index_type = "FLAT"
+
+        self._ivf_index: IVFIndex = None
+        if (self._index_type == "IVF_FLAT"):
+            index_params = self._index_conf.get("params", {})
+            self._ivf_index = IVFIndex(nlist=int(index_params.get("nlist", 128)),
+                                       nprobe=int(index_params.get("nprobe", 8)),
+                                       metric=self._metric)
+
+        # Vector storage, rows [0, self._size) of self._vectors are in use
+        self._vectors = np.empty((0, self._dim), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._num_deleted = 0
+
+        # Metadata of each row, indexed by row number
+        self._metadata = pd.DataFrame(columns=self.metadata_fields)
+        self._pending_metadata: list[pd.DataFrame] = []
+
+        self._key_rows: dict[typing.Any, int] = {}
+        self._next_id = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def metadata_fields(self) -> list[str]:
+        """
+        Names of all of the fields other than the vector field.
+        """
+        return [field["name"] for field in self._schema_fields if field["name"] != self._vector_field]
+
+    def _get_metadata(self) -> pd.DataFrame:
+        if (len(self._pending_metadata) > 0):
+            self._metadata = pd.concat([self._metadata] + self._pending_metadata, ignore_index=True)
+            self._pending_metadata = []
+
+        return self._metadata
+
+    def _reserve(self, num_rows: int):
+        capacity = len(self._vectors)
+        required = self._size + num_rows
+
+        if (required <= capacity and self._vectors.flags.writeable):
+            return
+
+        # Grow geometrically, this also copies memory mapped vectors into memory
+        new_capacity = max(required, capacity * 2, 1024)
+
+        vectors = np.empty((new_capacity, self._dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+
+        norms = np.empty(new_capacity, dtype=np.float32)
+        norms[:self._size] = self._norms[:self._size]
+        self._norms = norms
+
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+
+    def _compute_norms(self, vectors: np.ndarray) -> np.ndarray:
+        squared_norms = np.einsum("ij,ij->i", vectors, vectors)
+
+        if (self._metric == "COSINE"):
+            return np.sqrt(squared_norms)
+
+        return squared_norms
+
+    def _to_vectors(self, values: typing.Any) -> np.ndarray:
+        if isinstance(values, (pd.Series, cudf.Series)):
+            values = values.to_arrow().to_pylist() if isinstance(values, cudf.Series) else values.tolist()
+
+        vectors = np.asarray(values, dtype=np.float32)
+
+        if (vectors.ndim == 1):
+            vectors = vectors.reshape(1, -1)
+
+        if (vectors.ndim != 2 or vectors.shape[1] != self._dim):
+            raise ValueError(f"Expected vectors with dimension {self._dim} for field '{self._vector_field}', "
+                             f"got shape {vectors.shape}")
+
+        return np.ascontiguousarray(vectors)
+
+    def _insert_rows(self, df: pd.DataFrame) -> dict:
+        vectors = self._to_vectors(df[self._vector_field])
+        num_rows = len(vectors)
+
+        if (self._auto_id):
+            keys = list(range(self._next_id, self._next_id + num_rows))
+            self._next_id += num_rows
+        else:
+            keys = df[self._pk_field].tolist()
+
+        metadata_columns = [name for name in self.metadata_fields if name != self._pk_field]
+        metadata = df[metadata_columns].copy() if metadata_columns else pd.DataFrame(index=df.index)
+        metadata.insert(0, self._pk_field, keys)
+        metadata = metadata[self.metadata_fields].reset_index(drop=True)
+
+        with self._lock:
+            # Inserting an existing key replaces the previous row
+            self._delete_keys(keys)
+
+            self._reserve(num_rows)
+
+            start = self._size
+            self._vectors[start:start + num_rows] = vectors
+            self._norms[start:start + num_rows] = self._compute_norms(vectors)
+            self._alive[start:start + num_rows] = True
+            self._size += num_rows
+
+            self._key_rows.update(zip(keys, range(start, start + num_rows)))
+            self._pending_metadata.append(metadata)
+
+            if (self._ivf_index is not None and self._ivf_index.is_trained):
+                self._ivf_index.add(vectors)
+
+        return {
+            "primary_keys": keys,
+            "insert_count": num_rows,
+            "delete_count": 0,
+            "upsert_count": 0,
+            "succ_count": num_rows,
+            "err_count": 0,
+        }
+
+    def insert(self, data: list[list] | list[dict], **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Insert data into the collection.
+
+        Parameters
+        ----------
+        data : list[list] | list[dict]
+            Data to be inserted, either a list of rows as dictionaries or a list of columns in the order of the schema
+            fields (excluding an auto generated primary key).
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns response content as a dictionary.
+        """
+        if (len(data) > 0 and isinstance(data[0], dict)):
+            df = pd.DataFrame(data)
+        else:
+            field_names = [
+                field["name"] for field in self._schema_fields
+                if not (self._auto_id and field["name"] == self._pk_field)
+            ]
+            df = pd.DataFrame(dict(zip(field_names, data)))
+
+        return self._insert_rows(df)
+
+    def insert_dataframe(self, df: DataFrameType, **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Insert a dataframe into the collection.
+
+        Parameters
+        ----------
+        df : DataFrameType
+            Dataframe to be inserted, must contain the vector field and all of the non auto generated schema fields.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns response content as a dictionary.
+        """
+        if isinstance(df, cudf.DataFrame):
+            df = df.to_pandas()
+
+        return self._insert_rows(df)
+
+    def describe(self, **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Provides a description of the collection.
+
+        Parameters
+        ----------
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns response content as a dictionary.
+        """
+        return {
+            "collection_name": self._name,
+            "fields": copy.deepcopy(self._schema_fields),
+            "auto_id": self._auto_id,
+            "primary_field": self._pk_field,
+            "vector_field": self._vector_field,
+            "dim": self._dim,
+            "metric_type": self._metric,
+            "index_type": self._index_type,
+            "num_entities": self.count(),
+        }
+
+    def _alive_metadata(self) -> pd.DataFrame:
+        metadata = self._get_metadata()
+        return metadata[self._alive[:self._size]]
+
+    def query(self, query: str = None, **kwargs: dict[str, typing.Any]) -> list[dict]:
+        """
+        Query the metadata of the collection.
+
+        Parameters
+        ----------
+        query : str, optional
+            Filter expression evaluated with `pandas.DataFrame.query`, when None all rows are returned.
+        **kwargs : dict[str, typing.Any]
+            Supports `output_fields`, the list of fields to return, and `limit`.
+
+        Returns
+        -------
+        list[dict]
+            Returns the matching rows.
+        """
+        with self._lock:
+            metadata = self._alive_metadata()
+
+            if (query):
+                metadata = metadata.query(query)
+
+            output_fields = kwargs.get("output_fields")
+            if (output_fields):
+                metadata = metadata[[field for field in output_fields if field != self._vector_field]]
+
+            limit = kwargs.get("limit")
+            if (limit is not None):
+                metadata = metadata.head(limit)
+
+            return metadata.to_dict(orient="records")
+
+    def _score(self, queries: np.ndarray, query_norms: np.ndarray, rows: slice | np.ndarray) -> np.ndarray:
+        # Lower scores are better for every metric
+        dot = queries @ self._vectors[rows].T
+
+        if (self._metric == "L2"):
+            return (query_norms[:, np.newaxis] + self._norms[rows][np.newaxis, :]) - 2 * dot
+
+        if (self._metric == "COSINE"):
+            norms = self._norms[rows][np.newaxis, :] * query_norms[:, np.newaxis]
+            return -(dot / np.maximum(norms, np.finfo(np.float32).tiny))
+
+        return -dot
+
+    def _query_norms(self, queries: np.ndarray) -> np.ndarray:
+        return self._compute_norms(queries)
+
+    def _search_flat(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        num_queries = len(queries)
+        query_norms = self._query_norms(queries)
+
+        best_scores = np.full((num_queries, k), np.inf, dtype=np.float32)
+        best_rows = np.full((num_queries, k), -1, dtype=np.int64)
+
+        for start in range(0, self._size, self._search_block_size):
+            stop = min(start + self._search_block_size, self._size)
+
+            scores = self._score(queries, query_norms, slice(start, stop))
+            scores[:, ~self._alive[start:stop]] = np.inf
+
+            rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+
+            # Merge this block with the current top k
+            scores = np.concatenate((best_scores, scores), axis=1)
+            rows = np.concatenate((best_rows, rows), axis=1)
+
+            top_k = np.argpartition(scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, top_k, axis=1)
+            best_rows = np.take_along_axis(rows, top_k, axis=1)
+
+        return best_scores, best_rows
+
+    def _search_ivf(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        num_queries = len(queries)
+        query_norms = self._query_norms(queries)
+
+        best_scores = np.full((num_queries, k), np.inf, dtype=np.float32)
+        best_rows = np.full((num_queries, k), -1, dtype=np.int64)
+
+        for i in range(num_queries):
+            rows = self._ivf_index.candidate_rows(queries[i])
+            rows = rows[self._alive[rows]]
+
+            if (len(rows) == 0):
+                continue
+
+            scores = self._score(queries[i:i + 1], query_norms[i:i + 1], rows)[0]
+
+            count = min(k, len(rows))
+            top_k = np.argpartition(scores, count - 1)[:count]
+
+            best_scores[i, :count] = scores[top_k]
+            best_rows[i, :count] = rows[top_k]
+
+        return best_scores, best_rows
+
+    def build_index(self):
+        """
+        Train the IVF index on the vectors currently in the collection. This is performed automatically by
+        `similarity_search` when the index has not been trained, or the collection has doubled in size since it was.
+        """
+        with self._lock:
+            if (self._ivf_index is None):
+                return
+
+            self._compact()
+            self._ivf_index.train(self._vectors[:self._size])
+
+    def _index_needs_training(self) -> bool:
+        if (self._ivf_index is None or self._size < self._ivf_index.nlist):
+            return False
+
+        return (not self._ivf_index.is_trained or self._size >= 2 * self._ivf_index.num_trained_rows)
+
+    async def similarity_search(self,
+                                embeddings: list[list[float]],
+                                k: int = 4,
+                                **kwargs: dict[str, typing.Any]) -> list[list[dict]]:
+        """
+        Perform a similarity search within the collection.
+
+        Parameters
+        ----------
+        embeddings : list[list[float]]
+            Embeddings for which to perform the similarity search.
+        k : int, optional
+            The number of nearest neighbors to return, by default 4.
+        **kwargs : dict[str, typing.Any]
+            Supports `output_fields`, the list of fields to return, by default all fields except the vector field.
+
+        Returns
+        -------
+        list[list[dict]]
+            Returns a list of results for each embedding, ordered from the most to the least similar.
+        """
+        return self.search(embeddings, k=k, **kwargs)
+
+    def search(self, embeddings: list[list[float]], k: int = 4, **kwargs: dict[str, typing.Any]) -> list[list[dict]]:
+        """
+        Synchronous version of `similarity_search`.
+        """
+        queries = self._to_vectors(embeddings)
+
+        output_fields = kwargs.get("output_fields") or self.metadata_fields
+        output_fields = [field for field in output_fields if field != self._vector_field]
+
+        with self._lock:
+            if (self._size == 0 or k <= 0):
+                return [[] for _ in range(len(queries))]
+
+            if (self._index_needs_training()):
+                self.build_index()
+
+            if (self._ivf_index is not None and self._ivf_index.is_trained):
+                scores, rows = self._search_ivf(queries, k)
+            else:
+                scores, rows = self._search_flat(queries, k)
+
+            # Order the top k of each query
+            order = np.argsort(scores, axis=1, kind="stable")
+            scores = np.take_along_axis(scores, order, axis=1)
+            rows = np.take_along_axis(rows, order, axis=1)
+
+            metadata = self._get_metadata()[output_fields]
+
+            outputs = []
+            for query_scores, query_rows in zip(scores, rows):
+                query_rows = query_rows[np.isfinite(query_scores)]
+                outputs.append(metadata.iloc[query_rows].to_dict(orient="records"))
+
+        return outputs
+
+    def update(self, data: list[typing.Any], **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """
+        Update (upsert) rows in the collection, rows are matched by their primary key.
+
+        Parameters
+        ----------
+        data : list[typing.Any]
+            Rows to be updated as dictionaries.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict[str, typing.Any]
+            Returns result of the updated operation stats.
+        """
+        if not isinstance(data, list):
+            raise RuntimeError("Data is not of type list.")
+
+        if (self._auto_id):
+            raise RuntimeError("Update is not supported for collections with an auto generated primary key")
+
+        result = self._insert_rows(pd.DataFrame(data))
+
+        return {
+            "insert_count": 0,
+            "delete_count": 0,
+            "upsert_count": result["insert_count"],
+            "succ_count": result["insert_count"],
+            "err_count": 0
+        }
+
+    def _delete_keys(self, keys: list) -> int:
+        deleted = 0
+
+        for key in keys:
+            row = self._key_rows.pop(key, None)
+            if (row is not None and self._alive[row]):
+                self._alive[row] = False
+                deleted += 1
+
+        self._num_deleted += deleted
+
+        return deleted
+
+    def delete_by_keys(self, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> typing.Any:
+        """
+        Delete rows by their primary keys.
+
+        Parameters
+        ----------
+        keys : int | str | list
+            Primary keys of the rows to delete.
+        **kwargs :  dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        typing.Any
+            Returns the keys which were deleted.
+        """
+        if not isinstance(keys, list):
+            keys = [keys]
+
+        with self._lock:
+            deleted_keys = [key for key in keys if key in self._key_rows]
+            self._delete_keys(deleted_keys)
+            self._maybe_compact()
+
+        return deleted_keys
+
+    def delete(self, expr: str, **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """
+        Delete rows matching a filter expression.
+
+        Parameters
+        ----------
+        expr : str
+            Filter expression evaluated with `pandas.DataFrame.query`.
+        **kwargs :  dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict[str, typing.Any]
+            Returns result of the delete operation stats.
+        """
+        with self._lock:
+            keys = self._alive_metadata().query(expr)[self._pk_field].tolist()
+            deleted = self._delete_keys(keys)
+            self._maybe_compact()
+
+        return {
+            "insert_count": 0, "delete_count": deleted, "upsert_count": 0, "succ_count": deleted, "err_count": 0
+        }
+
+    def retrieve_by_keys(self, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> list[typing.Any]:
+        """
+        Retrieve rows, including their vectors, by their primary keys.
+
+        Parameters
+        ----------
+        keys : int | str | list
+            Primary keys of the rows to retrieve.
+        **kwargs :  dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        list[typing.Any]
+            Returns the rows of the given keys which exist in the collection.
+        """
+        if not isinstance(keys, list):
+            keys = [keys]
+
+        with self._lock:
+            rows = [self._key_rows[key] for key in keys if key in self._key_rows]
+
+            results = self._get_metadata().iloc[rows].to_dict(orient="records")
+            for result, row in zip(results, rows):
+                result[self._vector_field] = self._vectors[row].tolist()
+
+        return results
+
+    def count(self, **kwargs: dict[str, typing.Any]) -> int:
+        """
+        Returns number of rows in the collection.
+
+        Parameters
+        ----------
+        **kwargs :  dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        int
+            Returns number of rows in the collection.
+        """
+        return self._size - self._num_deleted
+
+    def drop(self, **kwargs: dict[str, typing.Any]) -> None:
+        """
+        Remove all of the rows from the collection.
+
+        Parameters
+        ----------
+        **kwargs :  dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+        """
+        with self._lock:
+            self._alive[:self._size] = False
+            self._key_rows.clear()
+            self._num_deleted = self._size
+            self._compact()
+
+    def _maybe_compact(self):
+        # Reclaim the space of deleted rows once they make up half of the collection
+        if (self._num_deleted > 0 and self._num_deleted * 2 >= self._size):
+            self._compact()
+
+    def _compact(self):
+        if (self._num_deleted == 0):
+            return
+
+        keep = np.flatnonzero(self._alive[:self._size])
+
+        self._vectors = np.ascontiguousarray(self._vectors[keep])
+        self._norms = self._norms[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._metadata = self._get_metadata().iloc[keep].reset_index(drop=True)
+        self._size = len(keep)
+        self._num_deleted = 0
+
+        self._key_rows = dict(zip(self._metadata[self._pk_field].tolist(), range(self._size)))
+
+        if (self._ivf_index is not None and self._ivf_index.is_trained):
+            self._ivf_index.compact(keep)
+
+    def save(self, path: str):
+        """
+        Persist the collection to the directory `path`. Vectors are written as `.npy` files which are memory mapped
+        when the collection is loaded.
+
+        Parameters
+        ----------
+        path : str
+            Directory to write the collection to.
+        """
+        with self._lock:
+            self._compact()
+
+            os.makedirs(path, exist_ok=True)
+
+            state = {
+                "name": self._name,
+                "schema_fields": self._schema_fields,
+                "index_conf": self._index_conf,
+                "auto_id": self._auto_id,
+                "next_id": self._next_id,
+            }
+
+            files = {
+                "vectors.npy": lambda f: np.save(f, self._vectors[:self._size]),
+                "metadata.pkl": lambda f: self._get_metadata().to_pickle(f),
+                "state.json": lambda f: f.write(json.dumps(state, default=str).encode()),
+            }
+
+            # Write each file to a temporary file first so a failure never leaves a partially written collection
+            for (file_name, write_fn) in files.items():
+                tmp_path = os.path.join(path, f"{file_name}.tmp")
+                with open(tmp_path, "wb") as f:
+                    write_fn(f)
+
+                os.replace(tmp_path, os.path.join(path, file_name))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LocalVectorDBResourceService":
+        """
+        Load a collection previously written by `save`.
+
+        Parameters
+        ----------
+        path : str
+            Directory containing the collection.
+        mmap : bool, optional
+            When True the vectors are memory mapped, and only copied into memory when rows are inserted.
+
+        Returns
+        -------
+        LocalVectorDBResourceService
+            The loaded collection.
+        """
+        with open(os.path.join(path, "state.json"), "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+        resource = cls(name=state["name"],
+                       schema_fields=state["schema_fields"],
+                       index_conf=state["index_conf"],
+                       auto_id=state["auto_id"])
+
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r" if mmap else None)
+
+        resource._vectors = vectors
+        resource._size = len(vectors)
+        resource._norms = resource._compute_norms(vectors)
+        resource._alive = np.ones(len(vectors), dtype=bool)
+        resource._metadata = pd.read_pickle(os.path.join(path, "metadata.pkl"))
+        resource._next_id = state["next_id"]
+        resource._key_rows = dict(zip(resource._metadata[resource._pk_field].tolist(), range(resource._size)))
+
+        return resource
+
+
+class LocalVectorDBService(VectorDBService):
+    """
+    In-process vector database service, storing each collection as a `LocalVectorDBResourceService`. This requires no
+    external server, making it suitable for small deployments, edge devices and tests.
+
+    Parameters
+    ----------
+    persist_dir : str, optional
+        Directory where collections are persisted, each collection is stored in a sub-directory. Existing collections
+        are loaded on first use. Collections are written on `release_resource` and `close`, or explicitly with
+        `persist`. When None, collections are only kept in memory.
+    mmap : bool, optional
+        Memory map the vectors of persisted collections when they are loaded.
+    **kwargs : dict
+        Ignored, accepted so that configurations written for other services can be used.
+    """
+
+    def __init__(self, persist_dir: str = None, mmap: bool = True, **kwargs: dict[str, typing.Any]):
+        if (len(kwargs) > 0):
+            logger.debug("Ignoring unsupported arguments for LocalVectorDBService: %s", list(kwargs.keys()))
+
+        self._persist_dir = persist_dir
+        self._mmap = mmap
+        self._resources: dict[str, LocalVectorDBResourceService] = {}
+        self._lock = threading.RLock()
+
+    def _get_path(self, name: str) -> str | None:
+        return os.path.join(self._persist_dir, name) if self._persist_dir is not None else None
+
+    def _is_persisted(self, name: str) -> bool:
+        path = self._get_path(name)
+        return path is not None and os.path.exists(os.path.join(path, "state.json"))
+
+    def load_resource(self, name: str, **kwargs: dict[str, typing.Any]) -> LocalVectorDBResourceService:
+        with self._lock:
+            resource = self._resources.get(name)
+
+            if (resource is None):
+                if (not self._is_persisted(name)):
+                    raise RuntimeError(f"Collection '{name}' does not exist")
+
+                resource = LocalVectorDBResourceService.load(self._get_path(name), mmap=self._mmap)
+                self._resources[name] = resource
+
+            return resource
+
+    def has_store_object(self, name: str) -> bool:
+        """
+        Check if a collection exists.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to check.
+
+        Returns
+        -------
+        bool
+            True if the collection exists, False otherwise.
+        """
+        with self._lock:
+            return name in self._resources or self._is_persisted(name)
+
+    def list_store_objects(self, **kwargs: dict[str, typing.Any]) -> list[str]:
+        """
+        List the names of all collections.
+
+        Returns
+        -------
+        list[str]
+            A list of collection names.
+        """
+        with self._lock:
+            names = set(self._resources.keys())
+
+            if (self._persist_dir is not None and os.path.isdir(self._persist_dir)):
+                names.update(name for name in os.listdir(self._persist_dir) if self._is_persisted(name))
+
+            return sorted(names)
+
+    def create(self, name: str, overwrite: bool = False, **kwargs: dict[str, typing.Any]) -> None:
+        """
+        Create a collection, accepts the same configuration as `MilvusVectorDBService.create`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to be created.
+        overwrite : bool, optional
+            If True, the collection will be overwritten if it already exists, by default False.
+        **kwargs : dict
+            Collection configuration, `schema_conf` with a list of `schema_fields` is required, `index_conf` and
+            `auto_id` are optional.
+
+        Raises
+        ------
+        ValueError
+            If the provided schema fields configuration is empty.
+        """
+        logger.debug("Creating collection: %s, overwrite=%s, kwargs=%s", name, overwrite, kwargs)
+
+        with self._lock:
+            if (self.has_store_object(name)):
+                if (not overwrite):
+                    return
+
+                self.drop(name)
+
+            schema_fields = kwargs.get("schema_conf", {}).get("schema_fields", [])
+            if len(schema_fields) == 0:
+                raise ValueError("Cannot create collection as provided empty schema_fields configuration")
+
+            # Field configurations may have been serialized to JSON strings
+            schema_fields = [json.loads(field) if isinstance(field, str) else field for field in schema_fields]
+
+            self._resources[name] = LocalVectorDBResourceService(name=name,
+                                                                 schema_fields=schema_fields,
+                                                                 index_conf=kwargs.get("index_conf"),
+                                                                 auto_id=kwargs.get("auto_id", False))
+
+    def create_from_dataframe(self,
+                              name: str,
+                              df: DataFrameType,
+                              overwrite: bool = False,
+                              **kwargs: dict[str, typing.Any]) -> None:
+        """
+        Create a collection with a schema inferred from the first row of a dataframe. A column whose values are
+        sequences of numbers becomes the vector field, and an auto generated `pk` primary key is added.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        df : DataFrameType
+            The dataframe to create the collection from.
+        overwrite : bool, optional
+            Whether to overwrite the collection if it already exists. Default is False.
+        **kwargs : dict[str, typing.Any]
+            Supports `index_field`, when set an IVF_FLAT index is used.
+        """
+        if isinstance(df, cudf.DataFrame):
+            df = df.head(1).to_pandas()
+
+        fields = [{"name": "pk", "dtype": "INT64", "is_primary": True, "auto_id": True}]
+        for col_name, col_val in df.iloc[0].items():
+            if isinstance(col_val, (list, tuple, np.ndarray)):
+                fields.append({"name": col_name, "dtype": "FLOAT_VECTOR", "params": {"dim": len(col_val)}})
+            else:
+                fields.append({"name": col_name, "dtype": type(col_val).__name__})
+
+        create_kwargs = {"schema_conf": {"schema_fields": fields}}
+
+        if (kwargs.get("index_field", None) is not None):
+            create_kwargs["index_conf"] = {"metric_type": "L2", "index_type": "IVF_FLAT"}
+
+        self.create(name=name, overwrite=overwrite, **create_kwargs)
+
+    def insert(self, name: str, data: list[list] | list[dict], **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Insert data into a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to be inserted.
+        data : list[list] | list[dict]
+            Data to be inserted in the collection.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns response content as a dictionary.
+        """
+        return self.load_resource(name).insert(data, **kwargs)
+
+    def insert_dataframe(self, name: str, df: DataFrameType, **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Insert a dataframe into a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to be inserted.
+        df : DataFrameType
+            Dataframe to be inserted in the collection.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns response content as a dictionary.
+        """
+        return self.load_resource(name).insert_dataframe(df, **kwargs)
+
+    def query(self, name: str, query: str = None, **kwargs: dict[str, typing.Any]) -> typing.Any:
+        """
+        Query the metadata of a collection, see `LocalVectorDBResourceService.query`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to search within.
+        query : str
+            Filter expression evaluated with `pandas.DataFrame.query`.
+        **kwargs : dict[str, typing.Any]
+            Additional keyword arguments for the query.
+
+        Returns
+        -------
+        typing.Any
+            The matching rows.
+        """
+        return self.load_resource(name).query(query, **kwargs)
+
+    async def similarity_search(self, name: str, **kwargs: dict[str, typing.Any]) -> list[list[dict]]:
+        """
+        Perform a similarity search within a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to search within.
+        **kwargs : dict[str, typing.Any]
+            Keyword arguments for `LocalVectorDBResourceService.similarity_search`.
+
+        Returns
+        -------
+        list[list[dict]]
+            Returns a list of results for each embedding.
+        """
+        return await self.load_resource(name).similarity_search(**kwargs)
+
+    def update(self, name: str, data: list[typing.Any], **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """
+        Update (upsert) rows in a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        data : list[typing.Any]
+            Rows to be updated as dictionaries.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict[str, typing.Any]
+            Returns result of the updated operation stats.
+        """
+        return self.load_resource(name).update(data, **kwargs)
+
+    def delete_by_keys(self, name: str, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> typing.Any:
+        """
+        Delete rows by their primary keys.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        keys : int | str | list
+            Primary keys of the rows to delete.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        typing.Any
+            Returns the keys which were deleted.
+        """
+        return self.load_resource(name).delete_by_keys(keys, **kwargs)
+
+    def delete(self, name: str, expr: str, **kwargs: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """
+        Delete rows matching a filter expression.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        expr : str
+            Filter expression evaluated with `pandas.DataFrame.query`.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict[str, typing.Any]
+            Returns result of the delete operation stats.
+        """
+        return self.load_resource(name).delete(expr, **kwargs)
+
+    def retrieve_by_keys(self, name: str, keys: int | str | list, **kwargs: dict[str, typing.Any]) -> list[typing.Any]:
+        """
+        Retrieve rows by their primary keys.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        keys : int | str | list
+            Primary keys of the rows to retrieve.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        list[typing.Any]
+            Returns the rows of the given keys which exist in the collection.
+        """
+        return self.load_resource(name).retrieve_by_keys(keys, **kwargs)
+
+    def count(self, name: str, **kwargs: dict[str, typing.Any]) -> int:
+        """
+        Returns number of rows in a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        int
+            Returns number of rows in the collection.
+        """
+        return self.load_resource(name).count(**kwargs)
+
+    def drop(self, name: str, **kwargs: dict[str, typing.Any]) -> None:
+        """
+        Drop a collection, including any persisted copy.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+        """
+        logger.debug("Dropping collection: %s, kwargs=%s", name, kwargs)
+
+        with self._lock:
+            self._resources.pop(name, None)
+
+            if (self._is_persisted(name)):
+                shutil.rmtree(self._get_path(name))
+
+    def describe(self, name: str, **kwargs: dict[str, typing.Any]) -> dict:
+        """
+        Describe a collection.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+        **kwargs : dict[str, typing.Any]
+            Unused, accepted for compatibility with other implementations.
+
+        Returns
+        -------
+        dict
+            Returns collection information.
+        """
+        return self.load_resource(name).describe(**kwargs)
+
+    def persist(self, name: str = None) -> None:
+        """
+        Write collections loaded in memory to `persist_dir`.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the collection to persist, when None all loaded collections are persisted.
+        """
+        if (self._persist_dir is None):
+            return
+
+        with self._lock:
+            names = [name] if name is not None else list(self._resources.keys())
+
+            for resource_name in names:
+                resource = self._resources.get(resource_name)
+                if (resource is not None):
+                    resource.save(self._get_path(resource_name))
+
+    def release_resource(self, name: str) -> None:
+        """
+        Persist a collection, when `persist_dir` is set, and release it from memory.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection to release.
+        """
+        with self._lock:
+            if (self._persist_dir is None):
+                # Without persistence the collection would be lost
+                return
+
+            self.persist(name)
+            self._resources.pop(name, None)
+
+    def close(self) -> None:
+        """
+        Persist all collections, when `persist_dir` is set.
+        """
+        self.persist()
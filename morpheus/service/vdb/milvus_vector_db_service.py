@@ -18,6 +18,10 @@ import logging
 import threading
 import time
 import typing
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import wraps
 
 import cudf
@@ -38,6 +42,8 @@ IMPORT_ERROR_MESSAGE = "MilvusVectorDBResourceService requires the milvus and py
 # https://milvus.io/docs/limitations.md#Length-of-a-string
 MAX_STRING_LENGTH_BYTES = 65_535
 
+DEFAULT_SEARCH_PARAMS = {"metric_type": "L2", "params": {"ef": 10}}
+
 try:
     import pymilvus
     from pymilvus.orm.mutation import MutationResult
@@ -218,10 +224,39 @@ def with_collection_lock(func: typing.Callable) -> typing.Callable:
     return wrapper
 
 
+@dataclass
+class MilvusInsertMetrics:
+    """
+    Insert and flush statistics of a `MilvusVectorDBResourceService`.
+    """
+    insert_count: int = 0
+    rows_inserted: int = 0
+    insert_time_sec: float = 0.0
+    max_insert_latency_sec: float = 0.0
+    flush_count: int = 0
+    flush_time_sec: float = 0.0
+
+    @property
+    def mean_insert_latency_sec(self) -> float:
+        return self.insert_time_sec / self.insert_count if self.insert_count > 0 else 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        total_time_sec = self.insert_time_sec + self.flush_time_sec
+        return self.rows_inserted / total_time_sec if total_time_sec > 0 else 0.0
+
+
 class MilvusVectorDBResourceService(VectorDBResourceService):
     """
     Represents a service for managing resources in a Milvus Vector Database.
 
+    By default every insert is followed by a flush of the collection. Setting `flush_max_rows` and/or
+    `flush_interval_sec` defers the flush until that many rows have been inserted or that much time has passed since
+    the previous flush, any rows which have not been flushed are flushed by `flush` or `close`. Setting
+    `max_inflight_inserts` performs the inserts of `insert_dataframe` on a background thread, allowing the next
+    dataframe to be prepared while previous inserts are in progress. The result of a background insert is not known when
+    `insert_dataframe` returns, see `insert_dataframe` for the returned values.
+
     Parameters
     ----------
     name : str
@@ -230,9 +265,27 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         An instance of the MilvusClient for interaction with the Milvus Vector Database.
     truncate_long_strings : bool, optional
         When true, truncate strings values that are longer than the max length of the field
+    flush_max_rows : int, optional
+        Flush the collection once at least this many rows have been inserted since the last flush.
+    flush_interval_sec : float, optional
+        Flush the collection when an insert occurs at least this many seconds after the last flush.
+    max_inflight_inserts : int, optional
+        Maximum number of `insert_dataframe` calls which can be in progress on the background thread, when 0 inserts are
+        performed synchronously.
+    search_params : dict, optional
+        Search parameters used by `similarity_search`, by default `DEFAULT_SEARCH_PARAMS`. These should match the
+        metric and index type of the collection, for example `{"metric_type": "L2", "params": {"nprobe": 16}}` for an
+        IVF index.
     """
 
-    def __init__(self, name: str, client: "MilvusClient", truncate_long_strings: bool = False) -> None:
+    def __init__(self,
+                 name: str,
+                 client: "MilvusClient",
+                 truncate_long_strings: bool = False,
+                 flush_max_rows: int = 0,
+                 flush_interval_sec: float = 0.0,
+                 max_inflight_inserts: int = 0,
+                 search_params: dict = None) -> None:
         if IMPORT_EXCEPTION is not None:
             raise ImportError(IMPORT_ERROR_MESSAGE) from IMPORT_EXCEPTION
 
@@ -241,6 +294,21 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         self._name = name
         self._client = client
 
+        self._flush_max_rows = flush_max_rows
+        self._flush_interval_sec = flush_interval_sec
+        self._rows_since_flush = 0
+        self._last_flush_time = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+        self._metrics = MilvusInsertMetrics()
+
+        self._max_inflight_inserts = max_inflight_inserts
+        self._inflight_inserts: deque[Future] = deque()
+        self._insert_executor = None
+        if (max_inflight_inserts > 0):
+            # A single thread preserves the order of the inserts
+            self._insert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"milvus_insert_{name}")
+
         self._collection = self._client.get_collection(collection_name=self._name)
         self._fields: list[pymilvus.FieldSchema] = self._collection.schema.fields
 
@@ -265,6 +333,10 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
 
         self._truncate_long_strings = truncate_long_strings
 
+        self._search_params = copy.deepcopy(search_params or DEFAULT_SEARCH_PARAMS)
+        self._output_fields = [field.name for field in self._fields if field.name != self._vector_field]
+
+        # The collection stays loaded for the lifetime of the resource, avoiding a load call per search
         self._collection.load()
 
     def _set_up_collection(self):
@@ -289,8 +361,9 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         dict
             Returns response content as a dictionary.
         """
-        result = self._collection.insert(data, **kwargs)
-        self._collection.flush()
+        self.wait_for_inserts()
+
+        result = self._insert(data, **kwargs)
 
         return self._insert_result_to_dict(result=result)
 
@@ -308,7 +381,9 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         Returns
         -------
         dict
-            Returns response content as a dictionary.
+            Returns response content as a dictionary. When the insert is performed on the background thread the
+            dictionary has the same keys, with `insert_count` set to the number of rows submitted and the remaining
+            values, such as `primary_keys`, `succ_count` and `err_count`, set to `None` as they are not yet known.
         """
         # Ensure that there are no None values in the DataFrame entries.
         for field_name, dtype in self._fillna_fields_dict.items():
@@ -343,10 +418,101 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
             truncate_string_cols_by_bytes(collection_df, self._fields_max_length, warn_on_truncate=True)
 
         # Note: dataframe columns has to be in the order of collection schema fields.s
-        result = self._collection.insert(data=collection_df, **kwargs)
+        if (self._insert_executor is None):
+            result = self._insert(collection_df, **kwargs)
+
+            return self._insert_result_to_dict(result=result)
+
+        # Bound the number of inserts in progress, surfacing any errors from previous inserts
+        while (len(self._inflight_inserts) >= self._max_inflight_inserts):
+            self._inflight_inserts.popleft().result()
+
+        self._inflight_inserts.append(self._insert_executor.submit(self._insert, collection_df, **kwargs))
+
+        return self._queued_insert_result_dict(len(collection_df))
+
+    def _insert(self, data: typing.Any, **kwargs: dict[str, typing.Any]) -> "MutationResult":
+        start_time = time.perf_counter()
+        result = self._collection.insert(data, **kwargs)
+        latency_sec = time.perf_counter() - start_time
+
+        with self._flush_lock:
+            self._metrics.insert_count += 1
+            self._metrics.rows_inserted += result.insert_count
+            self._metrics.insert_time_sec += latency_sec
+            self._metrics.max_insert_latency_sec = max(self._metrics.max_insert_latency_sec, latency_sec)
+
+            self._rows_since_flush += result.insert_count
+
+            if (self._should_flush()):
+                self._flush()
+
+        return result
+
+    def _should_flush(self) -> bool:
+        if (self._flush_max_rows <= 0 and self._flush_interval_sec <= 0):
+            return True
+
+        if (self._flush_max_rows > 0 and self._rows_since_flush >= self._flush_max_rows):
+            return True
+
+        return (self._flush_interval_sec > 0
+                and (time.monotonic() - self._last_flush_time) >= self._flush_interval_sec)
+
+    def _flush(self):
+        start_time = time.perf_counter()
         self._collection.flush()
 
-        return self._insert_result_to_dict(result=result)
+        self._metrics.flush_count += 1
+        self._metrics.flush_time_sec += time.perf_counter() - start_time
+
+        self._rows_since_flush = 0
+        self._last_flush_time = time.monotonic()
+
+    @property
+    def metrics(self) -> MilvusInsertMetrics:
+        """
+        Insert and flush statistics of this resource.
+        """
+        return self._metrics
+
+    def wait_for_inserts(self):
+        """
+        Wait for any inserts in progress on the background thread to complete.
+        """
+        while (len(self._inflight_inserts) > 0):
+            self._inflight_inserts.popleft().result()
+
+    def flush(self):
+        """
+        Wait for any inserts in progress and flush any rows which have not yet been flushed.
+        """
+        self.wait_for_inserts()
+
+        with self._flush_lock:
+            if (self._rows_since_flush > 0):
+                self._flush()
+
+    def close(self):
+        """
+        Flush any pending rows and stop the background insert thread.
+        """
+        try:
+            self.flush()
+        finally:
+            if (self._insert_executor is not None):
+                self._insert_executor.shutdown(wait=True)
+                self._insert_executor = None
+
+        logger.debug("Milvus collection '%s': inserted %d rows in %d inserts (%.2f rows/s), "
+                     "mean insert latency: %.2f ms, max insert latency: %.2f ms, flushes: %d",
+                     self._name,
+                     self._metrics.rows_inserted,
+                     self._metrics.insert_count,
+                     self._metrics.rows_per_sec,
+                     self._metrics.mean_insert_latency_sec * 1000.0,
+                     self._metrics.max_insert_latency_sec * 1000.0,
+                     self._metrics.flush_count)
 
     def describe(self, **kwargs: dict[str, typing.Any]) -> dict:
         """
@@ -408,7 +574,8 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         k : int, optional
             The number of nearest neighbors to return, by default 4.
         **kwargs : dict[str, typing.Any]
-            Extra keyword arguments specific to the vector database implementation.
+            Extra keyword arguments specific to the vector database implementation, `search_params` overrides the
+            search parameters of the resource for this search.
 
         Returns
         -------
@@ -416,26 +583,29 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
             Returns a list of dictionaries representing the results of the similarity search.
         """
 
-        self._collection.load()
-
         assert self._vector_field is not None, "Cannot perform similarity search on a collection without a vector field"
 
-        # Determine result metadata fields.
-        output_fields = [x.name for x in self._fields if x.name != self._vector_field]
-
-        params = {"metric_type": "L2", "params": {"ef": 10}}
+        params = kwargs.pop("search_params", None) or self._search_params
 
-        response = self._collection.search(data=embeddings,
-                                           anns_field=self._vector_field,
-                                           param=params,
-                                           limit=k,
-                                           output_fields=output_fields,
-                                           **kwargs)
+        search_kwargs = {
+            "data": embeddings,
+            "anns_field": self._vector_field,
+            "param": params,
+            "limit": k,
+            "output_fields": self._output_fields,
+            **kwargs
+        }
 
-        outputs = []
+        try:
+            response = self._collection.search(**search_kwargs)
+        except pymilvus.exceptions.MilvusException:
+            # The collection may have been released since this resource was created, load it and retry once
+            logger.debug("Search of collection %s failed, reloading the collection and retrying", self._name)
+            self._collection.load()
+            response = self._collection.search(**search_kwargs)
 
-        for res in response:
-            outputs.append([{x: hit.entity.get(x) for x in output_fields} for hit in res])
+        output_fields = self._output_fields
+        outputs = [[{field: hit.entity.get(field) for field in output_fields} for hit in res] for res in response]
 
         return outputs
 
@@ -578,6 +748,18 @@ class MilvusVectorDBResourceService(VectorDBResourceService):
         }
         return result_dict
 
+    def _queued_insert_result_dict(self, num_rows: int) -> dict[str, typing.Any]:
+        # Same keys as `_insert_result_to_dict`, the outcome of an insert on the background thread isn't known yet
+        result_dict = dict.fromkeys(("primary_keys",
+                                     "delete_count",
+                                     "upsert_count",
+                                     "timestamp",
+                                     "succ_count",
+                                     "err_count",
+                                     "succ_index",
+                                     "err_index"))
+        return {**result_dict, "insert_count": num_rows}
+
     def _update_delete_result_to_dict(self, result: "MutationResult") -> dict[str, typing.Any]:
         result_dict = {
             "insert_count": result.insert_count,
@@ -605,8 +787,21 @@ class MilvusVectorDBService(VectorDBService):
         Alias for the Milvus connection, by default "default".
     truncate_long_strings : bool, optional
         When true, truncate strings values that are longer than the max length of the field
+    flush_max_rows : int, optional
+        Defer flushing a collection after an insert until at least this many rows have been inserted.
+    flush_interval_sec : float, optional
+        Defer flushing a collection after an insert until this many seconds have passed since the last flush.
+    max_inflight_inserts : int, optional
+        Maximum number of `insert_dataframe` calls per collection which can be in progress on a background thread,
+        when 0 inserts are performed synchronously.
     **kwargs : dict
         Additional keyword arguments specific to the Milvus connection configuration.
+
+    Notes
+    -----
+    When any of `flush_max_rows`, `flush_interval_sec` or `max_inflight_inserts` are set, inserts into a collection
+    are buffered by a resource service which is kept for the lifetime of this service. Buffered inserts are completed
+    and flushed before any other operation on the same collection, and when `close` is called.
     """
 
     _collection_locks = {}
@@ -620,17 +815,74 @@ class MilvusVectorDBService(VectorDBService):
                  db_name: str = "",
                  token: str = "",
                  truncate_long_strings: bool = False,
+                 flush_max_rows: int = 0,
+                 flush_interval_sec: float = 0.0,
+                 max_inflight_inserts: int = 0,
                  **kwargs: dict[str, typing.Any]):
 
         self._truncate_long_strings = truncate_long_strings
         self._client = MilvusClient(uri=uri, user=user, password=password, db_name=db_name, token=token, **kwargs)
 
+        self._write_resource_kwargs = {
+            "flush_max_rows": flush_max_rows,
+            "flush_interval_sec": flush_interval_sec,
+            "max_inflight_inserts": max_inflight_inserts
+        }
+        self._buffered_writes = flush_max_rows > 0 or flush_interval_sec > 0 or max_inflight_inserts > 0
+        self._write_resources: dict[str, MilvusVectorDBResourceService] = {}
+
     def load_resource(self, name: str, **kwargs: dict[str, typing.Any]) -> MilvusVectorDBResourceService:
+        # Make any buffered inserts visible before the collection is used
+        self._flush_write_resource(name)
+
         return MilvusVectorDBResourceService(name=name,
                                              client=self._client,
                                              truncate_long_strings=self._truncate_long_strings,
                                              **kwargs)
 
+    def _get_write_resource(self, name: str) -> MilvusVectorDBResourceService:
+        if (not self._buffered_writes):
+            return self.load_resource(name)
+
+        resource = self._write_resources.get(name)
+
+        if (resource is None):
+            resource = MilvusVectorDBResourceService(name=name,
+                                                     client=self._client,
+                                                     truncate_long_strings=self._truncate_long_strings,
+                                                     **self._write_resource_kwargs)
+            self._write_resources[name] = resource
+
+        return resource
+
+    def _flush_write_resource(self, name: str, close: bool = False):
+        resource = self._write_resources.get(name)
+
+        if (resource is not None):
+            if (close):
+                del self._write_resources[name]
+                resource.close()
+            else:
+                resource.flush()
+
+    def get_insert_metrics(self, name: str) -> MilvusInsertMetrics | None:
+        """
+        Returns the insert statistics of a collection, only available when inserts are buffered.
+
+        Parameters
+        ----------
+        name : str
+            Name of the collection.
+
+        Returns
+        -------
+        MilvusInsertMetrics | None
+            Insert statistics of the collection, or None if no buffered inserts have been made into the collection.
+        """
+        resource = self._write_resources.get(name)
+
+        return resource.metrics if resource is not None else None
+
     def has_store_object(self, name: str) -> bool:
         """
         Check if a collection exists in the Milvus vector database.
@@ -827,7 +1079,7 @@ class MilvusVectorDBService(VectorDBService):
             If the collection not exists exists.
         """
 
-        resource = self.load_resource(name)
+        resource = self._get_write_resource(name)
         return resource.insert(data, **kwargs)
 
     @with_collection_lock
@@ -854,7 +1106,7 @@ class MilvusVectorDBService(VectorDBService):
         RuntimeError
             If the collection not exists exists.
         """
-        resource = self.load_resource(name)
+        resource = self._get_write_resource(name)
 
         return resource.insert_dataframe(df=df, **kwargs)
 
@@ -1064,6 +1316,8 @@ class MilvusVectorDBService(VectorDBService):
 
         logger.debug("Dropping collection: %s, kwargs=%s", name, kwargs)
 
+        self._flush_write_resource(name, close=True)
+
         if self.has_store_object(name):
             resource = kwargs.get("resource", "collection")
             if resource == "collection":
@@ -1116,16 +1370,23 @@ class MilvusVectorDBService(VectorDBService):
             Name of the collection to release.
         """
 
+        self._flush_write_resource(name, close=True)
+
         self._client.release_collection(collection_name=name)
 
     def close(self) -> None:
         """
         Close the connection to the Milvus vector database.
 
-        This method disconnects from the Milvus vector database by removing the connection.
+        This method flushes any buffered inserts and disconnects from the Milvus vector database by removing the
+        connection.
 
         """
-        self._client.close()
+        try:
+            for name in list(self._write_resources.keys()):
+                self._flush_write_resource(name, close=True)
+        finally:
+            self._client.close()
 
     @classmethod
     def get_collection_lock(cls, name: str) -> threading.Lock:
@@ -83,6 +83,13 @@ class VectorDBServiceFactory:
             **kwargs: dict[str, typing.Any]) -> "morpheus.service.vdb.milvus_vector_db_service.MilvusVectorDBService":
         pass
 
+    @typing.overload
+    @classmethod
+    def create_instance(
+            cls, service_name: typing.Literal["local"], *args: typing.Any,
+            **kwargs: dict[str, typing.Any]) -> "morpheus.service.vdb.local_vector_db_service.LocalVectorDBService":
+        pass
+
     @classmethod
     @handle_service_exceptions
     def create_instance(cls, service_name: str, *args: typing.Any, **kwargs: dict[str, typing.Any]):
@@ -15,12 +15,16 @@
 import io
 import json
 import logging
+import multiprocessing
 import re
 import typing
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from json.decoder import JSONDecodeError
 
 import mrc
+import numpy as np
 import pandas as pd
 from mrc.core import operators as ops
 
@@ -72,6 +76,9 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
         Timeout to retrieve batch messages from the queue.
     encoding : str, default = latin1
         Encoding to read a file.
+    num_workers : int, default = 0, min = 0
+        Number of worker processes used to parse plugin files concurrently. When 0 the files are parsed in the pipeline
+        thread.
     """
 
     def __init__(self,
@@ -86,7 +93,8 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
                  recursive: bool = True,
                  queue_max_size: int = 128,
                  batch_timeout: float = 5.0,
-                 encoding: str = 'latin1'):
+                 encoding: str = 'latin1',
+                 num_workers: int = 0):
 
         SingleOutputSource.__init__(self, c)
 
@@ -99,6 +107,8 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
             self._cols_exclude = cols_exclude
 
         self._encoding = encoding
+        self._num_workers = num_workers
+        self._executor: ProcessPoolExecutor = None
 
         self._input_count = None
 
@@ -183,6 +193,57 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
 
         return plugin_df
 
+    @staticmethod
+    def read_file_to_columns(file: io.TextIOWrapper,
+                             cols_exclude: typing.List[str]) -> typing.Tuple[typing.List[str], typing.List[list]]:
+        """
+        Read file content into a list of column names and a list of the values of each column. Unlike a dataframe, the
+        columns are cheap to send between processes.
+
+        Parameters
+        ----------
+        file : `io.TextIOWrapper`
+            Input file object
+        cols_exclude : typing.List[str]
+            Columns to drop.
+
+        Returns
+        -------
+        typing.Tuple[typing.List[str], typing.List[list]]
+            The column names and values.
+        """
+        data = json.load(file)
+        titles = data["titles"]
+        rows = data["data"]
+
+        col_indexes = [i for (i, col) in enumerate(titles) if col not in cols_exclude]
+
+        # Short rows are padded with None, the same as when building a dataframe from the rows
+        values = [[row[i] if i < len(row) else None for row in rows] for i in col_indexes]
+
+        return ([titles[i] for i in col_indexes], values)
+
+    @staticmethod
+    def _read_json_file(filepath: str, encoding: str, read_fn: typing.Callable[[io.TextIOWrapper], typing.Any]):
+        """
+        Reads a file with `read_fn`, retrying with utf-8 encoding if the JSON can't be decoded.
+        """
+        try:
+            with open(filepath, encoding=encoding) as file:
+                return read_fn(file)
+        except JSONDecodeError as decode_error:
+            logger.error('Unable to load %s to dataframe with %s encoding : %s', filepath, encoding, decode_error)
+
+            encoding = encoding.lower()
+            # To avoid retrying with utf-8, check if the given encoding is utf.
+            if encoding.startswith('utf'):
+                raise decode_error
+
+            logger.info('Retrying... Attempting to load %s with utf-8 encoding', filepath)
+
+            with open(filepath, encoding='utf-8') as file:
+                return read_fn(file)
+
     @staticmethod
     def load_df(filepath: str, cols_exclude: typing.List[str], encoding: str) -> pd.DataFrame:
         """
@@ -207,24 +268,37 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
         JSONDecodeError
             If not able to decode the json file.
         """
+        return AppShieldSourceStage._read_json_file(
+            filepath, encoding, partial(AppShieldSourceStage.read_file_to_df, cols_exclude=cols_exclude))
 
-        try:
-            with open(filepath, encoding=encoding) as file:
-                plugin_df = AppShieldSourceStage.read_file_to_df(file, cols_exclude)
-        except JSONDecodeError as decode_error:
-            logger.error('Unable to load %s to dataframe with %s encoding : %s', filepath, encoding, decode_error)
-
-            encoding = encoding.lower()
-            # To avoid retrying with utf-8, check if the given encoding is utf.
-            if encoding.startswith('utf'):
-                raise decode_error
+    @staticmethod
+    def load_columns(filepath: str, cols_exclude: typing.List[str],
+                     encoding: str) -> typing.Tuple[typing.List[str], typing.List[list]]:
+        """
+        Reads a file into a list of column names and a list of the values of each column, see `read_file_to_columns`.
+        Used to parse files in worker processes.
 
-            logger.info('Retrying... Attempting to load %s with utf-8 encoding', filepath)
+        Parameters
+        ----------
+        filepath : str
+            Path to a file.
+        cols_exclude : typing.List[str]
+            Columns that needs to exclude.
+        encoding : str
+            Encoding to read a file.
 
-            with open(filepath, encoding='utf-8') as file:
-                plugin_df = AppShieldSourceStage.read_file_to_df(file, cols_exclude)
+        Returns
+        -------
+        typing.Tuple[typing.List[str], typing.List[list]]
+            The column names and values.
 
-        return plugin_df
+        Raises
+        ------
+        JSONDecodeError
+            If not able to decode the json file.
+        """
+        return AppShieldSourceStage._read_json_file(
+            filepath, encoding, partial(AppShieldSourceStage.read_file_to_columns, cols_exclude=cols_exclude))
 
     @staticmethod
     def load_meta_cols(filepath_split: typing.List[str], plugin: str, plugin_df: pd.DataFrame) -> pd.DataFrame:
@@ -286,14 +360,21 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
 
         combined_df = pd.concat(x)
 
-        # Get the sources in this DF
-        unique_sources = combined_df[source].unique()
+        # Codes are assigned in order of first appearance, so a stable sort on them groups the rows of each source while
+        # keeping the sources, and the rows of each source, in their original order
+        (codes, unique_sources) = pd.factorize(combined_df[source])
 
         source_dfs = {}
 
         if len(unique_sources) > 1:
-            for source_name in unique_sources:
-                source_dfs[source_name] = combined_df[combined_df[source] == source_name]
+            sorted_df = combined_df.take(np.argsort(codes, kind="stable"))
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(unique_sources)))))
+
+            # Rows without a source are sorted first
+            offsets += np.count_nonzero(codes < 0)
+
+            for (i, source_name) in enumerate(unique_sources):
+                source_dfs[source_name] = sorted_df.iloc[offsets[i]:offsets[i + 1]]
         else:
             source_dfs[unique_sources[0]] = combined_df
 
@@ -304,7 +385,8 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
                      cols_include: typing.List[str],
                      cols_exclude: typing.List[str],
                      plugins_include: typing.List[str],
-                     encoding: str) -> typing.Dict[str, pd.DataFrame]:
+                     encoding: str,
+                     executor: Executor = None) -> typing.Dict[str, pd.DataFrame]:
         """
         Load plugin files into a dataframe, then segment the dataframe by source.
 
@@ -320,25 +402,43 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
             For each path in `x`, a list of plugins to load additional meta cols from.
         encoding : str
             Encoding to read a file.
+        executor : `concurrent.futures.Executor`, optional
+            When provided, the files are read and parsed concurrently by `executor`, the dataframes are still built in
+            the order of `x`.
 
         Returns
         -------
         typing.Dict[str, pandas.DataFrame]
             Grouped dataframes by source.
         """
+        plugin_files = []
+        for filepath in x:
+            filepath_split = filepath.split('/')
+            plugin = filepath_split[-1].split('_')[0]
+
+            if plugin in plugins_include:
+                plugin_files.append((filepath, filepath_split, plugin))
+
+        if (executor is not None):
+            futures = [
+                executor.submit(AppShieldSourceStage.load_columns, filepath, cols_exclude, encoding)
+                for (filepath, _, _) in plugin_files
+            ]
+
         # Using pandas to parse nested JSON until cuDF adds support
         # https://github.com/rapidsai/cudf/issues/8827
         plugin_dfs = []
-        for filepath in x:
+        for (i, (filepath, filepath_split, plugin)) in enumerate(plugin_files):
             try:
-                filepath_split = filepath.split('/')
-                plugin = filepath_split[-1].split('_')[0]
-
-                if plugin in plugins_include:
+                if (executor is not None):
+                    (columns, values) = futures[i].result()
+                    plugin_df = pd.DataFrame(dict(zip(columns, values)), columns=columns)
+                else:
                     plugin_df = AppShieldSourceStage.load_df(filepath, cols_exclude, encoding)
-                    plugin_df = AppShieldSourceStage.fill_interested_cols(plugin_df, cols_include)
-                    plugin_df = AppShieldSourceStage.load_meta_cols(filepath_split, plugin, plugin_df)
-                    plugin_dfs.append(plugin_df)
+
+                plugin_df = AppShieldSourceStage.fill_interested_cols(plugin_df, cols_include)
+                plugin_df = AppShieldSourceStage.load_meta_cols(filepath_split, plugin, plugin_df)
+                plugin_dfs.append(plugin_df)
 
             except JSONDecodeError as decode_error:
                 logger.error('Unable to decode json file %s: %s', filepath, decode_error)
@@ -364,7 +464,17 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
         # The first source just produces filenames
         return self._watcher.build_node(self.unique_name, builder)
 
+    def _shutdown_executor(self):
+        if (self._executor is not None):
+            self._executor.shutdown()
+            self._executor = None
+
     def _post_build_single(self, builder: mrc.Builder, out_node: mrc.SegmentObject) -> mrc.SegmentObject:
+        if (self._num_workers > 0):
+            # Spawn the workers, forking the pipeline process isn't safe once its threads have started
+            self._executor = ProcessPoolExecutor(max_workers=self._num_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+
         # At this point, we have batches of filenames to process. Make a node for processing batches of
         # filenames into batches of dataframes
         post_node = builder.make_node(
@@ -374,10 +484,12 @@ class AppShieldSourceStage(PreallocatorMixin, SingleOutputSource):
                         cols_include=self._cols_include,
                         cols_exclude=self._cols_exclude,
                         plugins_include=self._plugins_include,
-                        encoding=self._encoding)),
+                        encoding=self._encoding,
+                        executor=self._executor)),
             ops.map(self._build_metadata),
             # Finally flatten to single meta
-            ops.flatten())
+            ops.flatten(),
+            ops.on_completed(self._shutdown_executor))
         builder.make_edge(out_node, post_node)
 
         return super()._post_build_single(builder, post_node)
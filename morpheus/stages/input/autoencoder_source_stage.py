@@ -19,6 +19,7 @@ from abc import abstractmethod
 from functools import partial
 
 import mrc
+import numpy as np
 import pandas as pd
 from mrc.core import operators as ops
 
@@ -160,14 +161,75 @@ class AutoencoderSourceStage(PreallocatorMixin, SingleOutputSource):
 
         return df_array
 
+    @staticmethod
+    def join_columns(df: pd.DataFrame, columns: typing.List[str], sep: str = ", ", na_rep: str = "nan") -> pd.Series:
+        """
+        Concatenates the string values of `columns` in each row, equivalent to joining the values of each row with
+        `sep` but without calling a Python function per row.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataframe containing the columns.
+        columns : typing.List[str]
+            Names of the columns to concatenate, in order.
+        sep : str
+            Separator placed between the values.
+        na_rep : str
+            String used in place of null values.
+
+        Returns
+        -------
+        pd.Series
+            Concatenated values.
+        """
+        if (len(columns) == 0):
+            return pd.Series("", index=df.index, dtype=object)
+
+        values = [df[col].astype(object).where(df[col].notna(), na_rep).astype(str) for col in columns]
+
+        return values[0].str.cat(values[1:], sep=sep).rename(None)
+
+    @staticmethod
+    def running_distinct_count(groups: pd.Series, values: pd.Series) -> pd.Series:
+        """
+        For each row, counts the distinct non-null `values` seen so far in the row's group, in row order.
+
+        This is equivalent to factorizing the values of each group and taking the expanding maximum of the codes, but is
+        computed with a single groupby, rather than a Python function per group.
+
+        Parameters
+        ----------
+        groups : pd.Series
+            Group of each row.
+        values : pd.Series
+            Values to count, with the same index as `groups`.
+
+        Returns
+        -------
+        pd.Series
+            Running count of distinct values, as floats.
+        """
+        # A row is the first of its value in its group when no earlier row in the group has the same value
+        # Group by arrays rather than series, so rows are matched by position even when the index has duplicates
+        group_keys = groups.to_numpy()
+        is_first = (values.groupby([group_keys, values.to_numpy()], sort=False, dropna=False).cumcount() == 0)
+        is_first &= values.notna()
+
+        return is_first.groupby(group_keys, sort=False).cumsum().astype(float)
+
     @staticmethod
     def batch_user_split(x: typing.List[pd.DataFrame],
                          userid_column_name: str,
                          userid_filter: str,
-                         datetime_column_name="event_dt"):
+                         datetime_column_name="event_dt",
+                         copy: bool = True):
         """
         Creates a dataframe for each userid.
 
+        Rows are grouped with a single factorization and stable sort, then each user's rows are sliced from the sorted
+        dataframe, avoiding a scan of every row for each user.
+
         Parameters
         ----------
         x : typing.List[pd.DataFrame]
@@ -178,6 +240,9 @@ class AutoencoderSourceStage(PreallocatorMixin, SingleOutputSource):
             Only rows with the supplied userid are filtered.
         datetime_column_name : str
             Name of the dataframe column used to sort the rows.
+        copy : bool
+            When True each user's dataframe is an independent copy. When False the dataframes are views of a single
+            sorted dataframe, avoiding a second copy of every row, and must not be modified in place.
 
         Returns
         -------
@@ -209,20 +274,38 @@ class AutoencoderSourceStage(PreallocatorMixin, SingleOutputSource):
                 str(combined_df.loc[combined_df.index[-1], datetime_column_name] -
                     combined_df.loc[combined_df.index[0], datetime_column_name]))
 
-        # Get the users in this DF
-        unique_users = combined_df[userid_column_name].unique()
-
         user_dfs = {}
 
-        for user_name in unique_users:
+        if (userid_filter is not None):
+            # Only a single user is needed, a single comparison is cheaper than splitting every user
+            user_mask = (combined_df[userid_column_name] == userid_filter).to_numpy()
+
+            if (user_mask.any()):
+                user_df = combined_df[user_mask]
+                user_dfs[userid_filter] = user_df.copy() if copy else user_df
+
+            return user_dfs
+
+        # Codes are assigned in order of first appearance, so a stable sort on them keeps the users in order of first
+        # appearance and each user's rows in their original order
+        user_ids = combined_df[userid_column_name].to_numpy()
+        (codes, unique_users) = pd.factorize(user_ids, use_na_sentinel=False)
+
+        order = np.argsort(codes, kind="stable")
+        sorted_df = combined_df.take(order)
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(unique_users)))))
 
-            if (userid_filter is not None and user_name != userid_filter):
-                continue
+        # Take the user IDs from the first row of each user, since factorizing replaces None with NaN
+        for (i, user_name) in enumerate(user_ids[order[offsets[:-1]]]):
 
-            # Get just this users data and make a copy to remove link to grouped DF
-            user_df = combined_df[combined_df[userid_column_name] == user_name].copy()
+            if (pd.isna(user_name)):
+                # Null user IDs never compare equal to themselves, so these rows don't belong to any user
+                user_df = combined_df.iloc[0:0]
+            else:
+                user_df = sorted_df.iloc[offsets[i]:offsets[i + 1]]
 
-            user_dfs[user_name] = user_df
+            # `sorted_df` is already independent of the input dataframes, only copy to unlink the users from each other
+            user_dfs[user_name] = user_df.copy() if copy else user_df
 
         return user_dfs
 
@@ -121,17 +121,10 @@ class AzureSourceStage(AutoencoderSourceStage):
         df.sort_values(by=['time'], inplace=True)
 
         overall_location_columns = [col for col in [city_column, state_column, country_column] if col is not None]
-        overall_location_df = df[overall_location_columns].fillna('nan')
-        df['overall_location'] = overall_location_df.apply(lambda x: ', '.join(x), axis=1)
-        df['loc_cat'] = df.groupby('day')['overall_location'].transform(lambda x: pd.factorize(x)[0] + 1)
-        df.fillna({'loc_cat': 1}, inplace=True)
-        df['locincrement'] = df.groupby('day')['loc_cat'].expanding(1).max().droplevel(0)
-        df.drop(['overall_location', 'loc_cat'], inplace=True, axis=1)
-
-        df['app_cat'] = df.groupby('day')[application_column].transform(lambda x: pd.factorize(x)[0] + 1)
-        df.fillna({'app_cat': 1}, inplace=True)
-        df['appincrement'] = df.groupby('day')['app_cat'].expanding(1).max().droplevel(0)
-        df.drop('app_cat', inplace=True, axis=1)
+        overall_location = AutoencoderSourceStage.join_columns(df, overall_location_columns)
+        df['locincrement'] = AutoencoderSourceStage.running_distinct_count(df['day'], overall_location)
+
+        df['appincrement'] = AutoencoderSourceStage.running_distinct_count(df['day'], df[application_column])
 
         df["logcount"] = df.groupby('day').cumcount()
 
@@ -91,6 +91,42 @@ class CloudTrailSourceStage(AutoencoderSourceStage):
 
         return df
 
+    @staticmethod
+    def remove_null(column: pd.Series) -> pd.Series:
+        """
+        Replaces each list of dictionaries in `column` with the first value of its first dictionary, other values are
+        left unchanged.
+
+        Parameters
+        ----------
+        column : pd.Series
+            Column to clean up.
+
+        Returns
+        -------
+        pd.Series
+            Clean column.
+        """
+        if (column.dtype != np.dtype('O')):
+            return column
+
+        is_list = (column.map(type) == list).to_numpy()
+        if (not is_list.any()):
+            return column
+
+        first_items = column[is_list].str.get(0)
+        is_dict_list = (first_items.map(type) == dict).to_numpy()
+        if (not is_dict_list.any()):
+            return column
+
+        first_values = np.empty(is_dict_list.sum(), dtype=object)
+        first_values[:] = [next(iter(item.values()), None) for item in first_items[is_dict_list]]
+
+        values = column.to_numpy(dtype=object, copy=True)
+        values[np.flatnonzero(is_list)[is_dict_list]] = first_values
+
+        return pd.Series(values, index=column.index, name=column.name)
+
     @staticmethod
     def cleanup_df(df: pd.DataFrame, feature_columns: typing.List[str]):
         """
@@ -115,19 +151,11 @@ class CloudTrailSourceStage(AutoencoderSourceStage):
 
         df["event_dt"] = pd.to_datetime(df["eventTime"])
 
-        def remove_null(x):
-
-            if isinstance(x, list):
-                if isinstance(x[0], dict):
-                    key = list(x[0].keys())
-                    return x[0][key[0]]
-            return x
-
         def clean_column(cloudtrail_df):
 
             col_name = 'requestParametersownersSetitems'
             if (col_name in cloudtrail_df):
-                cloudtrail_df[col_name] = cloudtrail_df[col_name].apply(lambda x: remove_null(x))
+                cloudtrail_df[col_name] = CloudTrailSourceStage.remove_null(cloudtrail_df[col_name])
             return cloudtrail_df
 
         # Drop any unneeded columns if specified
@@ -77,6 +77,21 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
         expect each request to be a JSON object per line.
     stop_after : int, default 0
         Stops ingesting after emitting `stop_after` records (rows in the dataframe). Useful for testing. Disabled if `0`
+    coalesce : bool, default False
+        When True, the payloads of multiple requests are combined into a single message, which is emitted once it
+        contains `max_batch_rows` rows or `max_batch_bytes` bytes of payload, or `max_batch_latency` seconds after the
+        first payload in it was received. Only supported by the Python implementation of this stage.
+    max_batch_rows : int, default None
+        Maximum number of rows in a coalesced message. If `None` then `config.pipeline_batch_size` will be used.
+    max_batch_bytes : int, default 0
+        Maximum size in bytes of the payloads in a coalesced message. Disabled if `0`
+    max_batch_latency : float, default 0.1
+        Maximum amount of time in seconds a payload waits to be emitted in a coalesced message.
+    parse_batches : bool, default False
+        When True and `coalesce` is True, requests are queued as raw payloads and parsed once per coalesced message
+        instead of once per request. Requests are only checked for valid JSON when the message is parsed, invalid
+        payloads are logged and dropped. When `lines` is True the number of rows of a payload is estimated by its number
+        of lines, otherwise only `max_batch_bytes` and `max_batch_latency` apply.
     """
 
     def __init__(self,
@@ -93,7 +108,12 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
                  max_payload_size: int = 10,
                  request_timeout_secs: int = 30,
                  lines: bool = False,
-                 stop_after: int = 0):
+                 stop_after: int = 0,
+                 coalesce: bool = False,
+                 max_batch_rows: int = None,
+                 max_batch_bytes: int = 0,
+                 max_batch_latency: float = 0.1,
+                 parse_batches: bool = False):
         super().__init__(config)
         self._bind_address = bind_address
         self._port = port
@@ -108,6 +128,11 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
         self._request_timeout_secs = request_timeout_secs
         self._lines = lines
         self._stop_after = stop_after
+        self._coalesce = coalesce
+        self._max_batch_rows = max_batch_rows or config.pipeline_batch_size
+        self._max_batch_bytes = max_batch_bytes
+        self._max_batch_latency = max_batch_latency
+        self._parse_batches = coalesce and parse_batches
 
         # These are only used when C++ mode is disabled
         self._queue = None
@@ -127,24 +152,43 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
 
     def supports_cpp_node(self) -> bool:
         """Indicates whether this stage supports C++ nodes."""
-        return True
+        # Coalescing is only implemented by the Python node
+        return not self._coalesce
 
     def compute_schema(self, schema: StageSchema):
         schema.output_schema.set_type(MessageMeta)
 
+    def _read_json(self, payload: str) -> cudf.DataFrame:
+        # engine='cudf' is needed when lines=False to avoid using pandas
+        return cudf.read_json(payload, lines=self._lines, engine='cudf')
+
     def _parse_payload(self, payload: str) -> HttpParseResponse:
-        try:
-            # engine='cudf' is needed when lines=False to avoid using pandas
-            df = cudf.read_json(payload, lines=self._lines, engine='cudf')
-        except Exception as e:
-            err_msg = "Error occurred converting HTTP payload to Dataframe"
-            logger.error("%s: %s", err_msg, e)
-            return HttpParseResponse(status_code=HTTPStatus.BAD_REQUEST.value,
-                                     content_type=MimeTypes.TEXT.value,
-                                     body=err_msg)
+        if (self._parse_batches):
+            # Parsing is deferred until the payloads are coalesced, only check that they can be joined
+            if (not self._lines and not self._is_json_array(payload)):
+                err_msg = "HTTP payload must be a JSON array"
+                logger.error(err_msg)
+                return HttpParseResponse(status_code=HTTPStatus.BAD_REQUEST.value,
+                                         content_type=MimeTypes.TEXT.value,
+                                         body=err_msg)
+
+            # JSON lines payloads are normally terminated by a newline, which doesn't start another row
+            num_rows = payload.rstrip("\n").count("\n") + 1 if self._lines else 0
+            item = (payload, num_rows, len(payload))
+        else:
+            try:
+                df = self._read_json(payload)
+            except Exception as e:
+                err_msg = "Error occurred converting HTTP payload to Dataframe"
+                logger.error("%s: %s", err_msg, e)
+                return HttpParseResponse(status_code=HTTPStatus.BAD_REQUEST.value,
+                                         content_type=MimeTypes.TEXT.value,
+                                         body=err_msg)
+
+            item = (df, len(df), len(payload)) if self._coalesce else df
 
         try:
-            self._queue.put(df, block=True, timeout=self._queue_timeout)
+            self._queue.put(item, block=True, timeout=self._queue_timeout)
             return HttpParseResponse(status_code=self._accept_status.value, content_type=MimeTypes.TEXT.value, body="")
 
         except (queue.Full, Closed) as e:
@@ -165,6 +209,108 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
                                      content_type=MimeTypes.TEXT.value,
                                      body=err_msg)
 
+    @staticmethod
+    def _is_json_array(payload: str) -> bool:
+        payload = payload.strip()
+        return payload.startswith("[") and payload.endswith("]")
+
+    def _join_payloads(self, payloads: list[str]) -> str:
+        if (self._lines):
+            return "\n".join(payload.strip("\n") for payload in payloads)
+
+        # Combine the contents of each JSON array into a single array
+        contents = (payload.strip()[1:-1] for payload in payloads)
+        return "[" + ",".join(content for content in contents if content.strip()) + "]"
+
+    def _parse_batch(self, payloads: list[str]) -> cudf.DataFrame | None:
+        """
+        Parse the raw payloads of multiple requests into a single DataFrame. If the combined payloads can't be parsed,
+        each payload is parsed individually and any invalid payloads are dropped.
+        """
+        try:
+            return self._read_json(self._join_payloads(payloads))
+        except Exception as e:
+            logger.error("Error occurred converting %d HTTP payloads to a Dataframe, parsing them individually: %s",
+                         len(payloads),
+                         e)
+
+        dfs = []
+        for payload in payloads:
+            try:
+                dfs.append(self._read_json(payload))
+            except Exception as e:
+                logger.error("Dropping HTTP payload which could not be converted to a Dataframe: %s", e)
+
+        if (len(dfs) == 0):
+            return None
+
+        return cudf.concat(dfs, ignore_index=True)
+
+    def _build_batch(self, items: list) -> cudf.DataFrame | None:
+        if (self._parse_batches):
+            return self._parse_batch(items)
+
+        if (len(items) == 1):
+            return items[0]
+
+        return cudf.concat(items, ignore_index=True)
+
+    def _generate_coalesced_frames(self, http_server) -> typing.Iterator[MessageMeta]:
+        items = []
+        num_rows = 0
+        num_bytes = 0
+        deadline = 0.0
+
+        while self._processing:
+            item = None
+            try:
+                # The queue's timeout has a resolution of one second, poll it instead so the deadline is respected
+                item = self._queue.get(block=False)
+            except queue.Empty:
+                if (not http_server.is_running()):
+                    self._processing = False
+            except Closed:
+                logger.error("Queue closed unexpectedly, shutting down")
+                self._processing = False
+
+            if item is not None:
+                (payload, payload_rows, payload_bytes) = item
+
+                if (len(items) == 0):
+                    deadline = time.monotonic() + self._max_batch_latency
+
+                items.append(payload)
+                num_rows += payload_rows
+                num_bytes += payload_bytes
+
+            if (len(items) == 0):
+                if (item is None and self._processing):
+                    logger.debug("Queue empty, sleeping ...")
+                    time.sleep(self._sleep_time)
+                continue
+
+            # Any payloads received must be emitted before shutting down, since we already responded to the client
+            is_full = (num_rows >= self._max_batch_rows
+                       or (self._max_batch_bytes > 0 and num_bytes >= self._max_batch_bytes))
+
+            if (not is_full and self._processing and time.monotonic() < deadline):
+                if (item is None):
+                    time.sleep(min(self._sleep_time, max(0.0, deadline - time.monotonic())))
+                continue
+
+            df = self._build_batch(items)
+            items = []
+            num_rows = 0
+            num_bytes = 0
+
+            if (df is not None and len(df) > 0):
+                num_records = len(df)
+                yield MessageMeta(df)
+                self._records_emitted += num_records
+
+                if self._stop_after > 0 and self._records_emitted >= self._stop_after:
+                    self._processing = False
+
     def _generate_frames(self) -> typing.Iterator[MessageMeta]:
         from morpheus.common import FiberQueue
         from morpheus.common import HttpServer
@@ -180,6 +326,10 @@ class HttpServerSourceStage(PreallocatorMixin, SingleOutputSource):
                          request_timeout=self._request_timeout_secs) as http_server):
 
             self._processing = True
+
+            if (self._coalesce):
+                yield from self._generate_coalesced_frames(http_server)
+
             while self._processing:
                 # Read as many messages as we can from the queue if it's empty check to see if we should be shutting
                 # down. It is important that any messages we received that are in the queue are processed before we
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import glob
 import importlib
 import logging
@@ -28,6 +29,7 @@ from morpheus.config import Config
 from morpheus.config import PipelineModes
 from morpheus.messages.message_meta import UserMessageMeta
 from morpheus.messages.multi_ae_message import MultiAEMessage
+from morpheus.models.dfencoder import AETrainingExecutor
 from morpheus.models.dfencoder import AutoEncoder
 from morpheus.pipeline.multi_message_stage import MultiMessageStage
 from morpheus.pipeline.stage_schema import StageSchema
@@ -36,6 +38,26 @@ from morpheus.utils.seed import manual_seed
 logger = logging.getLogger(__name__)
 
 
+def _get_model_kwargs(feature_scaler: str) -> dict:
+    """
+    Keyword arguments passed to the `AutoEncoder` constructor of each user model.
+    """
+    return {
+        "encoder_layers": [512, 500],  # layers of the encoding part
+        "decoder_layers": [512],  # layers of the decoding part
+        "activation": 'relu',  # activation function
+        "swap_probability": 0.2,  # noise parameter
+        "learning_rate": 0.01,  # learning rate
+        "learning_rate_decay": .99,  # learning decay
+        "batch_size": 512,
+        "verbose": False,
+        "optimizer": 'sgd',  # SGD optimizer is selected(Stochastic gradient descent)
+        "scaler": feature_scaler,  # feature scaling method
+        "min_cats": 1,  # cut off for minority categories
+        "progress_bar": False
+    }
+
+
 class _UserModelManager:
 
     def __init__(self,
@@ -44,7 +66,10 @@ class _UserModelManager:
                  save_model: bool,
                  epochs: int,
                  max_history: int,
-                 seed: int = None) -> None:
+                 seed: int = None,
+                 incremental: bool = False,
+                 replay_ratio: float = 1.0,
+                 drift_threshold: float = 0.1) -> None:
         super().__init__()
 
         self._user_id = user_id
@@ -60,10 +85,28 @@ class _UserModelManager:
         self._train_scores_mean = None
         self._train_scores_std = None
 
+        # Incremental training state. The last model is kept even when `save_model` is False so it can be fine-tuned,
+        # and the numeric ranges of the data it was built on are used to detect drift.
+        self._incremental = incremental
+        self._replay_ratio = replay_ratio
+        self._drift_threshold = drift_threshold
+        self._warm_model: AutoEncoder = None
+        self._numeric_ranges: typing.Dict[str, typing.Tuple[float, float]] = {}
+        self._num_rebuilds = 0
+        self._num_fine_tunes = 0
+
     @property
     def model(self):
         return self._model
 
+    @property
+    def num_rebuilds(self) -> int:
+        return self._num_rebuilds
+
+    @property
+    def num_fine_tunes(self) -> int:
+        return self._num_fine_tunes
+
     @property
     def train_scores_mean(self):
         return self._train_scores_mean
@@ -72,7 +115,10 @@ class _UserModelManager:
     def train_scores_std(self):
         return self._train_scores_std
 
-    def train(self, df: pd.DataFrame) -> AutoEncoder:
+    def update_history(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append `df` to the history of the user, returning the data to train the next model on.
+        """
 
         # Determine how much history to save
         if (self._history is not None):
@@ -84,40 +130,108 @@ class _UserModelManager:
         else:
             train_df = df
 
+        # Save the history for next time
+        self._history = train_df.iloc[max(0, len(train_df) - self._max_history):, :]
+
+        return train_df
+
+    def set_model(self, model: AutoEncoder, scores_mean: float, scores_std: float):
+        """
+        Store a model trained on the data returned by `update_history`, if this manager saves its models.
+        """
+        if (self._save_model):
+            self._model = model
+            self._train_scores_mean = scores_mean
+            self._train_scores_std = scores_std
+
+    def _get_drift_reason(self, df: pd.DataFrame) -> typing.Optional[str]:
+        """
+        Returns why the features of `df` have drifted too far from the data the warm model was built on to fine-tune
+        it, or None if the model can be fine-tuned.
+        """
+        model = self._warm_model
+
+        feature_names = set(model.numeric_fts) | set(model.binary_fts) | set(model.categorical_fts)
+        if (feature_names != set(df.columns)):
+            return "the columns changed"
+
+        for (ft, feature) in model.categorical_fts.items():
+            values = df[ft]
+            unseen_fraction = (values.notna() & ~values.isin(feature['cats'])).mean()
+            if (unseen_fraction > self._drift_threshold):
+                return f"{unseen_fraction:.1%} of '{ft}' values are new categories"
+
+        for (ft, (min_value, max_value)) in self._numeric_ranges.items():
+            values = df[ft]
+            out_of_range_fraction = ((values < min_value) | (values > max_value)).mean()
+            if (out_of_range_fraction > self._drift_threshold):
+                return f"{out_of_range_fraction:.1%} of '{ft}' values are outside [{min_value}, {max_value}]"
+
+        return None
+
+    def _get_fine_tune_df(self, df: pd.DataFrame, history: typing.Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Returns the new rows plus a random sample of the previous history, replayed so the model doesn't forget it.
+        """
+        if (history is None or len(history) == 0):
+            return df
+
+        num_replay = min(len(history), int(len(df) * self._replay_ratio))
+        if (num_replay == 0):
+            return df
+
+        return pd.concat([history.sample(n=num_replay, random_state=self._seed), df])
+
+    def train(self, df: pd.DataFrame) -> AutoEncoder:
+
+        previous_history = self._history
+        train_df = self.update_history(df)
+
         # If the seed is set, enforce that here
         if (self._seed is not None):
             manual_seed(self._seed)
 
-        model = AutoEncoder(
-            encoder_layers=[512, 500],  # layers of the encoding part
-            decoder_layers=[512],  # layers of the decoding part
-            activation='relu',  # activation function
-            swap_probability=0.2,  # noise parameter
-            learning_rate=0.01,  # learning rate
-            learning_rate_decay=.99,  # learning decay
-            batch_size=512,
-            # logger='ipynb',
-            verbose=False,
-            optimizer='sgd',  # SGD optimizer is selected(Stochastic gradient descent)
-            scaler=self._feature_scaler,  # feature scaling method
-            min_cats=1,  # cut off for minority categories
-            progress_bar=False)
-
-        logger.debug("Training AE model for user: '%s'...", self._user_id)
-        model.fit(train_df, epochs=self._epochs)
+        drift_reason = None
+        if (self._incremental and self._warm_model is not None):
+            drift_reason = self._get_drift_reason(df)
+
+        if (self._incremental and self._warm_model is not None and drift_reason is None):
+            # Copy the warm model since it may still be in use by messages sent downstream
+            model = copy.deepcopy(self._warm_model)
+            fit_df = self._get_fine_tune_df(df, previous_history)
+            self._num_fine_tunes += 1
+
+            logger.debug("Fine-tuning AE model for user: '%s' on %d rows...", self._user_id, len(fit_df))
+        else:
+            if (drift_reason is not None):
+                logger.debug("Rebuilding AE model for user: '%s', %s", self._user_id, drift_reason)
+
+            model = AutoEncoder(**_get_model_kwargs(self._feature_scaler))
+            fit_df = train_df
+            self._num_rebuilds += 1
+
+            numeric_df = train_df.select_dtypes(include=[int, float])
+            self._numeric_ranges = {ft: (numeric_df[ft].min(), numeric_df[ft].max()) for ft in numeric_df.columns}
+
+            logger.debug("Training AE model for user: '%s'...", self._user_id)
+
+        model.fit(fit_df, epochs=self._epochs)
+
+        if (fit_df is not train_df):
+            # `fit` computed the feature loss stats from the fine-tuning rows only, compute them from the same rows as
+            # the score stats so inference scales both consistently
+            model.update_loss_stats(train_df)
+
         train_loss_scores = model.get_anomaly_score(train_df)
         scores_mean = train_loss_scores.mean()
         scores_std = train_loss_scores.std()
 
         logger.debug("Training AE model for user: '%s'... Complete.", self._user_id)
 
-        if (self._save_model):
-            self._model = model
-            self._train_scores_mean = scores_mean
-            self._train_scores_std = scores_std
+        if (self._incremental):
+            self._warm_model = model
 
-        # Save the history for next time
-        self._history = train_df.iloc[max(0, len(train_df) - self._max_history):, :]
+        self.set_model(model, scores_mean, scores_std)
 
         return model, scores_mean, scores_std
 
@@ -156,6 +270,21 @@ class TrainAEStage(MultiMessageStage):
         If true the list of files matching `input_glob` will be processed in sorted order.
     models_output_filename : pathlib.Path, default = None, writable = True
         The location to write trained models to.
+    num_train_workers : int, default = 0, min = 0
+        Number of worker processes used to train the user models from `train_data_glob` concurrently. When 0 the models
+        are trained one at a time in the pipeline thread.
+    train_threads_per_worker : int, default = None
+        Number of threads used by PyTorch in each training worker, by default the number of CPUs divided by
+        `num_train_workers`.
+    train_incremental : bool, default = False, is_flag = True
+        When training on incoming data, fine-tune the previous model of each user on the new rows plus a sample of the
+        user's history instead of training a new model on the full history. A new model is built when the new rows have
+        drifted from the data the previous model was built on.
+    train_replay_ratio : float, default = 1.0, min = 0
+        Number of history rows replayed when fine-tuning, as a multiple of the number of new rows.
+    train_drift_threshold : float, default = 0.1, min = 0, max = 1
+        Fraction of new rows with unseen categories, or numeric values outside the range the model was built on, in any
+        feature above which a new model is built instead of fine-tuning the previous one.
     """
 
     def __init__(self,
@@ -168,7 +297,12 @@ class TrainAEStage(MultiMessageStage):
                  train_max_history: int = 1000,
                  seed: int = None,
                  sort_glob: bool = False,
-                 models_output_filename: pathlib.Path = None):
+                 models_output_filename: pathlib.Path = None,
+                 num_train_workers: int = 0,
+                 train_threads_per_worker: int = None,
+                 train_incremental: bool = False,
+                 train_replay_ratio: float = 1.0,
+                 train_drift_threshold: float = 0.1):
         super().__init__(c)
 
         self._config = c
@@ -183,6 +317,11 @@ class TrainAEStage(MultiMessageStage):
         self._seed = seed
         self._sort_glob = sort_glob
         self._models_output_filename = models_output_filename
+        self._num_train_workers = num_train_workers
+        self._train_threads_per_worker = train_threads_per_worker
+        self._train_incremental = train_incremental
+        self._train_replay_ratio = train_replay_ratio
+        self._train_drift_threshold = train_drift_threshold
 
         self._source_stage_class = source_stage_class
         if self._source_stage_class is not None:
@@ -242,10 +381,65 @@ class TrainAEStage(MultiMessageStage):
                                                              False,
                                                              self._train_epochs,
                                                              self._train_max_history,
-                                                             self._seed)
+                                                             self._seed,
+                                                             incremental=self._train_incremental,
+                                                             replay_ratio=self._train_replay_ratio,
+                                                             drift_threshold=self._train_drift_threshold)
 
         return self._user_models[x.user_id].train(x.df)
 
+    def _create_user_model(self, user_id: str) -> _UserModelManager:
+        self._user_models[user_id] = _UserModelManager(self._config,
+                                                       user_id,
+                                                       True,
+                                                       self._train_epochs,
+                                                       self._train_max_history,
+                                                       self._seed)
+
+        return self._user_models[user_id]
+
+    def _iter_train_dfs(self, user_to_df: typing.Dict[str, pd.DataFrame]):
+        """
+        Yields the training data of the generic model, if used, and of each user with enough history.
+        """
+        if self._use_generic_model:
+            all_users_df = pd.concat(user_to_df.values(), ignore_index=True)
+            all_users_df = self._source_stage_class.derive_features(all_users_df, self._feature_columns)
+            all_users_df = all_users_df.fillna("nan")
+            yield "generic", all_users_df
+
+        for user_id, df in user_to_df.items():
+            if len(df.index) >= self._train_min_history:
+                # Derive features here
+                df = self._source_stage_class.derive_features(df, self._feature_columns)
+                df = df.fillna("nan")
+                yield user_id, df
+
+    def _train_users(self, user_to_df: typing.Dict[str, pd.DataFrame]):
+        for user_id, df in self._iter_train_dfs(user_to_df):
+            self._create_user_model(user_id).train(df)
+
+    def _train_users_parallel(self, user_to_df: typing.Dict[str, pd.DataFrame]):
+
+        def jobs():
+            for user_id, df in self._iter_train_dfs(user_to_df):
+                yield user_id, self._create_user_model(user_id).update_history(df)
+
+        with AETrainingExecutor(num_workers=self._num_train_workers,
+                                threads_per_worker=self._train_threads_per_worker) as executor:
+
+            logger.info("Training user models with %d workers, %d threads per worker",
+                        executor.num_workers,
+                        executor.threads_per_worker)
+
+            for result in executor.map(jobs(),
+                                       model_kwargs=_get_model_kwargs(self._config.ae.feature_scaler),
+                                       fit_kwargs={"epochs": self._train_epochs},
+                                       seed=self._seed):
+                self._user_models[result.user_id].set_model(result.load_model(),
+                                                            result.train_scores_mean,
+                                                            result.train_scores_std)
+
     def _build_single(self, builder: mrc.Builder, input_node: mrc.SegmentObject) -> mrc.SegmentObject:
         get_model_fn = None
 
@@ -274,33 +468,10 @@ class TrainAEStage(MultiMessageStage):
                                                                         self._feature_columns,
                                                                         self._config.ae.userid_filter)
 
-            if self._use_generic_model:
-                self._user_models["generic"] = _UserModelManager(self._config,
-                                                                 "generic",
-                                                                 True,
-                                                                 self._train_epochs,
-                                                                 self._train_max_history,
-                                                                 self._seed)
-
-                all_users_df = pd.concat(user_to_df.values(), ignore_index=True)
-                all_users_df = self._source_stage_class.derive_features(all_users_df, self._feature_columns)
-                all_users_df = all_users_df.fillna("nan")
-                self._user_models["generic"].train(all_users_df)
-
-            for user_id, df in user_to_df.items():
-                if len(df.index) >= self._train_min_history:
-                    self._user_models[user_id] = _UserModelManager(self._config,
-                                                                   user_id,
-                                                                   True,
-                                                                   self._train_epochs,
-                                                                   self._train_max_history,
-                                                                   self._seed)
-
-                    # Derive features here
-                    # print(df)
-                    df = self._source_stage_class.derive_features(df, self._feature_columns)
-                    df = df.fillna("nan")
-                    self._user_models[user_id].train(df)
+            if (self._num_train_workers > 0):
+                self._train_users_parallel(user_to_df)
+            else:
+                self._train_users(user_to_df)
 
             # Save trained user models
             if self._models_output_filename is not None:
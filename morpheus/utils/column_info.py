@@ -26,6 +26,7 @@ with warnings.catch_warnings():
     warnings.filterwarnings("ignore", message=".*No module named 'tensorflow'", category=UserWarning)
     import nvtabular as nvt
 
+import numpy as np
 import pandas as pd
 
 import cudf
@@ -58,11 +59,118 @@ def process_dataframe(df_in: typing.Union[pd.DataFrame, cudf.DataFrame], input_s
     return schema_transforms.process_dataframe(df_in, input_schema)
 
 
+@dataclasses.dataclass
+class DistinctIncrementState:
+    """
+    State carried across batches by `create_increment_col`, allowing the distinct counts for a group to continue from
+    where the previous batch left off rather than recomputing the entire history.
+
+    Attributes
+    ----------
+    seen_values : dict
+        Mapping of `(period, group)` to the set of values already counted for that group.
+    """
+    seen_values: dict[tuple, set] = dataclasses.field(default_factory=dict)
+
+    def prune(self, before: pd.Period):
+        """
+        Remove the state for all periods prior to `before`, which can no longer be updated.
+
+        Parameters
+        ----------
+        before : pandas.Period
+            The earliest period to keep.
+        """
+        self.seen_values = {key: values for (key, values) in self.seen_values.items() if key[0] >= before}
+
+
+def _group_codes(*keys: pd.Series) -> np.ndarray:
+    """
+    Combine one or more key columns into a single array of integer group codes. Null values are treated as their own
+    group.
+    """
+    group_codes = np.zeros(len(keys[0]), dtype=np.int64)
+
+    for key in keys:
+        (codes, uniques) = pd.factorize(key)
+        group_codes = group_codes * (len(uniques) + 1) + (codes + 1)
+
+    return group_codes
+
+
+def _distinct_increment(values: pd.Series,
+                        groupby: pd.Series,
+                        per_period: pd.Series,
+                        state: DistinctIncrementState = None) -> np.ndarray:
+    """
+    Vectorized implementation of the running count of distinct `values` within each `(per_period, groupby)` group, in
+    row order.
+    """
+    num_rows = len(values)
+
+    if (num_rows == 0):
+        return np.zeros(0, dtype=np.int64)
+
+    values = values.fillna("nan")
+
+    group = _group_codes(per_period, groupby)
+    value_codes = pd.factorize(values)[0]
+
+    # Rows where a value is seen for the first time within its group
+    is_first = ~pd.DataFrame({"group": group, "value": value_codes}).duplicated().to_numpy()
+
+    prior_counts = None
+
+    if (state is not None):
+        first_idx = np.flatnonzero(is_first)
+        group_keys = list(zip(per_period.iloc[first_idx], groupby.iloc[first_idx]))
+        first_values = values.iloc[first_idx].tolist()
+
+        prior_counts = {}
+        for (i, key, value) in zip(first_idx, group_keys, first_values):
+            seen = state.seen_values.setdefault(key, set())
+
+            if (key not in prior_counts):
+                prior_counts[key] = len(seen)
+
+            if (value in seen):
+                is_first[i] = False
+            else:
+                seen.add(value)
+
+    # Sort once by group, keeping the row order within each group
+    order = np.argsort(group, kind="stable")
+    sorted_group = group[order]
+    sorted_first = is_first[order].astype(np.int64)
+
+    counts = np.cumsum(sorted_first)
+
+    # Subtract the running total at the start of each group
+    group_start = np.empty(num_rows, dtype=bool)
+    group_start[0] = True
+    np.not_equal(sorted_group[1:], sorted_group[:-1], out=group_start[1:])
+
+    start_idx = np.flatnonzero(group_start)
+    offsets = counts[start_idx] - sorted_first[start_idx]
+    counts -= np.repeat(offsets, np.diff(np.append(start_idx, num_rows)))
+
+    if (prior_counts is not None):
+        start_rows = order[start_idx]
+        start_keys = zip(per_period.iloc[start_rows], groupby.iloc[start_rows])
+        counts += np.repeat([prior_counts.get(key, 0) for key in start_keys], np.diff(np.append(start_idx, num_rows)))
+
+    result = np.empty(num_rows, dtype=np.int64)
+    result[order] = counts
+
+    return result
+
+
 def create_increment_col(df: pd.DataFrame,
                          column_name: str,
                          groupby_column: str = "username",
                          timestamp_column: str = "timestamp",
-                         period: str = "D") -> pd.Series:
+                         period: str = "D",
+                         state: DistinctIncrementState = None) -> pd.Series:
     """
     Create a new integer column counting unique occurrences of values in `column_name` grouped per-day using the
     timestamp values in `timestamp_column` and then grouping by `groupby_column` returning incrementing values starting
@@ -80,6 +188,9 @@ def create_increment_col(df: pd.DataFrame,
         The column containing timestamp values.
     period: str, default "D"
         The period to group by.
+    state : DistinctIncrementState, optional
+        When provided, counts continue from the values seen in previous calls using the same state object, and the
+        state is updated with the values in `df`. Batches must be provided in order.
 
     Returns
     -------
@@ -96,14 +207,9 @@ def create_increment_col(df: pd.DataFrame,
 
     per_day = time_col.dt.to_period(period)
 
-    cat_col: pd.Series = df.groupby([per_day, groupby_column
-                                     ])[column_name].transform(lambda x: pd.factorize(x.fillna("nan"))[0] + 1)
-
-    increment_col = pd.concat([cat_col, df[groupby_column]],
-                              axis=1).groupby([per_day, groupby_column
-                                               ])[column_name].expanding(1).max().droplevel(0).droplevel(0)
+    increment_col = _distinct_increment(df[column_name], df[groupby_column], per_day, state=state)
 
-    return increment_col.astype("int")
+    return pd.Series(increment_col, index=df.index, name=column_name).astype("int")
 
 
 def column_listjoin(df: pd.DataFrame, col_name: str) -> pd.Series:
@@ -584,14 +690,9 @@ class DistinctIncrementColumn(RenameColumn):
 
         per_period = df[self.timestamp_column].dt.to_period(self.period)
 
-        cat_col: pd.Series = df.groupby([per_period, self.groupby_column
-                                         ])[self.input_name].transform(lambda x: pd.factorize(x.fillna("nan"))[0] + 1)
+        increment_col = _distinct_increment(df[self.input_name], df[self.groupby_column], per_period)
 
-        increment_col = pd.concat([cat_col, df[self.groupby_column]],
-                                  axis=1).groupby([per_period, self.groupby_column
-                                                   ])[self.input_name].expanding(1).max().droplevel(0).droplevel(0)
-
-        return increment_col.astype(self.get_pandas_dtype())
+        return pd.Series(increment_col, index=df.index, name=self.input_name).astype(self.get_pandas_dtype())
 
 
 @dataclasses.dataclass
@@ -610,6 +711,73 @@ class PreparedDFInfo:
     columns_to_preserve: typing.List[str]
 
 
+def _parse_json_column(series: pd.Series) -> list:
+    """
+    Parse a column of JSON strings (or already parsed `dict` values) into a list of Python objects.
+    """
+    values = series.tolist()
+
+    if (all(isinstance(x, str) for x in values)):
+        # Parsing the entire column as a single JSON array is significantly faster than parsing each row individually
+        try:
+            parsed = json.loads(f"[{','.join(values)}]")
+
+            if (len(parsed) == len(values)):
+                return parsed
+        except json.JSONDecodeError:
+            # Fallback to parsing each row individually to report the offending row
+            pass
+
+    return [x if (isinstance(x, dict) or x is None) else json.loads(x) for x in values]
+
+
+def _get_json_path_value(value: typing.Any, path: list[str]) -> typing.Any:
+    """
+    Returns the value at `path` in `value`, raising `KeyError` if it doesn't exist. Like `pd.json_normalize`, keys
+    containing a literal dot are matched: when a component isn't found the remaining components joined with a dot are
+    tried as a single key, longest first.
+    """
+    if (len(path) == 0):
+        return value
+
+    if (not isinstance(value, dict)):
+        raise KeyError(path[0])
+
+    for num_parts in [1, *range(len(path), 1, -1)]:
+        key = '.'.join(path[:num_parts])
+
+        if (key in value):
+            try:
+                return _get_json_path_value(value[key], path[num_parts:])
+            except KeyError:
+                continue
+
+    raise KeyError(path[0])
+
+
+def _extract_json_path(records: list, path: list[str]) -> typing.Optional[list]:
+    """
+    Extract the value at `path` from each of the `records`, mirroring the behavior of `pd.json_normalize`. Records
+    where the path does not exist, or where the value is itself a `dict` (which `pd.json_normalize` would flatten
+    further), result in `nan`. Returns `None` if the path doesn't exist in any of the records.
+    """
+    values = [np.nan] * len(records)
+    found = False
+
+    for (i, value) in enumerate(records):
+        try:
+            value = _get_json_path_value(value, path)
+        except KeyError:
+            # Path doesn't exist in this record
+            continue
+
+        if (not isinstance(value, dict)):
+            values[i] = value
+            found = True
+
+    return values if found else None
+
+
 def _json_flatten(df_input: typing.Union[pd.DataFrame, cudf.DataFrame],
                   input_columns: dict[str, str],
                   json_cols: list[str],
@@ -618,6 +786,9 @@ def _json_flatten(df_input: typing.Union[pd.DataFrame, cudf.DataFrame],
     Prepares a DataFrame for processing by flattening JSON columns and converting to Pandas if necessary. Will remove
     all columns that are not specified in `input_columns` or matched by `preserve_re`.
 
+    Only the JSON paths referenced by `input_columns` are extracted, for example the input column
+    `properties.location.city` is extracted from the `location.city` path of the `properties` JSON column.
+
     Parameters
     ----------
     df_input : typing.Union[pd.DataFrame, cudf.DataFrame]
@@ -644,39 +815,42 @@ def _json_flatten(df_input: typing.Union[pd.DataFrame, cudf.DataFrame],
     if (json_cols is None or len(json_cols) == 0):
         return PreparedDFInfo(df=df_input, columns_to_preserve=list(columns_to_preserve))
 
+    present_json_cols = [col for col in json_cols if col in df_input.columns]
+
     # Check if we even have any JSON columns to flatten
-    if (not df_input.columns.intersection(json_cols).empty):
+    if (len(present_json_cols) > 0):
         convert_to_cudf = False
 
+        # Only the JSON columns, and the input columns which will be kept, are needed
+        columns_needed = [col for col in df_input.columns if col in input_columns or col in present_json_cols]
+
         if (isinstance(df_input, cudf.DataFrame)):
             convert_to_cudf = True
-            df_input = df_input.to_pandas()
+            df_input = df_input[columns_needed].to_pandas()
 
-        json_normalized = []
-        columns_to_keep = list(df_input.columns)
-        for col in json_cols:
-            if (col not in columns_to_keep):
-                continue
-
-            pd_series = df_input[col]
+        # JSON columns are removed unless they are explicitly preserved
+        output_columns = {
+            col: df_input[col]
+            for col in columns_needed
+            if col not in present_json_cols or (preserve_re is not None and preserve_re.match(col))
+        }
 
-            # Get the flattened columns
-            pd_series = pd_series.apply(lambda x: x if isinstance(x, dict) else json.loads(x))
-            pdf_norm = pd.json_normalize(pd_series)
+        for col in present_json_cols:
+            prefix = col + "."
+            paths = {name: name[len(prefix):].split('.') for name in input_columns if name.startswith(prefix)}
 
-            # Prefix column names with the JSON column name
-            pdf_norm.rename(columns=lambda x, col=col: col + "." + x, inplace=True)
+            if (len(paths) == 0):
+                continue
 
-            # Reset the index otherwise there is a conflict
-            pdf_norm.set_index(df_input.index, inplace=True)
+            records = _parse_json_column(df_input[col])
 
-            json_normalized.append(pdf_norm)
+            for (name, path) in paths.items():
+                values = _extract_json_path(records, path)
 
-            if (preserve_re is None or not preserve_re.match(col)):
-                columns_to_keep.remove(col)
+                if (values is not None):
+                    output_columns[name] = pd.Series(values, index=df_input.index)
 
-        # Combine the original DataFrame with the normalized JSON columns
-        df_input = pd.concat([df_input[columns_to_keep]] + json_normalized, axis=1)
+        df_input = pd.DataFrame(output_columns, index=df_input.index)
 
         if (convert_to_cudf):
             df_input = cudf.from_pandas(df_input).reset_index(drop=True)
@@ -16,12 +16,16 @@ Downloader utility class for fetching files, potentially from a remote file serv
 by the `DownloadMethods` enum.
 """
 
+import concurrent.futures
+import dataclasses
 import logging
 import multiprocessing as mp
 import os
 import threading
+import time
 import typing
 import warnings
+from collections import deque
 from enum import Enum
 
 import fsspec
@@ -36,20 +40,40 @@ class DownloadMethods(str, Enum):
     SINGLE_THREAD = "single_thread"
     DASK = "dask"
     DASK_THREAD = "dask_thread"
+    THREADS = "threads"
+    PROCESSES = "processes"
 
 
 DOWNLOAD_METHODS_MAP = {dl.value: dl for dl in DownloadMethods}
 
 
+@dataclasses.dataclass
+class DownloadTiming:
+    """Time taken to download and parse a single file."""
+    path: str
+    duration_ms: float
+
+
+def _timed_download(download_fn: typing.Callable[[fsspec.core.OpenFile], pd.DataFrame],
+                    open_file: fsspec.core.OpenFile) -> typing.Tuple[pd.DataFrame, float]:
+    # Module level function to allow use with a process pool
+    start_time = time.perf_counter()
+    result = download_fn(open_file)
+
+    return (result, (time.perf_counter() - start_time) * 1000.0)
+
+
 class Downloader:
     """
     Downloads a list of `fsspec.core.OpenFiles` files using one of the following methods:
-        single_thread, dask or dask_thread
+        single_thread, dask, dask_thread, threads or processes
 
     The download method can be passed in via the `download_method` parameter or via the `MORPHEUS_FILE_DOWNLOAD_TYPE`
     environment variable. If both are set, the environment variable takes precedence, by default `dask_thread` is used.
 
-    When using single_thread, `dask` and `dask.distributed` is not reuiqrred to be installed.
+    When using single_thread, threads or processes, `dask` and `dask.distributed` is not reuiqrred to be installed. The
+    threads and processes methods use a `concurrent.futures` thread or process pool respectively. When using processes,
+    `download_fn` and its results must be picklable.
 
     Parameters
     ----------
@@ -58,6 +82,14 @@ class Downloader:
         presedence.
     dask_heartbeat_interval : str, optional, default = "30s"
         The heartbeat interval to use when using dask or dask_thread.
+    max_workers : int, optional
+        Number of workers to use with the threads or processes methods, defaults to the number of CPUs.
+    max_in_flight : int, optional
+        Maximum number of files being downloaded, or downloaded but not yet consumed, at any time when using the threads
+        or processes methods. This bounds the memory used by `iter_download`. Defaults to twice `max_workers`.
+    ordered : bool, optional, default = True
+        When `True` results are returned in the same order as `download_buckets`, otherwise results are returned in the
+        order they complete. Only applies to the threads and processes methods.
     """
 
     # This cluster is shared by all Downloader instances that use dask download method.
@@ -67,18 +99,32 @@ class Downloader:
 
     def __init__(self,
                  download_method: typing.Union[DownloadMethods, str] = DownloadMethods.DASK_THREAD,
-                 dask_heartbeat_interval: str = "30s"):
+                 dask_heartbeat_interval: str = "30s",
+                 max_workers: int = None,
+                 max_in_flight: int = None,
+                 ordered: bool = True):
 
         self._merlin_distributed = None
         self._dask_heartbeat_interval = dask_heartbeat_interval
 
+        self._max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._max_in_flight = max_in_flight if max_in_flight is not None else 2 * self._max_workers
+        self._ordered = ordered
+
+        if (self._max_workers < 1 or self._max_in_flight < 1):
+            raise ValueError("max_workers and max_in_flight must be greater than 0")
+
+        self._executor: concurrent.futures.Executor = None
+        self._executor_lock = threading.Lock()
+        self._last_download_timings: typing.List[DownloadTiming] = []
+
         download_method = os.environ.get("MORPHEUS_FILE_DOWNLOAD_TYPE", download_method)
 
         if isinstance(download_method, str):
             if (download_method in ("multiprocess", "multiprocessing")):
                 raise ValueError(
-                    f"The '{download_method}' download method is no longer supported. Please use 'dask' or "
-                    "'single_thread' instead.")
+                    f"The '{download_method}' download method is no longer supported. Please use 'processes', 'dask' "
+                    "or 'single_thread' instead.")
             try:
                 download_method = DOWNLOAD_METHODS_MAP[download_method.lower()]
             except KeyError as exc:
@@ -93,6 +139,34 @@ class Downloader:
         """Return the download method."""
         return self._download_method
 
+    @property
+    def last_download_timings(self) -> typing.List[DownloadTiming]:
+        """
+        Per-file timings for the most recent call to `download` or `iter_download`. Not recorded for the dask methods.
+        """
+        return self._last_download_timings
+
+    def get_executor(self) -> concurrent.futures.Executor:
+        """
+        Get the thread or process pool used by the threads and processes methods. The pool is created on first use and
+        is reused by subsequent downloads until `close` is called.
+
+        Returns
+        -------
+        concurrent.futures.Executor
+        """
+        with self._executor_lock:
+            if (self._executor is None):
+                if (self._download_method == DownloadMethods.PROCESSES):
+                    # Avoid forking a process which may have already initialized CUDA
+                    self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self._max_workers,
+                                                                            mp_context=mp.get_context("spawn"))
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers,
+                                                                           thread_name_prefix="downloader")
+
+            return self._executor
+
     def get_dask_cluster(self):
         """
         Get the dask cluster used by this downloader. If the cluster does not exist, it is created.
@@ -143,8 +217,102 @@ class Downloader:
         return self._merlin_distributed
 
     def close(self):
-        """Cluster management is handled by Merlin.Distributed"""
-        pass
+        """
+        Shutdown the thread or process pool if one was created. Cluster management is handled by Merlin.Distributed
+        """
+        with self._executor_lock:
+            if (self._executor is not None):
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _iter_executor_download(
+            self,
+            download_buckets: fsspec.core.OpenFiles,
+            download_fn: typing.Callable[[fsspec.core.OpenFile], pd.DataFrame]) -> typing.Iterator[pd.DataFrame]:
+        executor = self.get_executor()
+        buckets = iter(download_buckets)
+        pending: typing.Deque[concurrent.futures.Future] = deque()
+        paths: typing.Dict[concurrent.futures.Future, str] = {}
+
+        def submit_next() -> bool:
+            open_file = next(buckets, None)
+            if (open_file is None):
+                return False
+
+            future = executor.submit(_timed_download, download_fn, open_file)
+            pending.append(future)
+            paths[future] = getattr(open_file, "path", str(open_file))
+            return True
+
+        def get_result(future: concurrent.futures.Future) -> pd.DataFrame:
+            (result, duration_ms) = future.result()
+            self._last_download_timings.append(DownloadTiming(path=paths.pop(future), duration_ms=duration_ms))
+            return result
+
+        try:
+            while (len(pending) < self._max_in_flight and submit_next()):
+                pass
+
+            while (len(pending) > 0):
+                if (self._ordered):
+                    future = pending.popleft()
+                else:
+                    (done, _) = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+
+                result = get_result(future)
+
+                # Only submit more work once a result has been consumed, bounding the number of results held in memory
+                submit_next()
+
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def iter_download(
+            self,
+            download_buckets: fsspec.core.OpenFiles,
+            download_fn: typing.Callable[[fsspec.core.OpenFile], pd.DataFrame]) -> typing.Iterator[pd.DataFrame]:
+        """
+        Generator version of `download`, yielding each result as it becomes available. When using the threads or
+        processes methods, at most `max_in_flight` files are downloaded ahead of the consumer.
+
+        Parameters
+        ----------
+        download_buckets : typing.Iterable[fsspec.core.OpenFiles]
+            Files to download
+        download_fn : typing.Callable[[fsspec.core.OpenFiles], pd.DataFrame]
+            Function used to download an individual file and return the contents as a pandas DataFrame
+
+        Returns
+        -------
+        typing.Iterator[pd.DataFrame]
+        """
+        self._last_download_timings = []
+
+        if (self._download_method in (DownloadMethods.THREADS, DownloadMethods.PROCESSES)):
+            yield from self._iter_executor_download(download_buckets, download_fn)
+
+        elif (self._download_method.startswith("dask")):
+            yield from self.download(download_buckets, download_fn)
+
+        else:
+            for open_file in download_buckets:
+                (result, duration_ms) = _timed_download(download_fn, open_file)
+                self._last_download_timings.append(
+                    DownloadTiming(path=getattr(open_file, "path", str(open_file)), duration_ms=duration_ms))
+
+                yield result
+
+        if (logger.isEnabledFor(logging.DEBUG) and len(self._last_download_timings) > 0):
+            durations = [timing.duration_ms for timing in self._last_download_timings]
+            logger.debug("Downloaded %d files using %s. Mean: %.2f ms, Max: %.2f ms",
+                         len(durations),
+                         self._download_method.value,
+                         sum(durations) / len(durations),
+                         max(durations))
 
     def download(self,
                  download_buckets: fsspec.core.OpenFiles,
@@ -173,8 +341,6 @@ class Downloader:
                 dfs = dist.client.gather(dfs)
 
         else:
-            # Simply loop
-            for open_file in download_buckets:
-                dfs.append(download_fn(open_file))
+            dfs = list(self.iter_download(download_buckets, download_fn))
 
         return dfs
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import typing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from morpheus.stages.input.autoencoder_source_stage import AutoencoderSourceStage
+
+
+def _mask_user_split(x: typing.List[pd.DataFrame], userid_column_name: str) -> typing.Dict[str, pd.DataFrame]:
+    """
+    Splits users with a boolean mask per user, for comparison with `AutoencoderSourceStage.batch_user_split`.
+    """
+    combined_df = pd.concat(x)
+    combined_df = combined_df.sort_values(by=["event_dt"], kind="stable")
+
+    user_dfs = {}
+    for user_name in combined_df[userid_column_name].unique():
+        user_dfs[user_name] = combined_df[combined_df[userid_column_name] == user_name].copy()
+
+    return user_dfs
+
+
+def _make_dfs(num_users: int, rows_per_user: int = 10, num_files: int = 10) -> typing.List[pd.DataFrame]:
+    rng = np.random.default_rng(42)
+    num_rows = num_users * rows_per_user
+
+    df = pd.DataFrame({
+        "userIdentityaccountId": rng.choice([f"user{i}" for i in range(num_users)], num_rows),
+        "event_dt": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 86400, num_rows), unit="s"),
+        "eventName": rng.choice(["GetObject", "PutObject", "ListBuckets"], num_rows),
+        "value": rng.random(num_rows),
+    })
+
+    return np.array_split(df, num_files)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("num_users", [100, 10000])
+@pytest.mark.parametrize("split_fn",
+                         [
+                             lambda dfs: AutoencoderSourceStage.batch_user_split(dfs, "userIdentityaccountId", None),
+                             lambda dfs: AutoencoderSourceStage.batch_user_split(
+                                 dfs, "userIdentityaccountId", None, copy=False),
+                             lambda dfs: _mask_user_split(dfs, "userIdentityaccountId"),
+                         ],
+                         ids=["sorted", "sorted_views", "mask"])
+def test_batch_user_split(benchmark: typing.Any, num_users: int, split_fn: typing.Callable):
+    dfs = _make_dfs(num_users)
+
+    # The mask based split takes minutes with 10k users, so only a single round is run
+    user_dfs = benchmark.pedantic(split_fn, args=(dfs, ), rounds=1, iterations=1)
+
+    assert len(user_dfs) == num_users
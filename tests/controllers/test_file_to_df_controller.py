@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+from unittest import mock
+
+import fsspec
+import pandas as pd
+import pytest
+
+from morpheus.common import FileTypes
+from morpheus.controllers import file_to_df_controller
+from morpheus.controllers.file_to_df_controller import FileToDFController
+from morpheus.utils.column_info import ColumnInfo
+from morpheus.utils.column_info import DataFrameInputSchema
+from morpheus.utils.column_info import DateTimeColumn
+
+
+@pytest.fixture(name="input_files")
+def input_files_fixture(tmp_path: str) -> list[str]:
+    files = []
+    for i in range(3):
+        file_path = os.path.join(tmp_path, f"input_{i}.csv")
+        pd.DataFrame({
+            "timestamp": pd.date_range(f"2024-01-0{i + 1}", periods=5, freq="1h"),
+            "user": [f"user{j}" for j in range(5)],
+            "unused": range(5),
+        }).to_csv(file_path, index=False)
+        files.append(file_path)
+
+    yield files
+
+
+@pytest.fixture(name="controller_factory")
+def controller_factory_fixture(tmp_path: str):
+    schema = DataFrameInputSchema(column_info=[
+        DateTimeColumn(name="timestamp", dtype="datetime64[ns]", input_name="timestamp"),
+        ColumnInfo(name="user", dtype=str),
+    ])
+
+    def make_controller(**kwargs) -> FileToDFController:
+        return FileToDFController(schema=schema,
+                                  filter_null=False,
+                                  file_type=FileTypes.CSV,
+                                  parser_kwargs=None,
+                                  cache_dir=os.path.join(tmp_path, "cache"),
+                                  timestamp_column_name="timestamp",
+                                  **kwargs)
+
+    with mock.patch.dict(os.environ, {"MORPHEUS_FILE_DOWNLOAD_TYPE": "single_thread"}):
+        yield make_controller
+
+
+def _get_cache_entries(tmp_path: str, sub_dir: str) -> list[str]:
+    return glob.glob(os.path.join(tmp_path, "cache", "file_cache", sub_dir, "*.parquet"))
+
+
+def test_convert_to_dataframe(tmp_path: str, input_files: list[str], controller_factory):
+    controller = controller_factory()
+
+    with mock.patch.object(file_to_df_controller,
+                           "single_object_to_dataframe",
+                           wraps=file_to_df_controller.single_object_to_dataframe) as mock_download:
+        df = controller.convert_to_dataframe((fsspec.open_files(input_files[:2]), 2))
+        assert mock_download.call_count == 2
+
+        assert len(df) == 10
+        assert list(df.columns) == ["timestamp", "user", "batch_count", "origin_hash"]
+        assert df["timestamp"].is_monotonic_increasing
+
+        # The batch is cached
+        cached_df = controller.convert_to_dataframe((fsspec.open_files(input_files[:2]), 2))
+        assert mock_download.call_count == 2
+        pd.testing.assert_frame_equal(cached_df, df)
+
+        # Overlapping batches reuse the per-file cache entries
+        df = controller.convert_to_dataframe((fsspec.open_files(input_files[1:]), 2))
+        assert mock_download.call_count == 3
+        assert len(df) == 10
+
+    assert len(_get_cache_entries(tmp_path, "files")) == 3
+    assert len(_get_cache_entries(tmp_path, "batches")) == 2
+
+    # Only the columns needed by the schema are stored
+    for cache_entry in _get_cache_entries(tmp_path, "files"):
+        assert "unused" not in pd.read_parquet(cache_entry).columns
+
+
+def test_cache_max_bytes(tmp_path: str, input_files: list[str], controller_factory):
+    controller = controller_factory(cache_max_bytes=0)
+
+    df = controller.convert_to_dataframe((fsspec.open_files(input_files), 3))
+    assert len(df) == 15
+
+    assert len(_get_cache_entries(tmp_path, "files")) == 0
+    assert len(_get_cache_entries(tmp_path, "batches")) == 0
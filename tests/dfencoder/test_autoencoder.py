@@ -302,6 +302,90 @@ def test_auto_encoder_fit(train_ae: autoencoder.AutoEncoder, train_df: pd.DataFr
     assert train_ae.optim is train_ae.learning_rate_decay.optimizer
 
 
+@pytest.mark.parametrize("preload_data_into_memory", [False, True])
+def test_file_system_dataset_num_samples(tmp_path: str, preload_data_into_memory: bool):
+    for (i, num_rows) in enumerate([5, 1, 12]):
+        pd.DataFrame({'a': range(num_rows)}).to_csv(os.path.join(tmp_path, f"{i}.csv"), index=False)
+
+    dataset = FileSystemDataset(tmp_path, batch_size=4, preload_data_into_memory=preload_data_into_memory)
+
+    # The header line of each file is only excluded once
+    assert dataset.num_samples == 18
+    assert len(dataset) == 5
+
+
+@pytest.mark.usefixtures("manual_seed")
+def test_file_system_dataset_cache(train_ae: autoencoder.AutoEncoder, train_df: pd.DataFrame, tmp_path: str):
+    train_ae.fit(train_df, epochs=1)
+
+    data_dir = os.path.join(tmp_path, "data")
+    cache_dir = os.path.join(tmp_path, "cache")
+    os.mkdir(data_dir)
+    for i in range(0, len(train_df), 100):
+        train_df.iloc[i:i + 100].to_csv(os.path.join(data_dir, f"{i:05}.csv"), index=False)
+
+    def make_dataset(**kwargs):
+        dataset = FileSystemDataset(data_dir, batch_size=64, **kwargs)
+        return train_ae._transform_dataset_for_validation(dataset)
+
+    expected_batches = list(make_dataset())
+    assert len(expected_batches) > 1
+
+    dataset = make_dataset(cache_dir=cache_dir)
+    assert dataset.encode_fn is not None
+    batches = list(dataset)
+    assert os.path.exists(os.path.join(cache_dir, FileSystemDataset.CACHE_INDEX_FILE))
+
+    # A second dataset should take the row counts from the cache index and read the encoded data from the cache
+    with patch.object(FileSystemDataset, '_get_file_len') as mock_get_file_len, \
+            patch.object(FileSystemDataset, '_get_data_from_filename') as mock_get_data:
+        cached_dataset = make_dataset(cache_dir=cache_dir)
+        assert cached_dataset.num_samples == len(train_df)
+        cached_batches = list(cached_dataset)
+        mock_get_file_len.assert_not_called()
+        mock_get_data.assert_not_called()
+
+    for batch_list in (batches, cached_batches):
+        assert len(batch_list) == len(expected_batches)
+        for (batch, expected) in zip(batch_list, expected_batches):
+            assert batch['data']['size'] == expected['data']['size']
+            for key in ('input_original', 'num_target', 'bin_target'):
+                assert torch.equal(batch["data"][key], expected["data"][key]), key
+            for (code, expected_code) in zip(batch['data']['cat_target'], expected['data']['cat_target']):
+                assert torch.equal(code, expected_code)
+
+
+def test_file_system_dataset_cache_encoding_changed(tmp_path: str):
+    df = pd.DataFrame({'num_feat': [float(i) for i in range(20)], 'cat_feat': ['a', 'b', 'c', 'd'] * 5})
+
+    data_dir = os.path.join(tmp_path, "data")
+    cache_dir = os.path.join(tmp_path, "cache")
+    os.mkdir(data_dir)
+    df.to_csv(os.path.join(data_dir, "data.csv"), index=False)
+
+    def get_batches(model: autoencoder.AutoEncoder, cache_dir: str = None):
+        dataset = FileSystemDataset(data_dir, batch_size=8, cache_dir=cache_dir)
+        return list(model._transform_dataset_for_validation(dataset))
+
+    first_ae = autoencoder.AutoEncoder(scaler='standard', min_cats=1, progress_bar=False)
+    first_ae.fit(df, epochs=1)
+    get_batches(first_ae, cache_dir)
+
+    # A model with a different vocabulary and numeric range encodes differently, so the cached data is encoded again
+    second_ae = autoencoder.AutoEncoder(scaler='standard', min_cats=1, progress_bar=False)
+    second_ae.fit(pd.DataFrame({'num_feat': [float(i) * 10 for i in range(20)], 'cat_feat': ['d', 'e'] * 10}), epochs=1)
+    assert second_ae.encoding_plan.fingerprint() != first_ae.encoding_plan.fingerprint()
+
+    expected_batches = get_batches(second_ae)
+    batches = get_batches(second_ae, cache_dir)
+
+    assert len(batches) == len(expected_batches)
+    for (batch, expected) in zip(batches, expected_batches):
+        assert torch.equal(batch["data"]["num_target"], expected["data"]["num_target"])
+        for (code, expected_code) in zip(batch['data']['cat_target'], expected['data']['cat_target']):
+            assert torch.equal(code, expected_code)
+
+
 def test_auto_encoder_fit_early_stopping(train_df: pd.DataFrame):
     train_data = train_df.sample(frac=0.7, random_state=1)
     validation_data = train_df.drop(train_data.index)
@@ -487,6 +571,43 @@ def test_auto_encoder_get_results(train_ae: autoencoder.AutoEncoder, train_df: p
     assert results.loc[0, 'z_loss_scaler_type'] == 'z'
 
 
+@pytest.mark.usefixtures("manual_seed")
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 10000])
+def test_auto_encoder_iter_results(train_ae: autoencoder.AutoEncoder, train_df: pd.DataFrame, chunk_size: int):
+    train_ae.fit(train_df, epochs=1)
+    expected = train_ae.get_results(train_df, return_abs=True)
+
+    chunks = list(train_ae.iter_results(train_df, chunk_size=chunk_size, return_abs=True))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(train_df)
+
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_exact=False, atol=1e-4)
+
+    # An iterable of frames is re-chunked to the requested size
+    frames = (train_df.iloc[i:i + 3] for i in range(0, len(train_df), 3))
+    chunks = list(train_ae.iter_results(frames, chunk_size=chunk_size, return_abs=True))
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_exact=False, atol=1e-4)
+
+
+def test_auto_encoder_iter_results_grad_mode(train_ae: autoencoder.AutoEncoder):
+    df = pd.DataFrame({
+        'num_feat': [5.1, 4.9, 4.7, 4.6, 5.0, 5.4, 4.6, 5.0, 4.4, 4.9],
+        'cat_feat': ['a', 'b', 'a', 'c', 'b', 'a', 'c', 'a', 'b', 'a'],
+    })
+    train_ae.fit(df, epochs=1)
+
+    results = train_ae.iter_results(df, chunk_size=3)
+    next(results)
+
+    # Inference mode is not left enabled in the caller while the generator is suspended
+    assert not torch.is_inference_mode_enabled()
+    assert torch.is_grad_enabled()
+
+    assert sum(len(chunk) for chunk in results) == len(df) - 3
+
+
 @pytest.mark.usefixtures("manual_seed")
 def test_auto_encoder_num_only_convergence(train_ae: autoencoder.AutoEncoder):
     num_df = pd.DataFrame({
@@ -504,3 +625,16 @@ def test_auto_encoder_num_only_convergence(train_ae: autoencoder.AutoEncoder):
 
     # Make sure the model converges with numerical feats only
     assert avg_loss[-1] < avg_loss[0] / 2
+
+
+def test_auto_encoder_encode_df(train_ae: autoencoder.AutoEncoder, train_df: pd.DataFrame):
+    train_ae.fit(train_df, epochs=1)
+
+    num, bin, codes = train_ae.encode_df(train_df)
+    expected_num, expected_bin, expected_codes = train_ae.compute_targets(train_ae.prepare_df(train_df))
+
+    assert torch.equal(num, expected_num)
+    assert torch.equal(bin, expected_bin)
+    assert len(codes) == len(expected_codes)
+    for (code, expected_code) in zip(codes, expected_codes):
+        assert torch.equal(code, expected_code)
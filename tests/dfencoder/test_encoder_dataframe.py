@@ -14,10 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from morpheus.models.dfencoder.dataframe import EncoderDataFrame
+from morpheus.models.dfencoder.dataframe import gen_swap_indices
+from morpheus.models.dfencoder.dataframe import swap_array_columns
 
 
 def test_constructor():
@@ -40,3 +43,49 @@ def test_swap():
     df = EncoderDataFrame(values)
     swapped = df.swap(likelihood=0)
     assert swapped.values.tolist() == values
+
+
+def test_swap_preserves_dtypes():
+    df = EncoderDataFrame({
+        'num': [1.5, 2.5, 3.5, 4.5],
+        'bin': [True, False, True, False],
+        'cat': pd.Categorical(['a', 'b', 'a', '_other'], categories=['a', 'b', '_other']),
+    },
+                          index=[10, 11, 12, 13])
+    swapped = df.swap(likelihood=0.5, random_state=7)
+
+    assert isinstance(swapped, EncoderDataFrame)
+    assert swapped.dtypes.to_dict() == df.dtypes.to_dict()
+    assert swapped.index.tolist() == df.index.tolist()
+    assert swapped['cat'].cat.categories.tolist() == ['a', 'b', '_other']
+
+    # Every swapped value should come from the same column of the original
+    for col in df.columns:
+        assert set(swapped[col].tolist()) <= set(df[col].tolist())
+
+
+def test_swap_random_state():
+    values = [[i, i * 2.0] for i in range(100)]
+    df = EncoderDataFrame(values)
+    original = df.copy()
+
+    swapped_a = df.swap(random_state=np.random.default_rng(42))
+    swapped_b = df.swap(random_state=np.random.default_rng(42))
+    assert swapped_a.values.tolist() == swapped_b.values.tolist()
+    assert swapped_a.values.tolist() != values
+
+    # The source dataframe should not be modified
+    assert df.equals(original)
+
+
+def test_swap_array_columns():
+    arr = np.arange(12).reshape(4, 3)
+    src_rows, dst_rows = gen_swap_indices(4, 3, likelihood=0.5, random_state=1)
+    assert src_rows.shape == (2, 3)
+    assert dst_rows.shape == (2, 3)
+
+    expected = arr.copy()
+    for col in range(3):
+        expected[dst_rows[:, col], col] = arr[src_rows[:, col], col]
+
+    assert swap_array_columns(arr.copy(), src_rows, dst_rows).tolist() == expected.tolist()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from morpheus.models.dfencoder import scalers
+from morpheus.models.dfencoder.encoding import EncodingPlan
+
+
+@pytest.fixture(name="plan", scope="function")
+def plan_fixture():
+    scaler = scalers.StandardScaler()
+    scaler.mean = 2.0
+    scaler.std = 1.0
+
+    numeric_fts = OrderedDict(num={'mean': 2.0, 'std': 1.0, 'scaler': scaler})
+    binary_fts = OrderedDict(bin={'cats': [True, False], True: True, False: False})
+    categorical_fts = OrderedDict(cat={'cats': ['a', 'b']})
+
+    yield EncodingPlan(numeric_fts, binary_fts, categorical_fts)
+
+
+@pytest.fixture(name="df", scope="function")
+def df_fixture():
+    yield pd.DataFrame({
+        'num': [1.0, None, 3.0, 4.0],
+        'bin': [True, False, None, 'unknown'],
+        'cat': ['b', 'a', None, 'c'],
+    })
+
+
+def test_encode(plan: EncodingPlan, df: pd.DataFrame):
+    num, bin, codes = plan.encode(df)
+
+    assert num.dtype == np.float32
+    assert num[:, 0].tolist() == [-1.0, 0.0, 1.0, 2.0]
+
+    assert bin.dtype == np.float32
+    assert bin[:, 0].tolist() == [1.0, 0.0, 0.0, 0.0]
+
+    # Nulls and unknown categories are mapped to the trailing `_other` category
+    assert len(codes) == 1
+    assert codes[0].dtype == np.int64
+    assert codes[0].tolist() == [1, 0, 2, 2]
+    assert plan.categories(0).tolist() == ['a', 'b', '_other']
+
+
+def test_encode_matches_categorical(plan: EncodingPlan, df: pd.DataFrame):
+    expected = pd.Categorical(df['cat'], categories=['a', 'b', '_other']).fillna('_other')
+    assert plan.encode_categorical(df)[0].tolist() == expected.codes.tolist()
+
+
+def test_encode_binary_bool_column(plan: EncodingPlan):
+    df = pd.DataFrame({'bin': [True, False, True]})
+    bin = plan.encode_binary(df)
+    assert bin.dtype == bool
+    assert bin[:, 0].tolist() == [True, False, True]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import typing
+
+import pandas as pd
+import pytest
+
+from _utils import TEST_DIRS
+from _utils.dataset_manager import DatasetManager
+from morpheus.models.dfencoder import AETrainingExecutor
+from morpheus.models.dfencoder import AutoEncoder
+from morpheus.models.dfencoder.training_executor import train_ae_model
+
+pytestmark = [pytest.mark.use_pandas, pytest.mark.use_python]
+
+MODEL_KWARGS = {
+    "encoder_layers": [64, 32],
+    "decoder_layers": [64],
+    "activation": 'relu',
+    "batch_size": 128,
+    "scaler": 'standard',
+    "progress_bar": False,
+    "device": "cpu",
+}
+
+
+@pytest.fixture(name="train_df", scope="function")
+def train_df_fixture(dataset_pandas: DatasetManager) -> typing.Iterator[pd.DataFrame]:
+    df = dataset_pandas[os.path.join(TEST_DIRS.validation_data_dir, "dfp-cloudtrail-role-g-validation-data-input.csv")]
+    yield df[["eventSource", "eventName", "sourceIPAddress", "userAgent", "errorCode"]].fillna("nan")
+
+
+def test_train_ae_model(train_df: pd.DataFrame):
+    result = train_ae_model("user1", train_df, MODEL_KWARGS, fit_kwargs={"epochs": 1}, seed=42)
+
+    assert result.user_id == "user1"
+    assert result.train_time_sec > 0
+    assert isinstance(result.load_model(), AutoEncoder)
+
+    # Training with the same seed is reproducible
+    expected = train_ae_model("user1", train_df, MODEL_KWARGS, fit_kwargs={"epochs": 1}, seed=42)
+    assert result.train_scores_mean == pytest.approx(expected.train_scores_mean)
+    assert result.train_scores_std == pytest.approx(expected.train_scores_std)
+
+    assert train_ae_model("user1", train_df, MODEL_KWARGS, compute_scores=False).train_scores_mean is None
+
+
+def test_executor_map(train_df: pd.DataFrame):
+    jobs = [(f"user{i}", train_df.iloc[i * 100:(i + 1) * 100]) for i in range(3)]
+
+    with AETrainingExecutor(num_workers=2, threads_per_worker=1) as executor:
+        assert executor.max_pending == 2
+
+        results = list(executor.map(jobs, MODEL_KWARGS, fit_kwargs={"epochs": 1}, seed=42))
+
+    assert sorted(result.user_id for result in results) == ["user0", "user1", "user2"]
+
+    # Models trained by the workers match models trained in process
+    for result in results:
+        (_, df) = next(job for job in jobs if job[0] == result.user_id)
+        expected = train_ae_model(result.user_id, df, MODEL_KWARGS, fit_kwargs={"epochs": 1}, seed=42)
+
+        assert isinstance(result.load_model(), AutoEncoder)
+        assert result.train_scores_mean == pytest.approx(expected.train_scores_mean, rel=1e-4)
+
+
+@pytest.mark.parametrize("num_workers", [0, -1])
+def test_executor_invalid_num_workers(num_workers: int):
+    with pytest.raises(ValueError):
+        AETrainingExecutor(num_workers=num_workers)
@@ -127,3 +127,71 @@ def test_on_data_get_model_error(
 
     stage = DFPInferenceStage(config, model_name_formatter="test_model_name-{user_id}")
     assert stage.on_data(dfp_multi_message) is None
+
+
+def test_on_data_batch(
+        config: Config,
+        mock_mlflow_client: mock.MagicMock,  # pylint: disable=unused-argument
+        mock_model_manager: mock.MagicMock,
+        dfp_message_meta: "DFPMessageMeta",  # noqa: F821
+        dataset_pandas: DatasetManager):
+    from dfp.messages.multi_dfp_message import MultiDFPMessage
+    from dfp.stages.dfp_inference_stage import DFPInferenceStage
+
+    split = dfp_message_meta.count // 3
+    messages = [
+        MultiDFPMessage(meta=dfp_message_meta, mess_offset=0, mess_count=split),
+        MultiDFPMessage(meta=dfp_message_meta, mess_offset=split, mess_count=dfp_message_meta.count - split)
+    ]
+
+    expected_df = dfp_message_meta.copy_dataframe()
+    expected_df["results"] = list(range(1000, dfp_message_meta.count + 1000))
+    expected_df["model_version"] = "test_model_name:test_model_version"
+
+    mock_model = mock.MagicMock()
+    mock_model.get_results.side_effect = lambda df, return_abs: pd.DataFrame(
+        {"results": range(1000, len(df) + 1000)}, index=df.index)
+
+    mock_model_cache = mock.MagicMock()
+    mock_model_cache.load_model.return_value = mock_model
+    mock_model_cache.reg_model_name = "test_model_name"
+    mock_model_cache.reg_model_version = "test_model_version"
+
+    mock_model_manager.load_user_model.return_value = mock_model_cache
+
+    stage = DFPInferenceStage(config, model_name_formatter="test_model_name-{user_id}", max_batch_size=2)
+
+    assert stage._on_next_batched(messages[0]) == []
+    results = stage._on_next_batched(messages[1])
+
+    # Both messages share a model and are scored with a single call
+    mock_model.get_results.assert_called_once()
+
+    assert len(results) == 2
+    for (result, message) in zip(results, messages):
+        assert isinstance(result, MultiDFPMessage)
+        assert result.mess_offset == message.mess_offset
+        assert result.mess_count == message.mess_count
+
+    dataset_pandas.assert_compare_df(dfp_message_meta.copy_dataframe(), expected_df)
+
+    # Nothing is pending
+    assert stage._on_completed_batched() is None
+
+
+def test_get_flush_timeout(config: Config, dfp_message_meta: "DFPMessageMeta"):  # noqa: F821
+    from dfp.messages.multi_dfp_message import MultiDFPMessage
+    from dfp.stages.dfp_inference_stage import DFPInferenceStage
+
+    stage = DFPInferenceStage(config, max_batch_size=10, max_batch_wait_sec=5.0)
+    assert stage._get_flush_timeout() is None
+
+    with mock.patch("dfp.stages.dfp_inference_stage.time.monotonic", return_value=100.0):
+        assert stage._on_next_batched(MultiDFPMessage(meta=dfp_message_meta, mess_offset=0, mess_count=1)) == []
+
+    # The deadline is measured from the arrival of the oldest pending message
+    with mock.patch("dfp.stages.dfp_inference_stage.time.monotonic", return_value=103.0):
+        assert stage._get_flush_timeout() == pytest.approx(2.0)
+
+    with mock.patch("dfp.stages.dfp_inference_stage.time.monotonic", return_value=110.0):
+        assert stage._get_flush_timeout() == 0.0
@@ -14,6 +14,10 @@
 # limitations under the License.
 
 import os
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import pytest
@@ -22,9 +26,100 @@ from _utils import TEST_DIRS
 from _utils.dataset_manager import DatasetManager
 from morpheus.config import Config
 from morpheus.messages.multi_ae_message import MultiAEMessage
+from morpheus.models.dfencoder import AETrainingResult
 from morpheus.pipeline.single_port_stage import SinglePortStage
 
 
+class _FakeExecutor:
+    """
+    Trains models in a pool of threads, the training of each user blocks until it is released with `release`.
+    """
+
+    def __init__(self, errors: dict[str, Exception] = None):
+        self._errors = errors or {}
+        self._released: dict[str, threading.Event] = {}
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        self.shutdown_calls = []
+
+    def submit(self, user_id: str, train_df, model_kwargs: dict, fit_kwargs: dict = None, compute_scores: bool = True):
+        released = self._released.setdefault(user_id, threading.Event())
+
+        def train():
+            released.wait(timeout=10)
+            if (user_id in self._errors):
+                raise self._errors[user_id]
+
+            return AETrainingResult(user_id=user_id, model_bytes=user_id.encode())
+
+        return self._pool.submit(train)
+
+    def release(self, *user_ids: str):
+        for user_id in user_ids:
+            self._released.setdefault(user_id, threading.Event()).set()
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        self.shutdown_calls.append(cancel_futures)
+        self.release(*self._released.keys())
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class _FakeObservable:
+    """
+    Drives the node built by `ops.build`. Callables in `items` are called between messages, and exceptions are raised
+    as an error in the stream.
+    """
+
+    def __init__(self, items: list):
+        self._items = items
+        self._operators = {}
+
+    def pipe(self, *operators):
+        self._operators = dict(operators)
+        return self
+
+    def subscribe(self, sub: mock.MagicMock):
+        for item in self._items:
+            if (isinstance(item, Exception)):
+                raise item
+
+            if (callable(item)):
+                item()
+            else:
+                for output in self._operators['map'](item):
+                    sub.on_next(output)
+
+        self._operators['on_completed']()
+
+
+@pytest.fixture(name="mock_ops")
+def mock_ops_fixture():
+    with mock.patch('dfp.stages.dfp_training.ops') as mock_ops:
+        mock_ops.map.side_effect = lambda fn: ('map', fn)
+        mock_ops.on_completed.side_effect = lambda fn: ('on_completed', fn)
+        mock_ops.flatten.side_effect = lambda: ('flatten', None)
+        yield mock_ops
+
+
+def _make_parallel_stage(config: Config):
+    from dfp.stages.dfp_training import DFPTraining
+
+    stage = DFPTraining(config, num_workers=2)
+    stage._get_training_data = mock.MagicMock(return_value=(None, {}))
+    stage._create_output_message = mock.MagicMock(side_effect=lambda message, rcm, model_bytes: model_bytes)
+
+    return stage
+
+
+def _make_message(user_id: str):
+    return types.SimpleNamespace(user_id=user_id, mess_count=1)
+
+
+def _wait_for_outputs(sub: mock.MagicMock, count: int):
+    deadline = time.monotonic() + 10
+    while (sub.on_next.call_count < count and time.monotonic() < deadline):
+        time.sleep(0.01)
+
+
 def test_constructor(config: Config):
     from dfp.stages.dfp_training import DFPTraining
 
@@ -35,6 +130,14 @@ def test_constructor(config: Config):
     assert stage._validation_size == 0.5
 
 
+def test_constructor_num_workers(config: Config):
+    from dfp.stages.dfp_training import DFPTraining
+
+    stage = DFPTraining(config, num_workers=4, threads_per_worker=2)
+    assert stage._num_workers == 4
+    assert stage._threads_per_worker == 2
+
+
 @pytest.mark.parametrize('validation_size', [-1, -0.2, 1, 5])
 def test_constructor_bad_validation_size(config: Config, validation_size: float):
     from dfp.stages.dfp_training import DFPTraining
@@ -43,6 +146,13 @@ def test_constructor_bad_validation_size(config: Config, validation_size: float)
         DFPTraining(config, validation_size=validation_size)
 
 
+def test_constructor_bad_num_workers(config: Config):
+    from dfp.stages.dfp_training import DFPTraining
+
+    with pytest.raises(ValueError):
+        DFPTraining(config, num_workers=-1)
+
+
 @pytest.mark.parametrize('validation_size', [0., 0.2])
 @mock.patch('dfp.stages.dfp_training.AutoEncoder')
 @mock.patch('dfp.stages.dfp_training.train_test_split')
@@ -100,3 +210,82 @@ def test_on_data(mock_train_test_split: mock.MagicMock,
 
     # The stage shouldn't be modifying the dataframe
     dataset_pandas.assert_compare_df(results.get_meta(), dataset_pandas[input_file])
+
+
+@pytest.mark.usefixtures("mock_ops")
+def test_parallel_node_fn(config: Config):
+    executor = _FakeExecutor()
+    stage = _make_parallel_stage(config)
+    sub = mock.MagicMock()
+    num_outputs_before_completed = []
+
+    items = [
+        _make_message('a'),
+        _make_message('b'),
+        _make_message('c'),
+        lambda: executor.release('b', 'c'),
+        lambda: time.sleep(0.1),
+        lambda: executor.release('a'),
+        lambda: _wait_for_outputs(sub, 3),
+        lambda: num_outputs_before_completed.append(sub.on_next.call_count),
+    ]
+
+    with mock.patch('dfp.stages.dfp_training.AETrainingExecutor', return_value=executor):
+        stage._parallel_node_fn(_FakeObservable(items), sub)
+
+    # Models are emitted in the order their messages were received, without waiting for further input
+    assert [call.args[0] for call in sub.on_next.call_args_list] == [b'a', b'b', b'c']
+    assert num_outputs_before_completed == [3]
+    assert executor.shutdown_calls == [False]
+
+
+@pytest.mark.usefixtures("mock_ops")
+def test_parallel_node_fn_training_error(config: Config):
+    executor = _FakeExecutor(errors={'b': ValueError("training failed")})
+    stage = _make_parallel_stage(config)
+    sub = mock.MagicMock()
+
+    items = [_make_message('a'), _make_message('b'), _make_message('c'), lambda: executor.release('a', 'b', 'c')]
+
+    with mock.patch('dfp.stages.dfp_training.AETrainingExecutor', return_value=executor):
+        with pytest.raises(ValueError, match="training failed"):
+            stage._parallel_node_fn(_FakeObservable(items), sub)
+
+    # The models after the failed one are discarded
+    assert [call.args[0] for call in sub.on_next.call_args_list] == [b'a']
+    assert executor.shutdown_calls == [True, False]
+
+
+@pytest.mark.usefixtures("mock_ops")
+def test_parallel_node_fn_output_error(config: Config):
+    executor = _FakeExecutor()
+    stage = _make_parallel_stage(config)
+    stage._create_output_message.side_effect = RuntimeError("output failed")
+    sub = mock.MagicMock()
+
+    items = [_make_message('a'), _make_message('b'), lambda: executor.release('a', 'b')]
+
+    with mock.patch('dfp.stages.dfp_training.AETrainingExecutor', return_value=executor):
+        with pytest.raises(RuntimeError, match="output failed"):
+            stage._parallel_node_fn(_FakeObservable(items), sub)
+
+    sub.on_next.assert_not_called()
+    assert executor.shutdown_calls == [True, False]
+
+
+@pytest.mark.usefixtures("mock_ops")
+def test_parallel_node_fn_stream_error(config: Config):
+    executor = _FakeExecutor()
+    stage = _make_parallel_stage(config)
+    sub = mock.MagicMock()
+
+    items = [_make_message('a'), ValueError("stream failed")]
+
+    with mock.patch('dfp.stages.dfp_training.AETrainingExecutor', return_value=executor):
+        with pytest.raises(ValueError, match="stream failed"):
+            stage._parallel_node_fn(_FakeObservable(items), sub)
+
+    # The model still being trained is discarded, and the sender thread and executor are shut down
+    sub.on_next.assert_not_called()
+    assert executor.shutdown_calls == [True]
+    assert not any(thread.name == f"{stage.unique_name}-sender" for thread in threading.enumerate())
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pandas as pd
+import pytest
+
+
+def _make_batch(start: str, periods: int, freq: str = "1h") -> pd.DataFrame:
+    return pd.DataFrame({"timestamp": pd.date_range(start, periods=periods, freq=freq), "value": range(periods)})
+
+
+def _build_window(cache_location: str = None) -> "CachedUserWindow":  # noqa: F821
+    from dfp.utils.cached_user_window import CachedUserWindow
+
+    window = CachedUserWindow(user_id="test_user", cache_location=cache_location)
+    for day in range(1, 5):
+        assert window.append_dataframe(_make_batch(f"2024-01-0{day}", 10))
+
+    return window
+
+
+def test_append_dataframe():
+    window = _build_window()
+
+    assert window.batch_count == 4
+    assert window.pending_batch_count == 4
+    assert window.count == 40
+    assert window.total_count == 40
+    assert window.min_epoch == pd.Timestamp("2024-01-01 00:00:00")
+    assert window.max_epoch == pd.Timestamp("2024-01-04 09:00:00")
+
+    # Each append is stored as its own chunk
+    assert len(window._chunks) == 4
+
+    # Rows older than the window are rejected, rows already in the window are ignored
+    assert not window.append_dataframe(_make_batch("2023-12-31", 2))
+    assert window.append_dataframe(_make_batch("2024-01-04", 2))
+    assert window.count == 40
+
+
+@pytest.mark.parametrize("max_history", [None, 15, 5, "2d", "1h"])
+def test_get_train_df_matches_trim_dataframe(max_history):
+    from dfp.utils.cached_user_window import CachedUserWindow
+
+    window = _build_window()
+    window.get_train_df(max_history=None)
+    window.append_dataframe(_make_batch("2024-01-05", 3))
+
+    full_df = pd.concat([chunk.df for chunk in window._chunks])
+    expected = CachedUserWindow.trim_dataframe(full_df,
+                                               max_history=max_history,
+                                               last_batch=window.batch_count - window.pending_batch_count)
+
+    train_df = window.get_train_df(max_history=max_history)
+    pd.testing.assert_frame_equal(train_df, expected)
+
+    assert window.count == len(expected)
+    assert window.min_epoch == expected["timestamp"].min()
+    assert window.max_epoch == expected["timestamp"].max()
+    assert window.pending_batch_count == 0
+
+
+def test_save_load(tmp_path: str):
+    from dfp.utils.cached_user_window import CachedUserWindow
+
+    cache_location = os.path.join(tmp_path, "test_user.pkl")
+    window = _build_window(cache_location)
+    window.get_train_df(max_history=None)
+    window.save()
+
+    chunk_dir = os.path.join(tmp_path, "test_user.chunks")
+    assert len(os.listdir(chunk_dir)) == 4
+
+    # Only new chunks should be written on subsequent saves, trimmed chunks are removed
+    window.append_dataframe(_make_batch("2024-01-05", 10))
+    window.get_train_df(max_history=15)
+    window.save()
+    assert sorted(os.listdir(chunk_dir)) == sorted(f"{chunk.chunk_id}.pkl" for chunk in window._chunks)
+    assert len(os.listdir(chunk_dir)) == 2
+
+    loaded = CachedUserWindow.load(cache_location)
+    assert loaded.count == window.count
+    assert loaded.max_epoch == window.max_epoch
+    pd.testing.assert_frame_equal(loaded.get_train_df(max_history=None), window.get_train_df(max_history=None))
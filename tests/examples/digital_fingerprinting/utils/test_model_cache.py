@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+import torch
+
+MODEL_NAMES = [f"dfp-user{i}" for i in range(4)]
+
+
+@pytest.fixture(name="mock_mlflow_client")
+def mock_mlflow_client_fixture():
+    with mock.patch("dfp.utils.model_cache.MlflowClient") as mock_mlflow_client:
+        mock_mlflow_client.return_value = mock_mlflow_client
+
+        registered_models = []
+        for name in MODEL_NAMES:
+            registered_model = mock.MagicMock()
+            registered_model.name = name
+            registered_models.append(registered_model)
+
+        results = mock.MagicMock()
+        results.__iter__.side_effect = lambda: iter(registered_models)
+        results.token = None
+        mock_mlflow_client.search_registered_models.return_value = results
+
+        mock_mlflow_client.get_latest_versions.side_effect = lambda name: [
+            mock.MagicMock(version="1", source=f"models:/{name}/1")
+        ]
+
+        yield mock_mlflow_client
+
+
+@pytest.fixture(name="mock_load_model")
+def mock_load_model_fixture():
+    with mock.patch("dfp.utils.model_cache.mlflow.pytorch.load_model") as mock_load_model:
+        # Each model holds 10 float32 weights, 40 bytes
+        mock_load_model.side_effect = lambda model_uri: torch.nn.Linear(9, 1)
+        yield mock_load_model
+
+
+@pytest.mark.usefixtures("mock_load_model")
+def test_stats(mock_mlflow_client: mock.MagicMock):
+    from dfp.utils.model_cache import ModelManager
+
+    manager = ModelManager(model_name_formatter="dfp-{user_id}")
+
+    for _ in range(3):
+        model_cache = manager.load_user_model(mock_mlflow_client, user_id="user0", fallback_user_ids=[])
+        model_cache.load_model()
+
+    stats = manager.stats
+    assert stats.misses == 1
+    assert stats.hits == 2
+    assert stats.evictions == 0
+    assert stats.hit_rate == pytest.approx(2 / 3)
+    assert stats.mean_load_time_ms >= 0
+    assert manager.loaded_bytes == 40
+
+
+def test_lru_eviction(mock_mlflow_client: mock.MagicMock, mock_load_model: mock.MagicMock):
+    from dfp.utils.model_cache import ModelManager
+
+    manager = ModelManager(model_name_formatter="dfp-{user_id}", model_cache_size_max=2)
+
+    caches = [manager.load_model_cache(mock_mlflow_client, reg_model_name=name) for name in MODEL_NAMES[:2]]
+    for model_cache in caches:
+        model_cache.load_model()
+
+    # Touch the first model, making the second one the least recently used
+    assert manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0]) is caches[0]
+
+    manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[2]).load_model()
+
+    assert caches[0].is_loaded
+    assert not caches[1].is_loaded
+    assert manager.stats.evictions == 1
+    assert manager.loaded_bytes == 80
+    assert mock_load_model.call_count == 3
+
+    # Unknown models are not cached
+    assert manager.load_model_cache(mock_mlflow_client, reg_model_name="dfp-unknown") is None
+
+
+def test_max_loaded_bytes(mock_mlflow_client: mock.MagicMock, mock_load_model: mock.MagicMock):
+    from dfp.utils.model_cache import ModelManager
+
+    manager = ModelManager(model_name_formatter="dfp-{user_id}", max_loaded_bytes=100)
+
+    caches = [manager.load_model_cache(mock_mlflow_client, reg_model_name=name) for name in MODEL_NAMES[:3]]
+    for model_cache in caches:
+        model_cache.load_model()
+
+    # The weights of the first model are released, but the registry metadata is kept
+    assert [model_cache.is_loaded for model_cache in caches] == [False, True, True]
+    assert manager.loaded_bytes == 80
+    assert manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0]) is caches[0]
+
+    caches[0].load_model()
+    assert mock_load_model.call_count == 4
+    assert [model_cache.is_loaded for model_cache in caches] == [True, False, True]
+
+
+@pytest.mark.usefixtures("mock_load_model")
+def test_refresh(mock_mlflow_client: mock.MagicMock):
+    from dfp.utils.model_cache import ModelManager
+
+    manager = ModelManager(model_name_formatter="dfp-{user_id}", cache_timeout_sec=0)
+
+    model_cache = manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0])
+    model_cache.load_model()
+
+    # A new version is registered
+    mock_mlflow_client.get_latest_versions.side_effect = lambda name: [
+        mock.MagicMock(version="2", source=f"models:/{name}/2")
+    ]
+
+    manager.refresh()
+
+    assert not model_cache.is_loaded
+    assert manager.loaded_bytes == 0
+
+    updated_cache = manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0])
+    assert updated_cache is not model_cache
+    assert updated_cache.reg_model_version == "2"
+    assert updated_cache.model_uri == f"models:/{MODEL_NAMES[0]}/2"
+
+
+@pytest.mark.usefixtures("mock_load_model")
+def test_background_refresh(mock_mlflow_client: mock.MagicMock):
+    from dfp.utils.model_cache import ModelManager
+
+    manager = ModelManager(model_name_formatter="dfp-{user_id}", refresh_interval_sec=0.01)
+
+    try:
+        model_cache = manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0])
+        assert model_cache is not None
+
+        # The registry is only queried by the refresh thread
+        mock_mlflow_client.search_registered_models.reset_mock()
+        assert manager.load_model_cache(mock_mlflow_client, reg_model_name=MODEL_NAMES[0]) is model_cache
+    finally:
+        manager.stop()
+
+    assert manager.stats.registry_refreshes >= 1
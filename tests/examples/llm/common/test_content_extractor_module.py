@@ -142,3 +142,56 @@ def test_content_extractor_module(data_len,
         assert output.shape == (num_rows_per_file * ((data_len // chunk_boundary_size) +
                                                      (1 if data_len % chunk_boundary_size else 0)),
                                 4)
+
+
+@pytest.mark.use_python
+@pytest.mark.use_cudf
+@pytest.mark.parametrize("num_processes", [0, 2])
+def test_content_extractor_module_streaming(num_processes: int,
+                                            tmp_path: str,
+                                            config: Config,
+                                            import_content_extractor_module: types.ModuleType):
+    num_files = 5
+    batch_size = 2
+    module_config = {
+        "batch_size": batch_size,
+        "num_processes": num_processes,
+        "skip_unchanged_files": True,
+        "content_hash_path": os.path.join(tmp_path, "content_hashes.json"),
+        "converters_meta": {
+            "csv": {
+                "chunk_size": 50, "chunk_overlap": 10, "text_column_names": ["some_column"]
+            }
+        },
+    }
+
+    temp_csv_files = TempCSVFiles(num_files=num_files,
+                                  columns={'some_column': lambda: [generate_random_string(40) for _ in range(3)]})
+
+    def run_pipeline() -> list[MessageMeta]:
+        content_extractor_loader = import_content_extractor_module.ContentExtractorLoaderFactory.get_instance(
+            "content_extractor", module_config=module_config)
+
+        # All of the files are delivered in a single message
+        file_generator = partial(csv_file_generator, temp_csv_files, batch_size=num_files)
+
+        pipe = LinearPipeline(config)
+        pipe.set_source(InMemoryDataGenStage(config, file_generator, output_data_type=List[fsspec.core.OpenFile]))
+        pipe.add_stage(
+            LinearModulesStage(config,
+                               content_extractor_loader,
+                               input_type=List[fsspec.core.OpenFile],
+                               output_type=MessageMeta,
+                               input_port_name="input",
+                               output_port_name="output"))
+        sink_stage = pipe.add_stage(InMemorySinkStage(config))
+        pipe.run()
+
+        return sink_stage.get_messages()
+
+    # A message is emitted for each batch of files
+    messages = run_pipeline()
+    assert [len(message.df) for message in messages] == [6, 6, 3]
+
+    # Re-ingesting the same files skips them as their content is unchanged
+    assert len(run_pipeline()) == 0
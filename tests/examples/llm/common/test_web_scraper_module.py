@@ -13,9 +13,15 @@
 # limitations under the License.
 
 import os
+import threading
 import types
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 
 import pytest
+import requests
+import requests_cache
 
 import cudf
 
@@ -29,6 +35,51 @@ from morpheus.stages.input.in_memory_source_stage import InMemorySourceStage
 from morpheus.stages.output.compare_dataframe_stage import CompareDataFrameStage
 
 
+class _PageHandler(BaseHTTPRequestHandler):
+    """
+    Serves `/page/<n>` with an ETag, answering conditional requests with a 304.
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+
+        etag = f'"{self.path}"'
+        if (self.headers.get("If-None-Match") == etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        if (not self.path.startswith("/page/")):
+            self.send_error(404)
+            return
+
+        body = f"<html><body><p>{self.path[1:]}</p></body></html>".encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(name="page_server")
+def page_server_fixture():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    server.requests = []
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.mark.slow
 @pytest.mark.use_python
 @pytest.mark.use_cudf
@@ -64,3 +115,68 @@ def test_web_scraper_module(config: Config, mock_rest_server: str, import_mod: t
     pipe.run()
 
     assert_results(comp_stage.get_results())
+
+
+@pytest.mark.use_cudf
+@pytest.mark.import_mod(os.path.join(TEST_DIRS.examples_dir, 'llm/vdb_upload/module/web_scraper_module.py'))
+def test_download_and_split_concurrent(page_server, import_mod: types.ModuleType):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    base_url = f"http://127.0.0.1:{page_server.server_port}"
+    links = [f"{base_url}/page/0", f"{base_url}/page/1", f"{base_url}/missing", f"{base_url}/page/0"]
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=100, chunk_overlap=10)
+    metrics = import_mod.WebScraperMetrics()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        msg = import_mod.download_and_split(MessageMeta(cudf.DataFrame({"link": links})),
+                                            text_splitter=text_splitter,
+                                            link_column="link",
+                                            session=requests.Session(),
+                                            executor=executor,
+                                            host_limiter=import_mod.HostLimiter(2),
+                                            metrics=metrics)
+
+    # Output stays in input order, the failed link is excluded and the duplicate link is only downloaded once
+    df = msg.copy_dataframe().to_pandas()
+    assert df["link"].tolist() == [links[0], links[1], links[3]]
+    assert df["page_content"].tolist() == ["page/0", "page/1", "page/0"]
+    assert len(page_server.requests) == 3
+
+    assert metrics.num_requests == 3
+    assert metrics.num_failed == 1
+    assert metrics.mean_fetch_time_ms > 0
+
+
+@pytest.mark.use_cudf
+@pytest.mark.import_mod(os.path.join(TEST_DIRS.examples_dir, 'llm/vdb_upload/module/web_scraper_module.py'))
+def test_download_and_split_revalidate(page_server, tmp_path: str, import_mod: types.ModuleType):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    links = [f"http://127.0.0.1:{page_server.server_port}/page/{i}" for i in range(3)]
+
+    session = requests_cache.CachedSession(os.path.join(tmp_path, "cache.sqlite"),
+                                           backend='sqlite',
+                                           always_revalidate=True)
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=100, chunk_overlap=10)
+    metrics = import_mod.WebScraperMetrics()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(2):
+            msg = import_mod.download_and_split(MessageMeta(cudf.DataFrame({"link": links})),
+                                                text_splitter=text_splitter,
+                                                link_column="link",
+                                                session=session,
+                                                executor=executor,
+                                                metrics=metrics)
+
+            assert msg.copy_dataframe().to_pandas()["page_content"].tolist() == ["page/0", "page/1", "page/2"]
+
+    # The second pass sends conditional requests which are answered with a 304
+    expected_requests = {(f"/page/{i}", None) for i in range(3)}
+    expected_requests |= {(f"/page/{i}", f'"/page/{i}"') for i in range(3)}
+
+    assert len(page_server.requests) == 6
+    assert set(page_server.requests) == expected_requests
+    assert metrics.num_requests == 6
+    assert metrics.num_revalidated == 3
@@ -13,14 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 import types
 import typing
 
 import cupy as cp
 import numpy as np
+import pandas as pd
 import pytest
 
+import cudf
+
 from _utils import TEST_DIRS
 from _utils.dataset_manager import DatasetManager
 from morpheus.config import Config
@@ -73,3 +77,41 @@ def test_log_parsing_post_processing_stage(config: Config,
 
     assert isinstance(out_meta, MessageMeta)
     DatasetManager.assert_compare_df(out_meta.df, expected_df)
+
+
+@pytest.mark.import_mod(os.path.join(TEST_DIRS.examples_dir, 'log_parsing', 'postprocessing.py'))
+def test_log_parsing_post_processing_split_logs(config: Config,
+                                                tmp_path: str,
+                                                import_mod: typing.List[types.ModuleType]):
+    postprocessing_mod = import_mod
+
+    model_vocab_file = os.path.join(TEST_DIRS.data_dir, 'bert-base-cased-vocab.txt')
+    model_config_file = os.path.join(tmp_path, 'log-parsing-config.json')
+    with open(model_config_file, 'w', encoding='UTF-8') as f:
+        json.dump({"id2label": {"0": "O", "1": "B-request", "2": "I-request", "3": "B-status"}}, f)
+
+    stage = postprocessing_mod.LogParsingPostProcessingStage(config,
+                                                             vocab_path=model_vocab_file,
+                                                             model_config_path=model_config_file)
+
+    # The first log is split across the first and last sequences. Token ids are line numbers in the vocab file,
+    # "/"=120, "index"=7448, "."=119, "html"=28066, "10"=1275, "##st"=2050, "1"=122, "##ho"=5114
+    input_ids = [[120, 7448, 119, 28066], [122, 5114, 0, 0], [1275, 2050, 0, 0]]
+    labels = [[1, 2, 0, 2], [3, 3, 0, 0], [3, 0, 0, 0]]
+    seq_ids = [[0, 0, 4], [1, 0, 2], [0, 0, 2]]
+
+    tensors = {
+        'input_ids': cp.asarray(input_ids, dtype=cp.float64),
+        'labels': cp.asarray(labels, dtype=cp.float64),
+        'confidences': cp.full((3, 4), 0.9),
+        'seq_ids': cp.asarray(seq_ids, dtype=cp.uint32)
+    }
+
+    meta = MessageMeta(cudf.DataFrame({'raw': ['a', 'b', 'c']}))
+    memory = TensorMemory(count=3, tensors=tensors)
+    message = MultiResponseMessage(meta=meta, mess_offset=0, mess_count=3, memory=memory, offset=0, count=3)
+
+    out_meta = stage._postprocess(message)
+
+    expected_df = pd.DataFrame({'request': ['/index.html', None], 'status': ['10st', '1ho']})
+    DatasetManager.assert_compare_df(out_meta.df, expected_df)
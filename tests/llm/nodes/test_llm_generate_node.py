@@ -18,6 +18,7 @@ from unittest import mock
 from _utils.llm import execute_node
 from morpheus.llm import LLMNodeBase
 from morpheus.llm.nodes.llm_generate_node import LLMGenerateNode
+from morpheus.llm.services.llm_response_cache import InMemoryLLMResponseCache
 
 
 def test_constructor(mock_llm_client: mock.MagicMock):
@@ -37,3 +38,16 @@ def test_execute(mock_llm_client: mock.MagicMock):
     node = LLMGenerateNode(llm_client=mock_llm_client)
     assert execute_node(node, prompt=["prompt1", "prompt2"]) == expected_output
     mock_llm_client.generate_batch_async.assert_called_once_with({'prompt': ["prompt1", "prompt2"]})
+
+
+def test_execute_cached(mock_llm_client: mock.MagicMock):
+    mock_llm_client.generate_batch_async.side_effect = [["response1", "response2"], ["response3"]]
+
+    cache = InMemoryLLMResponseCache()
+    node = LLMGenerateNode(llm_client=mock_llm_client, cache=cache)
+
+    assert execute_node(node, prompt=["prompt1", "prompt2"]) == ["response1", "response2"]
+    assert execute_node(node, prompt=["prompt2", "prompt3", "prompt1"]) == ["response2", "response3", "response1"]
+
+    mock_llm_client.generate_batch_async.assert_called_with({'prompt': ["prompt3"]}, return_exceptions=False)
+    assert cache.metrics.num_hits == 2
@@ -47,3 +47,18 @@ def test_execute(embedding: mock.AsyncMock | None):
     expected_output = [[1, 2, 3], [4, 5, 6]]
 
     assert execute_node(node, query=["query"]) == expected_output
+
+
+@pytest.mark.parametrize("search_batch_window_ms, search_cache_ttl_sec", [(5, None), (None, 60), (5, 60)])
+def test_execute_batched(search_batch_window_ms: float | None, search_cache_ttl_sec: float | None):
+    mock_vdb_service = mock.MagicMock()
+    mock_vdb_service.similarity_search = mock.AsyncMock(return_value=[[1, 2, 3], [4, 5, 6]])
+
+    node = RetrieverNode(embedding=None,
+                         service=mock_vdb_service,
+                         search_batch_window_ms=search_batch_window_ms,
+                         search_cache_ttl_sec=search_cache_ttl_sec,
+                         k=3)
+
+    assert execute_node(node, embedding=[[1.2, 2.3, 3.4], [4.5, 5.6, 6.7]]) == [[1, 2, 3], [4, 5, 6]]
+    mock_vdb_service.similarity_search.assert_awaited_once_with(embeddings=[[1.2, 2.3, 3.4], [4.5, 5.6, 6.7]], k=3)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from morpheus.llm.services.llm_request_scheduler import LLMRequestScheduler
+from morpheus.llm.services.llm_request_scheduler import TokenBucket
+from morpheus.llm.services.nemo_llm_service import NeMoLLMService
+
+
+class _RateLimitError(Exception):
+    pass
+
+
+class _FakeLLMServer:
+    """
+    Fake LLM server which takes `latency_sec` to respond, and rejects requests once more than `max_concurrent` are in
+    progress or the first `num_failures` requests.
+    """
+
+    def __init__(self, latency_sec: float = 0.01, max_concurrent: int = None, num_failures: int = 0):
+        self.latency_sec = latency_sec
+        self.max_concurrent = max_concurrent
+        self.num_failures = num_failures
+        self.num_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.request_times: list[float] = []
+
+    async def generate(self, prompt: str) -> str:
+        self.num_requests += 1
+        self.request_times.append(time.monotonic())
+
+        if (self.num_failures > 0):
+            self.num_failures -= 1
+            raise _RateLimitError("Too many requests")
+
+        if (self.max_concurrent is not None and self.in_flight >= self.max_concurrent):
+            raise _RateLimitError("Too many concurrent requests")
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(self.latency_sec)
+        finally:
+            self.in_flight -= 1
+
+        return prompt.upper()
+
+
+async def test_max_in_flight():
+    server = _FakeLLMServer(max_concurrent=4)
+    scheduler = LLMRequestScheduler(max_in_flight=4)
+
+    prompts = [f"prompt{i}" for i in range(20)]
+    results = await scheduler.submit_batch([lambda p=p: server.generate(p) for p in prompts], client_name="fake")
+
+    assert results == [p.upper() for p in prompts]
+    assert server.peak_in_flight == 4
+
+    metrics = scheduler.get_metrics("fake")
+    assert metrics.num_requests == 20
+    assert metrics.num_completed == 20
+    # The first 4 requests start immediately, the remaining 16 are queued
+    assert metrics.max_queue_depth == 16
+    assert metrics.queue_depth == 0
+    assert metrics.in_flight == 0
+    assert metrics.mean_latency_sec > 0
+
+
+async def test_retry_backoff():
+    server = _FakeLLMServer(num_failures=3)
+    scheduler = LLMRequestScheduler(max_retries=3, backoff_base_sec=0.01, jitter=False)
+
+    assert await scheduler.submit(lambda: server.generate("prompt")) == "PROMPT"
+    assert server.num_requests == 4
+
+    # Delays double after each failure
+    delays = [b - a for (a, b) in zip(server.request_times, server.request_times[1:])]
+    for (delay, expected) in zip(delays, [0.01, 0.02, 0.04]):
+        assert delay >= expected
+
+    metrics = scheduler.get_metrics()
+    assert metrics.num_retries == 3
+    assert metrics.num_completed == 1
+
+
+async def test_retry_exhausted():
+    server = _FakeLLMServer(num_failures=10)
+    scheduler = LLMRequestScheduler(max_retries=2,
+                                    backoff_base_sec=0.001,
+                                    retry_on=lambda exc: isinstance(exc, _RateLimitError))
+
+    with pytest.raises(_RateLimitError):
+        await scheduler.submit(lambda: server.generate("prompt"))
+
+    assert server.num_requests == 3
+    assert scheduler.get_metrics().num_failed == 1
+
+    # Exceptions which aren't retryable fail immediately
+    with pytest.raises(ValueError):
+        await scheduler.submit(mock.AsyncMock(side_effect=ValueError("bad request")))
+
+    assert scheduler.get_metrics().num_retries == 2
+
+
+async def test_requests_per_second():
+    server = _FakeLLMServer(latency_sec=0)
+    scheduler = LLMRequestScheduler(requests_per_second=50, burst_sec=0.1)
+
+    start_time = time.monotonic()
+    await scheduler.submit_batch([lambda: server.generate("prompt") for _ in range(10)])
+
+    # A burst of 5 requests, then the remaining 5 at 50 per second
+    assert time.monotonic() - start_time >= 0.09
+
+
+def test_token_bucket():
+    with mock.patch("morpheus.llm.services.llm_request_scheduler.time.monotonic", return_value=0):
+        bucket = TokenBucket(rate=100, capacity=200)
+
+        assert bucket.reserve(150) == 0
+        assert bucket.reserve(100) == pytest.approx(0.5)
+
+        # Reservations larger than the capacity are limited to the capacity
+        assert bucket.reserve(1000) == pytest.approx(2.5)
+
+
+async def test_nemo_client_scheduler(mock_nemollm: mock.MagicMock):
+    mock_nemollm.post_process_generate_response.side_effect = [{"status": "fail", "msg": "unittest"}] + [{
+        "text": "test_output"
+    }] * 3
+
+    scheduler = LLMRequestScheduler(max_in_flight=2, backoff_base_sec=0.001)
+    client = NeMoLLMService(api_key="dummy", retry_count=2, scheduler=scheduler).get_client(model_name="test_model")
+
+    results = await client.generate_batch_async({'prompt': ["prompt1", "prompt2", "prompt3"]})
+
+    assert results == ["test_output"] * 3
+
+    metrics = scheduler.get_metrics("test_model")
+    assert metrics.num_requests == 3
+    assert metrics.num_retries == 1
+    assert metrics.num_completed == 3
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+import pytest
+
+from morpheus.llm.services.llm_response_cache import CachedLLMClient
+from morpheus.llm.services.llm_response_cache import InMemoryLLMResponseCache
+from morpheus.llm.services.llm_response_cache import LLMResponseCache
+from morpheus.llm.services.llm_response_cache import SQLiteLLMResponseCache
+
+
+@pytest.fixture(name="cache_factory", params=["memory", "sqlite"])
+def cache_factory_fixture(request: pytest.FixtureRequest, tmp_path):
+
+    def create_cache(**kwargs) -> LLMResponseCache:
+        if (request.param == "memory"):
+            return InMemoryLLMResponseCache(**kwargs)
+
+        return SQLiteLLMResponseCache(os.path.join(tmp_path, "cache", "responses.db"), **kwargs)
+
+    return create_cache
+
+
+@pytest.fixture(name="mock_client")
+def mock_client_fixture():
+    mock_client = mock.MagicMock()
+    mock_client._model_name = "test_model"
+    mock_client._model_kwargs = {"temperature": 0}
+    mock_client.get_input_names.return_value = ["prompt"]
+    mock_client.generate_batch.side_effect = lambda inputs, **_: [p.upper() for p in inputs["prompt"]]
+    mock_client.generate_batch_async = mock.AsyncMock(
+        side_effect=lambda inputs, **_: [p.upper() for p in inputs["prompt"]])
+
+    return mock_client
+
+
+def test_cache_lru(cache_factory):
+    cache = cache_factory(max_entries=2)
+
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+
+    # "b" is the least recently used
+    cache.set("c", "3")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+    assert cache.metrics.num_hits == 3
+    assert cache.metrics.num_misses == 1
+    assert cache.metrics.num_evictions == 1
+    assert cache.metrics.hit_ratio == 0.75
+
+
+def test_cache_ttl(cache_factory):
+    cache = cache_factory(ttl_sec=10)
+
+    with mock.patch("morpheus.llm.services.llm_response_cache.time.time", return_value=100):
+        cache.set("a", "1")
+
+    with mock.patch("morpheus.llm.services.llm_response_cache.time.time", return_value=105):
+        assert cache.get("a") == "1"
+
+    with mock.patch("morpheus.llm.services.llm_response_cache.time.time", return_value=111):
+        assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = os.path.join(tmp_path, "responses.db")
+
+    cache = SQLiteLLMResponseCache(path)
+    cache.set("a", "1")
+    cache.close()
+
+    assert SQLiteLLMResponseCache(path).get("a") == "1"
+
+
+@pytest.mark.parametrize("use_async", [True, False])
+async def test_generate_batch_mixed_hits(cache_factory, mock_client: mock.MagicMock, use_async: bool):
+    mock_generate = mock_client.generate_batch_async if use_async else mock_client.generate_batch
+
+    client = CachedLLMClient(mock_client, cache_factory())
+    assert client.get_input_names() == ["prompt"]
+
+    async def generate_batch(prompts: list[str]) -> list[str]:
+        if (use_async):
+            return await client.generate_batch_async({"prompt": prompts})
+
+        return client.generate_batch({"prompt": prompts})
+
+    assert await generate_batch(["a", "b", "a"]) == ["A", "B", "A"]
+    mock_generate.assert_called_once_with({"prompt": ["a", "b"]}, return_exceptions=False)
+
+    # Only the misses are sent to the client
+    assert await generate_batch(["b", "c", "a"]) == ["B", "C", "A"]
+    mock_generate.assert_called_with({"prompt": ["c"]}, return_exceptions=False)
+
+    mock_generate.reset_mock()
+    assert await generate_batch(["c", "b"]) == ["C", "B"]
+    mock_generate.assert_not_called()
+
+
+async def test_generate_batch_exceptions_not_cached(mock_client: mock.MagicMock):
+    error = RuntimeError("unittest")
+    mock_client.generate_batch_async.side_effect = [["A", error], ["B"]]
+
+    client = CachedLLMClient(mock_client, InMemoryLLMResponseCache())
+
+    assert await client.generate_batch_async({"prompt": ["a", "b"]}, return_exceptions=True) == ["A", error]
+    assert await client.generate_batch_async({"prompt": ["a", "b"]}, return_exceptions=True) == ["A", "B"]
+    mock_client.generate_batch_async.assert_called_with({"prompt": ["b"]}, return_exceptions=True)
+
+
+def test_cache_key_includes_model(mock_client: mock.MagicMock):
+    cache = InMemoryLLMResponseCache()
+
+    CachedLLMClient(mock_client, cache).generate_batch({"prompt": ["a"]})
+    CachedLLMClient(mock_client, cache, model_kwargs={"temperature": 1}).generate_batch({"prompt": ["a"]})
+    CachedLLMClient(mock_client, cache, model_name="other_model").generate_batch({"prompt": ["a"]})
+
+    assert mock_client.generate_batch.call_count == 3
+    assert len(cache) == 3
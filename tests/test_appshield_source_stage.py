@@ -16,7 +16,10 @@
 
 import glob
 import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import pytest
@@ -166,6 +169,31 @@ def test_load_df(cols_exclude, expected_df, encoding):
     assert_frame_equal(output_df, expected_df)
 
 
+def test_load_columns():
+    input_file = os.path.join(TEST_DIRS.tests_data_dir,
+                              'appshield',
+                              'snapshot-1',
+                              'envars_2022-01-30_10-26-01.017250.json')
+    (columns, values) = AppShieldSourceStage.load_columns(input_file, ['Block', 'Variable', 'Value'], 'latin1')
+
+    assert columns == ['PID', 'Process']
+    assert_frame_equal(pd.DataFrame(dict(zip(columns, values))),
+                       AppShieldSourceStage.load_df(input_file, ['Block', 'Variable', 'Value'], 'latin1'))
+
+
+def test_load_columns_ragged_rows(tmp_path):
+    input_file = os.path.join(tmp_path, 'envars_2022-01-30_10-26-01.017250.json')
+    with open(input_file, 'w', encoding='utf-8') as fh:
+        json.dump({'titles': ['PID', 'Process', 'Block'], 'data': [[1, 'a.exe', 'x'], [2, 'b.exe'], [3]]}, fh)
+
+    (columns, values) = AppShieldSourceStage.load_columns(input_file, ['Block'], 'utf-8')
+
+    # Missing values of short rows are filled the same as when loading a dataframe
+    assert columns == ['PID', 'Process']
+    assert_frame_equal(pd.DataFrame(dict(zip(columns, values))),
+                       AppShieldSourceStage.load_df(input_file, ['Block'], 'utf-8'))
+
+
 @pytest.mark.parametrize('plugin', ['envars'])
 @pytest.mark.parametrize('expected_new_columns', ['snapshot_id', 'timestamp', 'source', 'plugin'])
 def test_load_meta_cols(plugin, expected_new_columns):
@@ -276,6 +304,32 @@ def test_files_to_dfs(cols_include, cols_exclude, plugins_include, meta_columns,
     assert meta_columns in output_df_per_source['appshield'].columns
 
 
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_files_to_dfs_executor(use_processes: bool):
+    input_glob = os.path.join(TEST_DIRS.tests_data_dir, 'appshield', 'snapshot-1', '*.json')
+    file_list = sorted(glob.glob(input_glob))
+    kwargs = {
+        'cols_include': ['Base', 'PID', 'Process', 'Variable', 'Value'],
+        'cols_exclude': ['SHA256'],
+        'plugins_include': ['ldrmodules', 'threadlist', 'envars', 'vadinfo', 'handles'],
+        'encoding': 'latin1'
+    }
+
+    if (use_processes):
+        executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=2)
+
+    with executor:
+        output_df_per_source = AppShieldSourceStage.files_to_dfs(file_list, executor=executor, **kwargs)
+
+    expected_df_per_source = AppShieldSourceStage.files_to_dfs(file_list, **kwargs)
+
+    assert list(output_df_per_source.keys()) == list(expected_df_per_source.keys())
+    for (source, expected_df) in expected_df_per_source.items():
+        assert_frame_equal(output_df_per_source[source], expected_df)
+
+
 @pytest.mark.parametrize(
     'input_df_per_source',
     [{
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from morpheus.stages.input.autoencoder_source_stage import AutoencoderSourceStage
+
+
+def _make_dfs(num_users: int = 20, num_rows: int = 500) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(0)
+
+    df = pd.DataFrame({
+        "userid": rng.choice([f"user{i}" for i in range(num_users)] + [None], num_rows),
+        "event_dt": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 100, num_rows), unit="s"),
+        "value": np.arange(num_rows),
+    })
+
+    return [df.iloc[:num_rows // 2], df.iloc[num_rows // 2:]]
+
+
+def _expected_split(dfs: list[pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    combined_df = pd.concat(dfs)
+    combined_df.index.name = "idx"
+    combined_df = combined_df.sort_values(by=["event_dt", "idx"])
+    combined_df.index.name = None
+
+    return {
+        user_name: combined_df[combined_df["userid"] == user_name]
+        for user_name in combined_df["userid"].unique()
+    }
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_batch_user_split(copy: bool):
+    dfs = _make_dfs()
+    expected = _expected_split(dfs)
+
+    user_dfs = AutoencoderSourceStage.batch_user_split(dfs, "userid", None, copy=copy)
+
+    # Users are in order of first appearance, and each user's rows keep their sorted order
+    assert list(user_dfs.keys()) == list(expected.keys())
+
+    for (user_name, expected_df) in expected.items():
+        pd.testing.assert_frame_equal(user_dfs[user_name], expected_df)
+
+
+def test_batch_user_split_copy():
+    user_dfs = AutoencoderSourceStage.batch_user_split(_make_dfs(), "userid", None)
+
+    user_dfs["user0"]["value"] = -1
+
+    assert (user_dfs["user1"]["value"] >= 0).all()
+
+
+def test_batch_user_split_filter():
+    dfs = _make_dfs()
+
+    user_dfs = AutoencoderSourceStage.batch_user_split(dfs, "userid", "user3")
+
+    assert list(user_dfs.keys()) == ["user3"]
+    pd.testing.assert_frame_equal(user_dfs["user3"], _expected_split(dfs)["user3"])
+
+    assert AutoencoderSourceStage.batch_user_split(dfs, "userid", "unknown") == {}
+
+
+def test_join_columns():
+    df = pd.DataFrame({"city": ["Austin", None, "Paris"], "state": ["TX", "CA", None], "country": ["US", "US", "FR"]})
+
+    joined = AutoencoderSourceStage.join_columns(df, ["city", "state", "country"])
+
+    expected = df.fillna("nan").apply(lambda x: ", ".join(x), axis=1)
+    pd.testing.assert_series_equal(joined, expected)
+
+
+def test_running_distinct_count():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "day": rng.choice(["2024-01-01", "2024-01-02"], 200),
+        "app": rng.choice(["app1", "app2", "app3", None], 200),
+    })
+
+    counts = AutoencoderSourceStage.running_distinct_count(df["day"], df["app"])
+
+    # Expanding maximum of the factorized values of each day
+    codes = df.groupby("day")["app"].transform(lambda x: pd.factorize(x)[0] + 1)
+    expected = codes.groupby(df["day"]).expanding(1).max().droplevel(0).sort_index()
+
+    pd.testing.assert_series_equal(counts, expected, check_names=False)
+
+
+def test_remove_null():
+    from morpheus.stages.input.cloud_trail_source_stage import CloudTrailSourceStage
+
+    column = pd.Series([[{"owner": "a"}, {"owner": "b"}], None, "value", ["x"], [], [{"owner": "c"}]])
+
+    cleaned = CloudTrailSourceStage.remove_null(column)
+
+    assert cleaned.tolist() == ["a", None, "value", ["x"], [], "c"]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from morpheus.service.vdb.batched_resource_service import BatchedVectorDBResourceService
+
+
+def _mock_search(embeddings: list[list[float]], k: int = 4, **kwargs):
+    # Return a single result per embedding identifying the embedding and k
+    return [[{"value": embedding[0], "k": k}] for embedding in embeddings]
+
+
+@pytest.fixture(name="mock_service")
+def mock_service_fixture():
+    mock_service = mock.MagicMock()
+    mock_service.similarity_search = mock.AsyncMock(side_effect=_mock_search)
+
+    return mock_service
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_coalesces(mock_service: mock.MagicMock):
+    service = BatchedVectorDBResourceService(mock_service, batch_window_ms=5)
+
+    results = await asyncio.gather(service.similarity_search(embeddings=[[1.0], [2.0]], k=2),
+                                   service.similarity_search(embeddings=[[3.0]], k=2),
+                                   service.similarity_search(embeddings=[[1.0]], k=2),
+                                   service.similarity_search(embeddings=[[4.0]], k=3))
+
+    assert results == [
+        [[{"value": 1.0, "k": 2}], [{"value": 2.0, "k": 2}]],
+        [[{"value": 3.0, "k": 2}]],
+        [[{"value": 1.0, "k": 2}]],
+        [[{"value": 4.0, "k": 3}]],
+    ]
+
+    # Searches with the same k are combined, and the duplicate embedding is only searched once
+    assert mock_service.similarity_search.await_count == 2
+    mock_service.similarity_search.assert_any_await(embeddings=[[1.0], [2.0], [3.0]], k=2)
+    mock_service.similarity_search.assert_any_await(embeddings=[[4.0]], k=3)
+
+    assert service.metrics.num_coalesced == 1
+    assert service.metrics.num_batches == 2
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_max_batch_size(mock_service: mock.MagicMock):
+    service = BatchedVectorDBResourceService(mock_service, batch_window_ms=1000, max_batch_size=2)
+
+    results = await asyncio.wait_for(service.similarity_search(embeddings=[[1.0], [2.0]]), timeout=0.5)
+
+    assert len(results) == 2
+    mock_service.similarity_search.assert_awaited_once_with(embeddings=[[1.0], [2.0]], k=4)
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_cache(mock_service: mock.MagicMock):
+    service = BatchedVectorDBResourceService(mock_service, cache_ttl_sec=60)
+
+    first = await service.similarity_search(embeddings=[[1.0], [2.0]])
+    second = await service.similarity_search(embeddings=[[2.0], [1.0], [5.0]])
+
+    assert second == [first[1], first[0], [{"value": 5.0, "k": 4}]]
+    assert mock_service.similarity_search.await_count == 2
+    mock_service.similarity_search.assert_awaited_with(embeddings=[[5.0]], k=4)
+    assert service.metrics.num_cache_hits == 2
+
+    # Modifying the returned hits doesn't modify the cached hits
+    first[0][0]["value"] = -1.0
+    assert (await service.similarity_search(embeddings=[[1.0]])) == [[{"value": 1.0, "k": 4}]]
+
+    # Writes through the service invalidate the cache
+    service.delete_by_keys([1])
+    mock_service.delete_by_keys.assert_called_once_with([1])
+
+    await service.similarity_search(embeddings=[[1.0]])
+    assert mock_service.similarity_search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_cache_expires(mock_service: mock.MagicMock):
+    service = BatchedVectorDBResourceService(mock_service, cache_ttl_sec=60)
+
+    with mock.patch("morpheus.service.vdb.batched_resource_service.time.monotonic", return_value=0):
+        await service.similarity_search(embeddings=[[1.0]])
+
+    with mock.patch("morpheus.service.vdb.batched_resource_service.time.monotonic", return_value=61):
+        await service.similarity_search(embeddings=[[1.0]])
+
+    assert mock_service.similarity_search.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_error(mock_service: mock.MagicMock):
+    mock_service.similarity_search.side_effect = RuntimeError("search failed")
+    service = BatchedVectorDBResourceService(mock_service)
+
+    with pytest.raises(RuntimeError, match="search failed"):
+        await service.similarity_search(embeddings=[[1.0]])
+
+    # A failed search is not cached or left pending
+    mock_service.similarity_search.side_effect = _mock_search
+    assert await service.similarity_search(embeddings=[[1.0]]) == [[{"value": 1.0, "k": 4}]]
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_missing_results(mock_service: mock.MagicMock):
+    mock_service.similarity_search.side_effect = lambda embeddings, **kwargs: _mock_search(embeddings[:-1], **kwargs)
+    service = BatchedVectorDBResourceService(mock_service)
+
+    # Every embedding in the batch fails, rather than the unmatched one being left waiting forever
+    with pytest.raises(RuntimeError, match="Expected 2 search results"):
+        await asyncio.wait_for(service.similarity_search(embeddings=[[1.0], [2.0]]), timeout=5)
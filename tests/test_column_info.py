@@ -32,9 +32,13 @@ from morpheus.utils.column_info import ColumnInfo
 from morpheus.utils.column_info import CustomColumn
 from morpheus.utils.column_info import DataFrameInputSchema
 from morpheus.utils.column_info import DateTimeColumn
+from morpheus.utils.column_info import DistinctIncrementColumn
+from morpheus.utils.column_info import DistinctIncrementState
 from morpheus.utils.column_info import RenameColumn
 from morpheus.utils.column_info import StringCatColumn
 from morpheus.utils.column_info import StringJoinColumn
+from morpheus.utils.column_info import _json_flatten
+from morpheus.utils.column_info import create_increment_col
 from morpheus.utils.nvt.schema_converters import create_and_attach_nvt_workflow
 from morpheus.utils.schema_transforms import process_dataframe
 
@@ -338,3 +342,103 @@ def test_type_cast():
 
         assert actutal.dtype == np.dtype('O')
         assert actutal.equals(expected)
+
+
+@pytest.mark.use_python
+@pytest.mark.parametrize("as_str", [True, False])
+def test_json_flatten_referenced_paths(as_str: bool):
+    records = [{
+        "a": 1, "b": {
+            "c": "x", "unused": [1, 2]
+        }
+    }, {
+        "a": None, "b": {
+            "c": None, "d": 2
+        }
+    }, {
+        "b": {}
+    }, {
+        "a": 2.5, "b": {
+            "c": {
+                "e": 1
+            }
+        }
+    }]
+
+    df = pd.DataFrame({"json": [json.dumps(r) if as_str else r for r in records], "other": range(len(records))})
+
+    input_columns = {"json.a": "float64", "json.b.c": "str", "json.b.d": "float64", "json.b.c.e": "float64"}
+    prepared = _json_flatten(df, input_columns=input_columns, json_cols=["json"])
+
+    # The result should match flattening all of the keys with `pd.json_normalize`
+    expected_df = pd.json_normalize(records).rename(columns=lambda x: "json." + x)
+    expected_df = expected_df.reindex(columns=input_columns.keys(), fill_value=None).astype(input_columns)
+
+    pd.testing.assert_frame_equal(prepared.df, expected_df)
+    assert prepared.columns_to_preserve == []
+
+
+@pytest.mark.use_python
+def test_json_flatten_dotted_keys():
+    records = [{"d.e": 5, "f": {"g.h": "x"}}, {"d": {"e": 6}}, {"f.g.h": "y"}]
+
+    df = pd.DataFrame({"props": records})
+
+    input_columns = {"props.d.e": "float64", "props.f.g.h": "str"}
+    prepared = _json_flatten(df, input_columns=input_columns, json_cols=["props"])
+
+    # Keys containing a literal dot are matched, the same as flattening with `pd.json_normalize`
+    expected_df = pd.json_normalize(records).rename(columns=lambda x: "props." + x)
+    expected_df = expected_df.reindex(columns=input_columns.keys(), fill_value=None).astype(input_columns)
+
+    pd.testing.assert_frame_equal(prepared.df, expected_df)
+    assert prepared.df["props.d.e"].iloc[:2].tolist() == [5.0, 6.0]
+
+
+def _make_increment_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp":
+            pd.to_datetime([
+                "2024-01-01 01:00",
+                "2024-01-01 02:00",
+                "2024-01-01 03:00",
+                "2024-01-01 04:00",
+                "2024-01-01 05:00",
+                "2024-01-02 01:00",
+                "2024-01-02 02:00",
+                "2024-01-02 03:00",
+            ]),
+        "username": ["alice", "bob", "alice", "alice", "bob", "alice", "alice", "bob"],
+        "location": ["home", "work", "home", "work", None, "work", "cafe", "work"],
+    })
+
+
+@pytest.mark.use_python
+def test_create_increment_col():
+    df = _make_increment_df()
+
+    increment_col = create_increment_col(df, "location")
+
+    assert increment_col.index.equals(df.index)
+    assert increment_col.tolist() == [1, 1, 1, 2, 2, 1, 2, 1]
+
+    distinct_increment = DistinctIncrementColumn(name="locincrement",
+                                                 dtype="int",
+                                                 input_name="location",
+                                                 groupby_column="username")
+    assert distinct_increment._process_column(df).tolist() == increment_col.tolist()
+
+
+@pytest.mark.use_python
+def test_create_increment_col_state():
+    df = _make_increment_df()
+
+    expected = create_increment_col(df, "location")
+
+    state = DistinctIncrementState()
+    batches = [create_increment_col(df.iloc[i:i + 3], "location", state=state) for i in range(0, len(df), 3)]
+
+    pd.testing.assert_series_equal(pd.concat(batches), expected)
+
+    state.prune(before=pd.Period("2024-01-02", "D"))
+    assert all(key[0] == pd.Period("2024-01-02", "D") for key in state.seen_values)
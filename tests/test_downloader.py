@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import operator
 import os
 from unittest import mock
 
@@ -48,7 +49,7 @@ def dask_cuda(fail_missing: bool):
 
 @pytest.mark.usefixtures("restore_environ")
 @pytest.mark.parametrize('use_env', [True, False])
-@pytest.mark.parametrize('dl_method', ["single_thread", "dask", "dask_thread"])
+@pytest.mark.parametrize('dl_method', ["single_thread", "dask", "dask_thread", "threads", "processes"])
 def test_constructor_download_type(use_env: bool, dl_method: str):
     kwargs = {}
     if use_env:
@@ -118,7 +119,7 @@ def test_close(mock_dask_cluster: mock.MagicMock, dl_method: str):
 
 
 @mock.patch('dask_cuda.LocalCUDACluster')
-@pytest.mark.parametrize('dl_method', ["single_thread"])
+@pytest.mark.parametrize('dl_method', ["single_thread", "threads"])
 def test_close_noop(mock_dask_cluster: mock.MagicMock, dl_method: str):
     mock_dask_cluster.return_value = mock_dask_cluster
     downloader = Downloader(download_method=dl_method)
@@ -178,6 +179,41 @@ def test_download(mock_dask_cluster: mock.MagicMock,
         mock_dask_config.assert_not_called()
 
 
+@pytest.mark.usefixtures("restore_environ")
+@pytest.mark.parametrize('ordered', [True, False])
+@pytest.mark.parametrize('max_in_flight', [1, None])
+@pytest.mark.parametrize('dl_method', ["threads", "processes"])
+def test_download_pool(dl_method: str, max_in_flight: int, ordered: bool):
+    input_glob = os.path.join(TEST_DIRS.tests_data_dir, 'appshield/snapshot-1/*.json')
+    download_buckets = fsspec.open_files(input_glob)
+    expected_paths = [bucket.path for bucket in download_buckets]
+    assert len(expected_paths) > 0
+
+    downloader = Downloader(download_method=dl_method, max_workers=2, max_in_flight=max_in_flight, ordered=ordered)
+
+    # The download function must be picklable when using processes
+    download_fn = operator.attrgetter("path")
+
+    try:
+        results = downloader.download(download_buckets, download_fn)
+
+        if ordered:
+            assert results == expected_paths
+        else:
+            assert sorted(results) == sorted(expected_paths)
+
+        timings = downloader.last_download_timings
+        assert [timing.path for timing in timings] == results
+        assert all(timing.duration_ms >= 0 for timing in timings)
+
+        # The pool is reused for subsequent downloads
+        executor = downloader.get_executor()
+        assert list(downloader.iter_download(download_buckets[:1], download_fn)) == expected_paths[:1]
+        assert downloader.get_executor() is executor
+    finally:
+        downloader.close()
+
+
 @pytest.mark.usefixtures("restore_environ")
 @pytest.mark.parametrize('use_env', [True, False])
 @pytest.mark.parametrize('dl_method', ["multiprocess", "multiprocessing"])
@@ -124,3 +124,91 @@ def test_constructor_invalid_method(config: Config, invalid_method: HTTPMethod):
 def test_constructor_invalid_accept_status(config: Config, invalid_accept_status: HTTPStatus):
     with pytest.raises(ValueError):
         HttpServerSourceStage(config=config, accept_status=invalid_accept_status)
+
+
+@pytest.mark.slow
+@pytest.mark.use_python
+@pytest.mark.parametrize("lines", [False, True])
+@pytest.mark.parametrize("parse_batches", [False, True])
+def test_generate_frames_coalesced(config: Config, dataset_pandas: DatasetManager, lines: bool, parse_batches: bool):
+    endpoint = '/test'
+    port = 8088
+    method = HTTPMethod.POST
+    accept_status = HTTPStatus.OK
+    url = make_url(port, endpoint)
+
+    content_type = MimeTypes.TEXT.value if lines else MimeTypes.JSON.value
+
+    df = dataset_pandas['filter_probs.csv']
+
+    # Split the dataset across several requests
+    payloads = []
+    for chunk in (df.iloc[0:5], df.iloc[5:12], df.iloc[12:]):
+        buf = df_to_stream_json(chunk, StringIO(), lines=lines)
+        buf.seek(0)
+        payloads.append(buf.read())
+
+    stage = HttpServerSourceStage(config=config,
+                                  port=port,
+                                  endpoint=endpoint,
+                                  method=method,
+                                  accept_status=accept_status,
+                                  lines=lines,
+                                  coalesce=True,
+                                  max_batch_rows=len(df),
+                                  max_batch_latency=30,
+                                  parse_batches=parse_batches)
+
+    assert not stage.supports_cpp_node()
+
+    generate_frames = stage._generate_frames()
+    msg_queue = queue.SimpleQueue()
+
+    get_next_thread = GetNext(msg_queue, generate_frames)
+    get_next_thread.start()
+
+    attempt = 0
+    while not stage._processing and get_next_thread.is_alive() and attempt < 2:
+        time.sleep(0.1)
+        attempt += 1
+
+    assert stage._processing
+    assert get_next_thread.is_alive()
+
+    for payload in payloads:
+        response = requests.request(method=method.value,
+                                    url=url,
+                                    data=payload,
+                                    timeout=5.0,
+                                    allow_redirects=False,
+                                    headers={"Content-Type": content_type})
+
+        assert response.status_code == accept_status.value
+
+    # The payloads are emitted as a single message once the row limit is reached
+    result_msg = msg_queue.get(timeout=5.0)
+    get_next_thread.join()
+
+    dataset_pandas.assert_compare_df(df, result_msg.df)
+
+
+@pytest.mark.parametrize("lines, payloads",
+                         [(False, ['[{"v": 1}, {"v": 2}]', '[]', '[{"v": 3', '[{"v": 4}]']),
+                          (True, ['{"v": 1}\n{"v": 2}\n', '{"v": 3', '{"v": 4}'])])
+def test_parse_batch(config: Config, lines: bool, payloads: list[str]):
+    stage = HttpServerSourceStage(config=config, lines=lines, coalesce=True, parse_batches=True)
+
+    # Invalid payloads are dropped, without affecting the rest of the batch
+    df = stage._parse_batch(payloads)
+    assert df["v"].to_arrow().to_pylist() == [1, 2, 4]
+
+
+@pytest.mark.parametrize("payload, expected_rows", [('{"v": 1}\n{"v": 2}\n', 2), ('{"v": 1}\n{"v": 2}', 2),
+                                                    ('{"v": 1}', 1)])
+def test_parse_payload_num_rows(config: Config, payload: str, expected_rows: int):
+    stage = HttpServerSourceStage(config=config, lines=True, coalesce=True, parse_batches=True)
+    stage._queue = queue.Queue()
+
+    stage._parse_payload(payload)
+
+    assert stage._queue.get_nowait() == (payload, expected_rows, len(payload))
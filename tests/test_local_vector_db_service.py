@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from morpheus.service.vdb.local_vector_db_service import LocalVectorDBService
+from morpheus.service.vdb.utils import VectorDBServiceFactory
+
+DIM = 8
+
+
+def _make_schema_conf() -> dict:
+    return {
+        "schema_fields": [
+            {
+                "name": "id", "dtype": "INT64", "is_primary": True
+            },
+            {
+                "name": "embedding", "dtype": "FLOAT_VECTOR", "params": {
+                    "dim": DIM
+                }
+            },
+            {
+                "name": "age", "dtype": "INT64"
+            },
+        ]
+    }
+
+
+def _make_df(num_rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vectors = rng.random((num_rows, DIM), dtype=np.float32)
+
+    return pd.DataFrame({"id": np.arange(num_rows), "embedding": list(vectors), "age": np.arange(num_rows) % 10})
+
+
+def _exact_top_k(df: pd.DataFrame, queries: np.ndarray, k: int) -> list[list[int]]:
+    vectors = np.stack(df["embedding"].to_numpy())
+    dists = ((queries[:, np.newaxis, :] - vectors[np.newaxis, :, :])**2).sum(axis=2)
+
+    return [df["id"].to_numpy()[np.argsort(row, kind="stable")[:k]].tolist() for row in dists]
+
+
+def test_factory_create_instance():
+    service = VectorDBServiceFactory.create_instance("local")
+    assert isinstance(service, LocalVectorDBService)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search_block_size", [16, 65536])
+async def test_similarity_search(search_block_size: int):
+    service = LocalVectorDBService()
+    service.create("test", schema_conf=_make_schema_conf())
+    service.load_resource("test")._search_block_size = search_block_size
+
+    df = _make_df(100)
+    result = service.insert_dataframe("test", df)
+    assert result["insert_count"] == 100
+    assert service.count("test") == 100
+
+    queries = np.random.default_rng(3).random((5, DIM), dtype=np.float32)
+    results = await service.similarity_search("test", embeddings=queries.tolist(), k=4)
+
+    assert [[row["id"] for row in rows] for rows in results] == _exact_top_k(df, queries, 4)
+    assert set(results[0][0].keys()) == {"id", "age"}
+
+
+@pytest.mark.asyncio
+async def test_delete_by_keys():
+    service = LocalVectorDBService()
+    service.create("test", schema_conf=_make_schema_conf())
+
+    df = _make_df(20)
+    service.insert_dataframe("test", df)
+
+    # Searching with a stored vector returns that row first, until it is deleted
+    query = df["embedding"].iloc[3].tolist()
+    results = await service.similarity_search("test", embeddings=[query], k=1)
+    assert results[0][0]["id"] == 3
+
+    assert service.delete_by_keys("test", [3, 4, 100]) == [3, 4]
+    assert service.count("test") == 18
+    assert service.retrieve_by_keys("test", [3, 4]) == []
+
+    results = await service.similarity_search("test", embeddings=[query], k=18)
+    assert {row["id"] for row in results[0]} == set(range(20)) - {3, 4}
+
+    # Deleting over half of the rows compacts the collection
+    service.delete("test", "id < 15")
+    assert service.count("test") == 5
+    assert service.query("test", "age > 6") == [{"id": 17, "age": 7}, {"id": 18, "age": 8}, {"id": 19, "age": 9}]
+
+
+@pytest.mark.asyncio
+async def test_ivf_index():
+    service = LocalVectorDBService()
+
+    index_conf = {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 4, "nprobe": 4}}
+    service.create("test", schema_conf=_make_schema_conf(), index_conf=index_conf)
+
+    df = _make_df(200)
+    service.insert_dataframe("test", df)
+
+    # Probing every list is equivalent to an exact search
+    queries = np.random.default_rng(5).random((3, DIM), dtype=np.float32)
+    results = await service.similarity_search("test", embeddings=queries.tolist(), k=5)
+
+    assert [[row["id"] for row in rows] for rows in results] == _exact_top_k(df, queries, 5)
+
+
+@pytest.mark.asyncio
+async def test_persistence(tmp_path):
+    service = LocalVectorDBService(persist_dir=str(tmp_path))
+    service.create("test", schema_conf=_make_schema_conf())
+
+    df = _make_df(50)
+    service.insert_dataframe("test", df)
+    service.delete_by_keys("test", [0])
+    service.close()
+
+    reloaded = LocalVectorDBService(persist_dir=str(tmp_path))
+    assert reloaded.list_store_objects() == ["test"]
+    assert reloaded.count("test") == 49
+
+    # Vectors are memory mapped until the collection is modified
+    resource = reloaded.load_resource("test")
+    assert isinstance(resource._vectors, np.memmap)
+
+    queries = np.random.default_rng(9).random((2, DIM), dtype=np.float32)
+    results = await reloaded.similarity_search("test", embeddings=queries.tolist(), k=3)
+    assert [[row["id"] for row in rows] for rows in results] == _exact_top_k(df.iloc[1:], queries, 3)
+
+    reloaded.insert_dataframe("test", _make_df(60).iloc[50:])
+    assert reloaded.count("test") == 59
+    assert not isinstance(resource._vectors, np.memmap)
+
+    reloaded.drop("test")
+    assert not reloaded.has_store_object("test")
@@ -17,8 +17,10 @@
 import json
 import random
 import string
+from unittest import mock
 
 import numpy as np
+import pandas as pd
 import pymilvus
 import pytest
 from pymilvus import DataType
@@ -605,3 +607,51 @@ def test_insert_dataframe(milvus_server_uri: str,
     result_df = dataset.df_class(retrieved_data)
 
     dataset.compare_df(result_df, expected_df)
+
+
+@pytest.mark.parametrize("max_inflight_inserts", [0, 2])
+@mock.patch("morpheus.service.vdb.milvus_vector_db_service.MilvusClient")
+def test_insert_dataframe_deferred_flush(mock_milvus_client: mock.MagicMock, max_inflight_inserts: int):
+    mock_collection = mock_milvus_client.return_value.get_collection.return_value
+    mock_collection.schema.fields = [
+        pymilvus.FieldSchema(name="id", dtype=DataType.INT64, is_primary=True),
+        pymilvus.FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=3)
+    ]
+    mock_collection.insert.side_effect = lambda data, **kwargs: mock.MagicMock(insert_count=len(data))
+
+    milvus_service = MilvusVectorDBService(uri="http://localhost:19530",
+                                           flush_max_rows=25,
+                                           max_inflight_inserts=max_inflight_inserts)
+
+    for i in range(5):
+        df = pd.DataFrame({"id": range(i * 10, (i + 1) * 10), "embedding": [[0.1, 0.2, 0.3]] * 10})
+        result = milvus_service.insert_dataframe("test_collection", df)
+
+        # Background inserts return the same keys as synchronous inserts
+        assert set(result.keys()) == {
+            "primary_keys",
+            "insert_count",
+            "delete_count",
+            "upsert_count",
+            "timestamp",
+            "succ_count",
+            "err_count",
+            "succ_index",
+            "err_index"
+        }
+        assert result["insert_count"] == 10
+
+    # Flushing once 30 rows have been inserted, the remaining 20 rows are flushed before the collection is counted
+    milvus_service.count("test_collection")
+
+    assert mock_collection.insert.call_count == 5
+    assert mock_collection.flush.call_count == 2
+
+    metrics = milvus_service.get_insert_metrics("test_collection")
+    assert metrics.insert_count == 5
+    assert metrics.rows_inserted == 50
+    assert metrics.flush_count == 2
+
+    milvus_service.close()
+    assert mock_collection.flush.call_count == 2
+    mock_milvus_client.return_value.close.assert_called_once()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# SPDX-FileCopyrightText: Copyright (c) 2024, NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from morpheus.config import Config
+from morpheus.config import ConfigAutoEncoder
+from morpheus.models.dfencoder import AutoEncoder
+from morpheus.models.dfencoder.training_executor import AETrainingExecutor
+from morpheus.stages.preprocess import train_ae_stage
+from morpheus.stages.preprocess.train_ae_stage import TrainAEStage
+from morpheus.stages.preprocess.train_ae_stage import _UserModelManager
+
+pytestmark = [pytest.mark.use_pandas, pytest.mark.use_python]
+
+
+def _make_df(num_rows: int, categories: list[str], value_range: tuple[float, float], seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame({
+        "eventName": rng.choice(categories, num_rows),
+        "value": rng.uniform(*value_range, num_rows),
+    })
+
+
+@pytest.fixture(name="fit_rows")
+def fit_rows_fixture(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """
+    Records the number of rows each model is fit on.
+    """
+    fit_rows = []
+    fit = AutoEncoder.fit
+
+    def record_fit(self, training_data, **kwargs):
+        fit_rows.append(len(training_data))
+        return fit(self, training_data, **kwargs)
+
+    monkeypatch.setattr(AutoEncoder, "fit", record_fit)
+
+    return fit_rows
+
+
+def _make_manager(config: Config, incremental: bool) -> _UserModelManager:
+    config.ae = ConfigAutoEncoder()
+
+    return _UserModelManager(config, "user1", True, 1, 1000, seed=42, incremental=incremental)
+
+
+def test_train_incremental(config: Config, fit_rows: list[int]):
+    manager = _make_manager(config, incremental=True)
+    categories = ["a", "b", "c"]
+
+    (first_model, _, _) = manager.train(_make_df(200, categories, (0, 10)))
+    (model, scores_mean, scores_std) = manager.train(_make_df(50, categories, (0, 10), seed=1))
+
+    assert manager.num_rebuilds == 1
+    assert manager.num_fine_tunes == 1
+
+    # The model is fine-tuned on the new rows plus an equal number of history rows
+    assert fit_rows == [200, 100]
+
+    # The loss stats of the fine-tuned model are computed from the full history, like the score stats
+    expected_model = copy.deepcopy(model)
+    expected_model.update_loss_stats(manager._history)
+    for (ft, stats) in model.feature_loss_stats.items():
+        assert vars(stats['scaler']) == pytest.approx(vars(expected_model.feature_loss_stats[ft]['scaler']))
+
+    # The previous model is left untouched
+    assert model is not first_model
+    assert manager.model is model
+    assert manager.train_scores_mean == scores_mean
+    assert manager.train_scores_std == scores_std
+
+
+@pytest.mark.parametrize("categories, value_range", [(["d", "e"], (0, 10)), (["a", "b"], (100, 110))],
+                         ids=["new_categories", "numeric_range"])
+def test_train_incremental_drift(config: Config,
+                                 fit_rows: list[int],
+                                 categories: list[str],
+                                 value_range: tuple[float, float]):
+    manager = _make_manager(config, incremental=True)
+
+    manager.train(_make_df(200, ["a", "b", "c"], (0, 10)))
+    manager.train(_make_df(50, categories, value_range, seed=1))
+
+    # The new rows drifted, so a new model is built on the full history
+    assert manager.num_rebuilds == 2
+    assert manager.num_fine_tunes == 0
+    assert fit_rows == [200, 250]
+
+
+def test_train_full(config: Config, fit_rows: list[int]):
+    manager = _make_manager(config, incremental=False)
+
+    manager.train(_make_df(200, ["a", "b", "c"], (0, 10)))
+    manager.train(_make_df(50, ["a", "b", "c"], (0, 10), seed=1))
+
+    assert manager.num_rebuilds == 2
+    assert fit_rows == [200, 250]
+
+
+class _InProcessTrainingExecutor(AETrainingExecutor):
+    """
+    Trains the models in a pool of threads rather than worker processes.
+    """
+
+    def __init__(self, num_workers: int, **kwargs):
+        super().__init__(num_workers, **kwargs)
+        self._pool.shutdown()
+        self._pool = ThreadPoolExecutor(max_workers=num_workers)
+
+
+class _SourceStage:
+
+    @staticmethod
+    def derive_features(df: pd.DataFrame, feature_columns: list[str]) -> pd.DataFrame:
+        return df
+
+
+@pytest.mark.parametrize("use_generic_model", [False, True])
+def test_train_users_parallel(monkeypatch: pytest.MonkeyPatch,
+                              config: Config,
+                              fit_rows: list[int],
+                              use_generic_model: bool):
+    monkeypatch.setattr(train_ae_stage, "AETrainingExecutor", _InProcessTrainingExecutor)
+    config.ae = ConfigAutoEncoder(use_generic_model=use_generic_model)
+
+    stage = TrainAEStage(config, train_epochs=1, train_min_history=100, seed=42, num_train_workers=2)
+    stage._source_stage_class = _SourceStage
+
+    categories = ["a", "b", "c"]
+    user_to_df = {
+        "user1": _make_df(200, categories, (0, 10)),
+        "user2": _make_df(150, categories, (0, 10), seed=1),
+        "user3": _make_df(50, categories, (0, 10), seed=2),
+    }
+    stage._train_users_parallel(user_to_df)
+
+    # Users without enough history don't get a model
+    expected_users = ["user1", "user2"]
+    expected_rows = [200, 150]
+    if (use_generic_model):
+        expected_users.insert(0, "generic")
+        expected_rows.insert(0, 400)
+
+    assert list(stage._user_models.keys()) == expected_users
+    assert sorted(fit_rows) == sorted(expected_rows)
+
+    for (user_id, manager) in stage._user_models.items():
+        assert isinstance(manager.model, AutoEncoder)
+
+        # The score stats of each model are computed on its own training data
+        train_loss_scores = manager.model.get_anomaly_score(manager._history)
+        assert manager.train_scores_mean == pytest.approx(train_loss_scores.mean()), user_id
+        assert manager.train_scores_std == pytest.approx(train_loss_scores.std()), user_id